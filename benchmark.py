@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon. If
+# not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmarks for content handlers and string preparation.
+
+Run ``python benchmark.py --help`` for available options. The ``--memory`` mode uses
+:py:mod:`tracemalloc` to report, for every operation, the peak number of bytes allocated while the
+operation was running, the number of bytes still held afterwards (usually the result) and the
+number of retained memory blocks. :py:mod:`tracemalloc` does not count allocations, so this is
+the number of blocks allocated by the operation that are still alive afterwards, not the total
+number of allocations::
+
+    python benchmark.py --memory --size=1000000 --mime=application/xml
+
+The ``--attacks`` mode unmarshals malicious bodies (e.g. "billion laughs" expansion attacks) and
+reports the time until they are rejected::
+
+    python benchmark.py --attacks
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import gc
+import sys
+import timeit
+
+sys.path.insert(0, 'python')
+
+from RestAuthCommon import strprep  # NOQA
+from RestAuthCommon.handlers import CONTENT_HANDLERS  # NOQA
+
+
+def get_list(size):
+    """Get a list of ``size`` usernames."""
+    return ['user%s' % i for i in range(size)]
+
+
+def get_dict(size):
+    """Get a dictionary of ``size`` properties."""
+    return {'property%s' % i: 'value%s' % i for i in range(size)}
+
+
+def get_handlers(mimes=None):
+    """Get instances of all handlers named in ``mimes`` (or all handlers) that can be loaded."""
+    handlers = []
+    for mime, cls in sorted(CONTENT_HANDLERS.items()):
+        if mimes and mime not in mimes:
+            continue
+        try:
+            handler = cls()
+            if handler.librarypath is not None:
+                handler.library
+        except ImportError as e:
+            print('%s: skipped (%s)' % (mime, e), file=sys.stderr)
+            continue
+        handlers.append(handler)
+    return handlers
+
+
+def get_operations(handler, size, names=None):
+    """Get a list of ``(name, func, arg)`` tuples for the operations measured for ``handler``.
+
+    If ``names`` is given, only operations in ``names`` are returned and only their arguments are
+    created.
+    """
+    operations = [
+        ('marshal_list', lambda: (handler.marshal_list, get_list(size))),
+        ('unmarshal_list', lambda: (handler.unmarshal_list, handler.marshal_list(get_list(size)))),
+        ('marshal_dict', lambda: (handler.marshal_dict, get_dict(size))),
+        ('unmarshal_dict', lambda: (handler.unmarshal_dict, handler.marshal_dict(get_dict(size)))),
+        ('normalize_list', lambda: (handler.normalize_list,
+                                    [e.encode('utf-8') for e in get_list(size)])),
+        ('normalize_dict', lambda: (handler.normalize_dict,
+                                    {k.encode('utf-8'): v.encode('utf-8')
+                                     for k, v in get_dict(size).items()})),
+    ]
+    return [(name, ) + build() for name, build in operations if not names or name in names]
+
+
+def measure_memory(func, arg):
+    """Measure memory allocated by ``func(arg)``.
+
+    :return: A tuple of peak bytes, retained bytes and retained memory blocks.
+    """
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+            tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = func(arg)
+        current, peak = tracemalloc.get_traced_memory()
+        # Only blocks allocated after tracing started are traced, so every block in the snapshot
+        # was allocated by the operation.
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    del result
+    return peak - base, current - base, blocks
+
+
+def memory(args):
+    row = '%-34s %-16s %14s %14s %15s'
+    print(row % ('handler', 'operation', 'peak bytes', 'retained bytes', 'retained blocks'))
+
+    for handler in get_handlers(args.mime):
+        for name, func, arg in get_operations(handler, args.size, args.operation):
+            try:
+                peak, current, blocks = measure_memory(func, arg)
+            except Exception as e:
+                print('%-34s %-16s failed: %s' % (handler.mime, name, e))
+                continue
+            print(row % (handler.mime, name, peak, current, blocks))
+
+    if not args.mime and (not args.operation or 'stringcheck' in args.operation):
+        names = get_list(args.size)
+        peak, current, blocks = measure_memory(lambda l: [strprep.stringcheck(n) for n in l],
+                                               names)
+        print(row % ('strprep', 'stringcheck', peak, current, blocks))
+
+
+def get_attacks():
+    """Get a list of ``(mime, name, body)`` tuples of malicious bodies."""
+    yaml = 'a0: &a0 [%s]\n' % ', '.join(['lol'] * 10)
+    for i in range(1, 12):
+        yaml += 'a%s: &a%s [%s]\n' % (i, i, ', '.join(['*a%s' % (i - 1)] * 10))
+
+    # few aliases, each referring to a large mapping
+    mappings = 'm0: &m0 {a: lol}\n'
+    for i in range(1, 7):
+        mappings += 'm%s: &m%s {%s}\n' % (
+            i, i, ', '.join('k%s: *m%s' % (j, i - 1) for j in range(10)))
+
+    entities = '<!ENTITY a0 "lol">'
+    for i in range(1, 10):
+        entities += '<!ENTITY a%s "%s">' % (i, '&a%s;' % (i - 1) * 10)
+
+    return [
+        ('application/yaml', 'billion laughs', yaml.encode('utf-8')),
+        ('application/yaml', 'mapping laughs', mappings.encode('utf-8')),
+        ('application/yaml', 'python object', b'!!python/object/apply:time.sleep [10]'),
+        ('application/xml', 'billion laughs',
+         ('<!DOCTYPE dict [%s]><dict><str key="a">&a9;</str></dict>' % entities).encode('utf-8')),
+        ('application/xml', 'external entity',
+         b'<!DOCTYPE dict [<!ENTITY a SYSTEM "file:///etc/passwd">]>'
+         b'<dict><str key="a">&a;</str></dict>'),
+        ('application/xml', 'external dtd',
+         b'<!DOCTYPE dict SYSTEM "http://example.com/dict.dtd"><dict/>'),
+    ]
+
+
+def attacks(args):
+    row = '%-34s %-16s %-34s %10s'
+    print(row % ('handler', 'attack', 'result', 'seconds'))
+
+    for handler in get_handlers(args.mime):
+        for mime, name, body in get_attacks():
+            if mime != handler.mime:
+                continue
+
+            start = timeit.default_timer()
+            try:
+                handler.unmarshal_dict(body)
+                result = 'accepted'
+            except Exception as e:
+                result = 'rejected (%s)' % type(e).__name__
+            print(row % (mime, name, result, '%.4f' % (timeit.default_timer() - start)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RestAuthCommon.")
+    parser.add_argument('--memory', action='store_true', default=False,
+                        help="Measure peak and retained memory with tracemalloc.")
+    parser.add_argument('--attacks', action='store_true', default=False,
+                        help="Measure the time it takes to reject malicious bodies.")
+    parser.add_argument('--size', type=int, default=100000, metavar='N',
+                        help="Number of list elements and dictionary keys (default: %(default)s).")
+    parser.add_argument('--mime', action='append', metavar='MIME',
+                        help="Only benchmark handler for MIME, may be given multiple times.")
+    parser.add_argument('--operation', action='append', metavar='NAME',
+                        help="Only benchmark operation NAME (e.g. unmarshal_list), may be given "
+                             "multiple times.")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        memory(args)
+    elif args.attacks:
+        attacks(args)
+    else:
+        parser.error('No benchmark mode selected.')
+
+
+if __name__ == '__main__':
+    main()
@@ -17,14 +17,73 @@
 """
 
 from __future__ import unicode_literals, absolute_import
-import warnings
 
 import sys
-import stringprep
 
 PY2 = sys.version_info[0] == 2
 
 
+def warmup(mimes=None, freeze=False):
+    """Load everything that would otherwise be loaded upon first use.
+
+    This function is intended to be called in the master process of a pre-forking server before
+    forking any workers: It imports the libraries used by content handlers, creates the shared
+    handler instances returned by :py:func:`.handlers.get_handler` and compiles the patterns used
+    by :py:mod:`.strprep`. Workers then no longer pay for this on their first request and share
+    the memory with the master process.
+
+    :param mimes: MIME types of the content handlers to load. By default, all handlers in
+        :py:data:`.handlers.CONTENT_HANDLERS` are loaded and handlers whose library is not
+        installed are skipped. If you name a MIME type explicitly, a missing library raises an
+        ``ImportError``.
+    :type  mimes: list
+    :param bool freeze: If ``True``, call :py:func:`gc.freeze` (Python 3.7 or later) after loading,
+        so that the garbage collector does not touch (and thus copy) objects loaded so far. On
+        older versions of Python, this step is skipped and ``"gc.freeze"`` maps to ``None``.
+    :return: A dictionary mapping the loaded components (MIME types, ``"strprep"`` and
+        ``"gc.freeze"``) to the time in seconds it took to load them.
+    :rtype: dict
+    """
+    from timeit import default_timer
+
+    from RestAuthCommon import handlers
+    from RestAuthCommon import strprep
+
+    timings = {}
+    if mimes is None:
+        mimes = sorted(handlers.CONTENT_HANDLERS)
+        ignore_missing = True
+    else:
+        ignore_missing = False
+
+    for mime in mimes:
+        if ignore_missing is True and not handlers.CONTENT_HANDLERS[mime].is_available():
+            continue
+
+        start = default_timer()
+        handler = handlers.get_handler(mime)
+        if handler.librarypath is not None:
+            handler.library
+        timings[mime] = default_timer() - start
+
+    start = default_timer()
+    strprep.stringcheck('\u00e9')  # non-ASCII names load the tables/patterns of the engine
+    timings['strprep'] = default_timer() - start
+
+    if freeze is True:
+        import gc
+
+        if hasattr(gc, 'freeze'):
+            start = default_timer()
+            gc.collect()
+            gc.freeze()
+            timings['gc.freeze'] = default_timer() - start
+        else:  # Python < 3.7
+            timings['gc.freeze'] = None
+
+    return timings
+
+
 def resource_validator(name):
     """Check the *name* of a resource for some really bad characters that shouldn't be used
     anywhere in RestAuth.
@@ -40,31 +99,16 @@ def resource_validator(name):
     :returns: False if the name contains any invalid characters, True otherwise.
     :rtype: bool
     """
+    # NOTE: imported here so that importing any RestAuthCommon module does not import them.
+    import warnings
+
+    from RestAuthCommon import strprep
+
     warnings.warn('This method is deprecated, use RestAuthCommon.strprep.stringcheck() instead.',
                   DeprecationWarning)
 
     if PY2 and isinstance(name, str):  # pragma: py2
         name = name.decode('utf-8')
 
-    # filter various dangerous characters
-    for enc_char in name:
-        if stringprep.in_table_c12(enc_char):  # C.1.2 Non-ASCII space characters
-            return False
-        if stringprep.in_table_c21_c22(enc_char):  # C.2 Control characters
-            return False
-        if stringprep.in_table_c3(enc_char):  # C.3 Private use
-            return False
-        if stringprep.in_table_c4(enc_char):  # C.4 Non-character code points
-            return False
-        if stringprep.in_table_c5(enc_char):  # C.5 Surrogate codes
-            return False
-        if stringprep.in_table_c6(enc_char):  # C.6 Inappropriate for plain text
-            return False
-        if stringprep.in_table_c7(enc_char):  # C.7 Inappropriate for canonical representation
-            return False
-        if stringprep.in_table_c8(enc_char):  # C.8 Change display properties or are deprecated
-            return False
-        if stringprep.in_table_c9(enc_char):  # C.9 Tagging characters
-            return False
-
-    return True
+    # filter characters in tables C.1.2 - C.9 of RFC 3454
+    return strprep._search(name) is None
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon. If
+# not, see <http://www.gnu.org/licenses/>.
+
+"""Process list shards in a process pool.
+
+Used by :py:meth:`.ContentHandler.marshal_list_parallel` and by
+:py:func:`.strprep.stringprep_many` and :py:func:`.strprep.stringcheck_many`.
+"""
+
+from __future__ import unicode_literals
+
+
+def map_shards(func, items, executor=None, shard_size=None):
+    """Call ``func(shard, offset)`` for consecutive shards of ``items`` in a process pool.
+
+    :param func: A picklable function, called with a slice of ``items`` and the index of its
+        first item.
+    :param list items: The items to process.
+    :param executor: The executor to use. If ``None``, a new process pool with one process per CPU
+        is created (and shut down again) for this call.
+    :type  executor: :py:class:`concurrent.futures.ProcessPoolExecutor`
+    :param int shard_size: Number of items passed to a single call of ``func``. The default splits
+        ``items`` in four shards per CPU.
+    :return: The return values of ``func``, in the order of the shards.
+    :rtype: list
+    """
+    if executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as executor:
+            return map_shards(func, items, executor, shard_size)
+
+    if shard_size is None:
+        import multiprocessing
+        shard_size = max(1, -(-len(items) // (multiprocessing.cpu_count() * 4)))
+
+    futures = [executor.submit(func, items[i:i + shard_size], i)
+               for i in range(0, len(items), shard_size)]
+    return [f.result() for f in futures]
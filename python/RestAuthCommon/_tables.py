@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon. If
+# not, see <http://www.gnu.org/licenses/>.
+
+"""stringprep tables (RFC 3454) used by :py:mod:`RestAuthCommon.strprep`.
+
+This module is generated by ``python setup.py generate_tables`` from Unicode 3.2, do not edit it
+manually.
+"""
+
+# Table B.1: Commonly mapped to nothing, as a map for str.translate().
+B1 = {
+    0x00AD: None, 0x034F: None, 0x1806: None, 0x180B: None, 0x180C: None, 0x180D: None,
+    0x200B: None, 0x200C: None, 0x200D: None, 0x2060: None, 0xFE00: None, 0xFE01: None,
+    0xFE02: None, 0xFE03: None, 0xFE04: None, 0xFE05: None, 0xFE06: None, 0xFE07: None,
+    0xFE08: None, 0xFE09: None, 0xFE0A: None, 0xFE0B: None, 0xFE0C: None, 0xFE0D: None,
+    0xFE0E: None, 0xFE0F: None, 0xFEFF: None,
+}
+
+# Table B.2: Mapping for case-folding used with NFKC. Every line is a character followed by its
+# mapping. The mapping is stored as a single string (and not as a dictionary) as this module
+# loads about 50 times faster this way.
+B2 = (
+    'Aa\n' 'Bb\n' 'Cc\n' 'Dd\n' 'Ee\n' 'Ff\n' 'Gg\n' 'Hh\n' 'Ii\n' 'Jj\n' 'Kk\n' 'Ll\n' 'Mm\n'
+    'Nn\n' 'Oo\n' 'Pp\n' 'Qq\n' 'Rr\n' 'Ss\n' 'Tt\n' 'Uu\n' 'Vv\n' 'Ww\n' 'Xx\n' 'Yy\n' 'Zz\n'
+    '\xb5\u03bc\n' '\xc0\xe0\n' '\xc1\xe1\n' '\xc2\xe2\n' '\xc3\xe3\n' '\xc4\xe4\n' '\xc5\xe5\n'
+    '\xc6\xe6\n' '\xc7\xe7\n' '\xc8\xe8\n' '\xc9\xe9\n' '\xca\xea\n' '\xcb\xeb\n' '\xcc\xec\n'
+    '\xcd\xed\n' '\xce\xee\n' '\xcf\xef\n' '\xd0\xf0\n' '\xd1\xf1\n' '\xd2\xf2\n' '\xd3\xf3\n'
+    '\xd4\xf4\n' '\xd5\xf5\n' '\xd6\xf6\n' '\xd8\xf8\n' '\xd9\xf9\n' '\xda\xfa\n' '\xdb\xfb\n'
+    '\xdc\xfc\n' '\xdd\xfd\n' '\xde\xfe\n' '\xdfss\n' '\u0100\u0101\n' '\u0102\u0103\n'
+    '\u0104\u0105\n' '\u0106\u0107\n' '\u0108\u0109\n' '\u010a\u010b\n' '\u010c\u010d\n'
+    '\u010e\u010f\n' '\u0110\u0111\n' '\u0112\u0113\n' '\u0114\u0115\n' '\u0116\u0117\n'
+    '\u0118\u0119\n' '\u011a\u011b\n' '\u011c\u011d\n' '\u011e\u011f\n' '\u0120\u0121\n'
+    '\u0122\u0123\n' '\u0124\u0125\n' '\u0126\u0127\n' '\u0128\u0129\n' '\u012a\u012b\n'
+    '\u012c\u012d\n' '\u012e\u012f\n' '\u0130i\u0307\n' '\u0132\u0133\n' '\u0134\u0135\n'
+    '\u0136\u0137\n' '\u0139\u013a\n' '\u013b\u013c\n' '\u013d\u013e\n' '\u013f\u0140\n'
+    '\u0141\u0142\n' '\u0143\u0144\n' '\u0145\u0146\n' '\u0147\u0148\n' '\u0149\u02bcn\n'
+    '\u014a\u014b\n' '\u014c\u014d\n' '\u014e\u014f\n' '\u0150\u0151\n' '\u0152\u0153\n'
+    '\u0154\u0155\n' '\u0156\u0157\n' '\u0158\u0159\n' '\u015a\u015b\n' '\u015c\u015d\n'
+    '\u015e\u015f\n' '\u0160\u0161\n' '\u0162\u0163\n' '\u0164\u0165\n' '\u0166\u0167\n'
+    '\u0168\u0169\n' '\u016a\u016b\n' '\u016c\u016d\n' '\u016e\u016f\n' '\u0170\u0171\n'
+    '\u0172\u0173\n' '\u0174\u0175\n' '\u0176\u0177\n' '\u0178\xff\n' '\u0179\u017a\n'
+    '\u017b\u017c\n' '\u017d\u017e\n' '\u017fs\n' '\u0181\u0253\n' '\u0182\u0183\n'
+    '\u0184\u0185\n' '\u0186\u0254\n' '\u0187\u0188\n' '\u0189\u0256\n' '\u018a\u0257\n'
+    '\u018b\u018c\n' '\u018e\u01dd\n' '\u018f\u0259\n' '\u0190\u025b\n' '\u0191\u0192\n'
+    '\u0193\u0260\n' '\u0194\u0263\n' '\u0196\u0269\n' '\u0197\u0268\n' '\u0198\u0199\n'
+    '\u019c\u026f\n' '\u019d\u0272\n' '\u019f\u0275\n' '\u01a0\u01a1\n' '\u01a2\u01a3\n'
+    '\u01a4\u01a5\n' '\u01a6\u0280\n' '\u01a7\u01a8\n' '\u01a9\u0283\n' '\u01ac\u01ad\n'
+    '\u01ae\u0288\n' '\u01af\u01b0\n' '\u01b1\u028a\n' '\u01b2\u028b\n' '\u01b3\u01b4\n'
+    '\u01b5\u01b6\n' '\u01b7\u0292\n' '\u01b8\u01b9\n' '\u01bc\u01bd\n' '\u01c4\u01c6\n'
+    '\u01c5\u01c6\n' '\u01c7\u01c9\n' '\u01c8\u01c9\n' '\u01ca\u01cc\n' '\u01cb\u01cc\n'
+    '\u01cd\u01ce\n' '\u01cf\u01d0\n' '\u01d1\u01d2\n' '\u01d3\u01d4\n' '\u01d5\u01d6\n'
+    '\u01d7\u01d8\n' '\u01d9\u01da\n' '\u01db\u01dc\n' '\u01de\u01df\n' '\u01e0\u01e1\n'
+    '\u01e2\u01e3\n' '\u01e4\u01e5\n' '\u01e6\u01e7\n' '\u01e8\u01e9\n' '\u01ea\u01eb\n'
+    '\u01ec\u01ed\n' '\u01ee\u01ef\n' '\u01f0j\u030c\n' '\u01f1\u01f3\n' '\u01f2\u01f3\n'
+    '\u01f4\u01f5\n' '\u01f6\u0195\n' '\u01f7\u01bf\n' '\u01f8\u01f9\n' '\u01fa\u01fb\n'
+    '\u01fc\u01fd\n' '\u01fe\u01ff\n' '\u0200\u0201\n' '\u0202\u0203\n' '\u0204\u0205\n'
+    '\u0206\u0207\n' '\u0208\u0209\n' '\u020a\u020b\n' '\u020c\u020d\n' '\u020e\u020f\n'
+    '\u0210\u0211\n' '\u0212\u0213\n' '\u0214\u0215\n' '\u0216\u0217\n' '\u0218\u0219\n'
+    '\u021a\u021b\n' '\u021c\u021d\n' '\u021e\u021f\n' '\u0220\u019e\n' '\u0222\u0223\n'
+    '\u0224\u0225\n' '\u0226\u0227\n' '\u0228\u0229\n' '\u022a\u022b\n' '\u022c\u022d\n'
+    '\u022e\u022f\n' '\u0230\u0231\n' '\u0232\u0233\n' '\u0345\u03b9\n' '\u037a \u03b9\n'
+    '\u0386\u03ac\n' '\u0388\u03ad\n' '\u0389\u03ae\n' '\u038a\u03af\n' '\u038c\u03cc\n'
+    '\u038e\u03cd\n' '\u038f\u03ce\n' '\u0390\u03b9\u0308\u0301\n' '\u0391\u03b1\n'
+    '\u0392\u03b2\n' '\u0393\u03b3\n' '\u0394\u03b4\n' '\u0395\u03b5\n' '\u0396\u03b6\n'
+    '\u0397\u03b7\n' '\u0398\u03b8\n' '\u0399\u03b9\n' '\u039a\u03ba\n' '\u039b\u03bb\n'
+    '\u039c\u03bc\n' '\u039d\u03bd\n' '\u039e\u03be\n' '\u039f\u03bf\n' '\u03a0\u03c0\n'
+    '\u03a1\u03c1\n' '\u03a3\u03c3\n' '\u03a4\u03c4\n' '\u03a5\u03c5\n' '\u03a6\u03c6\n'
+    '\u03a7\u03c7\n' '\u03a8\u03c8\n' '\u03a9\u03c9\n' '\u03aa\u03ca\n' '\u03ab\u03cb\n'
+    '\u03b0\u03c5\u0308\u0301\n' '\u03c2\u03c3\n' '\u03d0\u03b2\n' '\u03d1\u03b8\n'
+    '\u03d2\u03c5\n' '\u03d3\u03cd\n' '\u03d4\u03cb\n' '\u03d5\u03c6\n' '\u03d6\u03c0\n'
+    '\u03d8\u03d9\n' '\u03da\u03db\n' '\u03dc\u03dd\n' '\u03de\u03df\n' '\u03e0\u03e1\n'
+    '\u03e2\u03e3\n' '\u03e4\u03e5\n' '\u03e6\u03e7\n' '\u03e8\u03e9\n' '\u03ea\u03eb\n'
+    '\u03ec\u03ed\n' '\u03ee\u03ef\n' '\u03f0\u03ba\n' '\u03f1\u03c1\n' '\u03f2\u03c3\n'
+    '\u03f4\u03b8\n' '\u03f5\u03b5\n' '\u0400\u0450\n' '\u0401\u0451\n' '\u0402\u0452\n'
+    '\u0403\u0453\n' '\u0404\u0454\n' '\u0405\u0455\n' '\u0406\u0456\n' '\u0407\u0457\n'
+    '\u0408\u0458\n' '\u0409\u0459\n' '\u040a\u045a\n' '\u040b\u045b\n' '\u040c\u045c\n'
+    '\u040d\u045d\n' '\u040e\u045e\n' '\u040f\u045f\n' '\u0410\u0430\n' '\u0411\u0431\n'
+    '\u0412\u0432\n' '\u0413\u0433\n' '\u0414\u0434\n' '\u0415\u0435\n' '\u0416\u0436\n'
+    '\u0417\u0437\n' '\u0418\u0438\n' '\u0419\u0439\n' '\u041a\u043a\n' '\u041b\u043b\n'
+    '\u041c\u043c\n' '\u041d\u043d\n' '\u041e\u043e\n' '\u041f\u043f\n' '\u0420\u0440\n'
+    '\u0421\u0441\n' '\u0422\u0442\n' '\u0423\u0443\n' '\u0424\u0444\n' '\u0425\u0445\n'
+    '\u0426\u0446\n' '\u0427\u0447\n' '\u0428\u0448\n' '\u0429\u0449\n' '\u042a\u044a\n'
+    '\u042b\u044b\n' '\u042c\u044c\n' '\u042d\u044d\n' '\u042e\u044e\n' '\u042f\u044f\n'
+    '\u0460\u0461\n' '\u0462\u0463\n' '\u0464\u0465\n' '\u0466\u0467\n' '\u0468\u0469\n'
+    '\u046a\u046b\n' '\u046c\u046d\n' '\u046e\u046f\n' '\u0470\u0471\n' '\u0472\u0473\n'
+    '\u0474\u0475\n' '\u0476\u0477\n' '\u0478\u0479\n' '\u047a\u047b\n' '\u047c\u047d\n'
+    '\u047e\u047f\n' '\u0480\u0481\n' '\u048a\u048b\n' '\u048c\u048d\n' '\u048e\u048f\n'
+    '\u0490\u0491\n' '\u0492\u0493\n' '\u0494\u0495\n' '\u0496\u0497\n' '\u0498\u0499\n'
+    '\u049a\u049b\n' '\u049c\u049d\n' '\u049e\u049f\n' '\u04a0\u04a1\n' '\u04a2\u04a3\n'
+    '\u04a4\u04a5\n' '\u04a6\u04a7\n' '\u04a8\u04a9\n' '\u04aa\u04ab\n' '\u04ac\u04ad\n'
+    '\u04ae\u04af\n' '\u04b0\u04b1\n' '\u04b2\u04b3\n' '\u04b4\u04b5\n' '\u04b6\u04b7\n'
+    '\u04b8\u04b9\n' '\u04ba\u04bb\n' '\u04bc\u04bd\n' '\u04be\u04bf\n' '\u04c0\u04cf\n'
+    '\u04c1\u04c2\n' '\u04c3\u04c4\n' '\u04c5\u04c6\n' '\u04c7\u04c8\n' '\u04c9\u04ca\n'
+    '\u04cb\u04cc\n' '\u04cd\u04ce\n' '\u04d0\u04d1\n' '\u04d2\u04d3\n' '\u04d4\u04d5\n'
+    '\u04d6\u04d7\n' '\u04d8\u04d9\n' '\u04da\u04db\n' '\u04dc\u04dd\n' '\u04de\u04df\n'
+    '\u04e0\u04e1\n' '\u04e2\u04e3\n' '\u04e4\u04e5\n' '\u04e6\u04e7\n' '\u04e8\u04e9\n'
+    '\u04ea\u04eb\n' '\u04ec\u04ed\n' '\u04ee\u04ef\n' '\u04f0\u04f1\n' '\u04f2\u04f3\n'
+    '\u04f4\u04f5\n' '\u04f8\u04f9\n' '\u0500\u0501\n' '\u0502\u0503\n' '\u0504\u0505\n'
+    '\u0506\u0507\n' '\u0508\u0509\n' '\u050a\u050b\n' '\u050c\u050d\n' '\u050e\u050f\n'
+    '\u0531\u0561\n' '\u0532\u0562\n' '\u0533\u0563\n' '\u0534\u0564\n' '\u0535\u0565\n'
+    '\u0536\u0566\n' '\u0537\u0567\n' '\u0538\u0568\n' '\u0539\u0569\n' '\u053a\u056a\n'
+    '\u053b\u056b\n' '\u053c\u056c\n' '\u053d\u056d\n' '\u053e\u056e\n' '\u053f\u056f\n'
+    '\u0540\u0570\n' '\u0541\u0571\n' '\u0542\u0572\n' '\u0543\u0573\n' '\u0544\u0574\n'
+    '\u0545\u0575\n' '\u0546\u0576\n' '\u0547\u0577\n' '\u0548\u0578\n' '\u0549\u0579\n'
+    '\u054a\u057a\n' '\u054b\u057b\n' '\u054c\u057c\n' '\u054d\u057d\n' '\u054e\u057e\n'
+    '\u054f\u057f\n' '\u0550\u0580\n' '\u0551\u0581\n' '\u0552\u0582\n' '\u0553\u0583\n'
+    '\u0554\u0584\n' '\u0555\u0585\n' '\u0556\u0586\n' '\u0587\u0565\u0582\n' '\u10a0\u2d00\n'
+    '\u10a1\u2d01\n' '\u10a2\u2d02\n' '\u10a3\u2d03\n' '\u10a4\u2d04\n' '\u10a5\u2d05\n'
+    '\u10a6\u2d06\n' '\u10a7\u2d07\n' '\u10a8\u2d08\n' '\u10a9\u2d09\n' '\u10aa\u2d0a\n'
+    '\u10ab\u2d0b\n' '\u10ac\u2d0c\n' '\u10ad\u2d0d\n' '\u10ae\u2d0e\n' '\u10af\u2d0f\n'
+    '\u10b0\u2d10\n' '\u10b1\u2d11\n' '\u10b2\u2d12\n' '\u10b3\u2d13\n' '\u10b4\u2d14\n'
+    '\u10b5\u2d15\n' '\u10b6\u2d16\n' '\u10b7\u2d17\n' '\u10b8\u2d18\n' '\u10b9\u2d19\n'
+    '\u10ba\u2d1a\n' '\u10bb\u2d1b\n' '\u10bc\u2d1c\n' '\u10bd\u2d1d\n' '\u10be\u2d1e\n'
+    '\u10bf\u2d1f\n' '\u10c0\u2d20\n' '\u10c1\u2d21\n' '\u10c2\u2d22\n' '\u10c3\u2d23\n'
+    '\u10c4\u2d24\n' '\u10c5\u2d25\n' '\u13a0\uab70\n' '\u13a1\uab71\n' '\u13a2\uab72\n'
+    '\u13a3\uab73\n' '\u13a4\uab74\n' '\u13a5\uab75\n' '\u13a6\uab76\n' '\u13a7\uab77\n'
+    '\u13a8\uab78\n' '\u13a9\uab79\n' '\u13aa\uab7a\n' '\u13ab\uab7b\n' '\u13ac\uab7c\n'
+    '\u13ad\uab7d\n' '\u13ae\uab7e\n' '\u13af\uab7f\n' '\u13b0\uab80\n' '\u13b1\uab81\n'
+    '\u13b2\uab82\n' '\u13b3\uab83\n' '\u13b4\uab84\n' '\u13b5\uab85\n' '\u13b6\uab86\n'
+    '\u13b7\uab87\n' '\u13b8\uab88\n' '\u13b9\uab89\n' '\u13ba\uab8a\n' '\u13bb\uab8b\n'
+    '\u13bc\uab8c\n' '\u13bd\uab8d\n' '\u13be\uab8e\n' '\u13bf\uab8f\n' '\u13c0\uab90\n'
+    '\u13c1\uab91\n' '\u13c2\uab92\n' '\u13c3\uab93\n' '\u13c4\uab94\n' '\u13c5\uab95\n'
+    '\u13c6\uab96\n' '\u13c7\uab97\n' '\u13c8\uab98\n' '\u13c9\uab99\n' '\u13ca\uab9a\n'
+    '\u13cb\uab9b\n' '\u13cc\uab9c\n' '\u13cd\uab9d\n' '\u13ce\uab9e\n' '\u13cf\uab9f\n'
+    '\u13d0\uaba0\n' '\u13d1\uaba1\n' '\u13d2\uaba2\n' '\u13d3\uaba3\n' '\u13d4\uaba4\n'
+    '\u13d5\uaba5\n' '\u13d6\uaba6\n' '\u13d7\uaba7\n' '\u13d8\uaba8\n' '\u13d9\uaba9\n'
+    '\u13da\uabaa\n' '\u13db\uabab\n' '\u13dc\uabac\n' '\u13dd\uabad\n' '\u13de\uabae\n'
+    '\u13df\uabaf\n' '\u13e0\uabb0\n' '\u13e1\uabb1\n' '\u13e2\uabb2\n' '\u13e3\uabb3\n'
+    '\u13e4\uabb4\n' '\u13e5\uabb5\n' '\u13e6\uabb6\n' '\u13e7\uabb7\n' '\u13e8\uabb8\n'
+    '\u13e9\uabb9\n' '\u13ea\uabba\n' '\u13eb\uabbb\n' '\u13ec\uabbc\n' '\u13ed\uabbd\n'
+    '\u13ee\uabbe\n' '\u13ef\uabbf\n' '\u13f0\u13f8\n' '\u13f1\u13f9\n' '\u13f2\u13fa\n'
+    '\u13f3\u13fb\n' '\u13f4\u13fc\n' '\u1e00\u1e01\n' '\u1e02\u1e03\n' '\u1e04\u1e05\n'
+    '\u1e06\u1e07\n' '\u1e08\u1e09\n' '\u1e0a\u1e0b\n' '\u1e0c\u1e0d\n' '\u1e0e\u1e0f\n'
+    '\u1e10\u1e11\n' '\u1e12\u1e13\n' '\u1e14\u1e15\n' '\u1e16\u1e17\n' '\u1e18\u1e19\n'
+    '\u1e1a\u1e1b\n' '\u1e1c\u1e1d\n' '\u1e1e\u1e1f\n' '\u1e20\u1e21\n' '\u1e22\u1e23\n'
+    '\u1e24\u1e25\n' '\u1e26\u1e27\n' '\u1e28\u1e29\n' '\u1e2a\u1e2b\n' '\u1e2c\u1e2d\n'
+    '\u1e2e\u1e2f\n' '\u1e30\u1e31\n' '\u1e32\u1e33\n' '\u1e34\u1e35\n' '\u1e36\u1e37\n'
+    '\u1e38\u1e39\n' '\u1e3a\u1e3b\n' '\u1e3c\u1e3d\n' '\u1e3e\u1e3f\n' '\u1e40\u1e41\n'
+    '\u1e42\u1e43\n' '\u1e44\u1e45\n' '\u1e46\u1e47\n' '\u1e48\u1e49\n' '\u1e4a\u1e4b\n'
+    '\u1e4c\u1e4d\n' '\u1e4e\u1e4f\n' '\u1e50\u1e51\n' '\u1e52\u1e53\n' '\u1e54\u1e55\n'
+    '\u1e56\u1e57\n' '\u1e58\u1e59\n' '\u1e5a\u1e5b\n' '\u1e5c\u1e5d\n' '\u1e5e\u1e5f\n'
+    '\u1e60\u1e61\n' '\u1e62\u1e63\n' '\u1e64\u1e65\n' '\u1e66\u1e67\n' '\u1e68\u1e69\n'
+    '\u1e6a\u1e6b\n' '\u1e6c\u1e6d\n' '\u1e6e\u1e6f\n' '\u1e70\u1e71\n' '\u1e72\u1e73\n'
+    '\u1e74\u1e75\n' '\u1e76\u1e77\n' '\u1e78\u1e79\n' '\u1e7a\u1e7b\n' '\u1e7c\u1e7d\n'
+    '\u1e7e\u1e7f\n' '\u1e80\u1e81\n' '\u1e82\u1e83\n' '\u1e84\u1e85\n' '\u1e86\u1e87\n'
+    '\u1e88\u1e89\n' '\u1e8a\u1e8b\n' '\u1e8c\u1e8d\n' '\u1e8e\u1e8f\n' '\u1e90\u1e91\n'
+    '\u1e92\u1e93\n' '\u1e94\u1e95\n' '\u1e96h\u0331\n' '\u1e97t\u0308\n' '\u1e98w\u030a\n'
+    '\u1e99y\u030a\n' '\u1e9aa\u02be\n' '\u1e9b\u1e61\n' '\u1ea0\u1ea1\n' '\u1ea2\u1ea3\n'
+    '\u1ea4\u1ea5\n' '\u1ea6\u1ea7\n' '\u1ea8\u1ea9\n' '\u1eaa\u1eab\n' '\u1eac\u1ead\n'
+    '\u1eae\u1eaf\n' '\u1eb0\u1eb1\n' '\u1eb2\u1eb3\n' '\u1eb4\u1eb5\n' '\u1eb6\u1eb7\n'
+    '\u1eb8\u1eb9\n' '\u1eba\u1ebb\n' '\u1ebc\u1ebd\n' '\u1ebe\u1ebf\n' '\u1ec0\u1ec1\n'
+    '\u1ec2\u1ec3\n' '\u1ec4\u1ec5\n' '\u1ec6\u1ec7\n' '\u1ec8\u1ec9\n' '\u1eca\u1ecb\n'
+    '\u1ecc\u1ecd\n' '\u1ece\u1ecf\n' '\u1ed0\u1ed1\n' '\u1ed2\u1ed3\n' '\u1ed4\u1ed5\n'
+    '\u1ed6\u1ed7\n' '\u1ed8\u1ed9\n' '\u1eda\u1edb\n' '\u1edc\u1edd\n' '\u1ede\u1edf\n'
+    '\u1ee0\u1ee1\n' '\u1ee2\u1ee3\n' '\u1ee4\u1ee5\n' '\u1ee6\u1ee7\n' '\u1ee8\u1ee9\n'
+    '\u1eea\u1eeb\n' '\u1eec\u1eed\n' '\u1eee\u1eef\n' '\u1ef0\u1ef1\n' '\u1ef2\u1ef3\n'
+    '\u1ef4\u1ef5\n' '\u1ef6\u1ef7\n' '\u1ef8\u1ef9\n' '\u1f08\u1f00\n' '\u1f09\u1f01\n'
+    '\u1f0a\u1f02\n' '\u1f0b\u1f03\n' '\u1f0c\u1f04\n' '\u1f0d\u1f05\n' '\u1f0e\u1f06\n'
+    '\u1f0f\u1f07\n' '\u1f18\u1f10\n' '\u1f19\u1f11\n' '\u1f1a\u1f12\n' '\u1f1b\u1f13\n'
+    '\u1f1c\u1f14\n' '\u1f1d\u1f15\n' '\u1f28\u1f20\n' '\u1f29\u1f21\n' '\u1f2a\u1f22\n'
+    '\u1f2b\u1f23\n' '\u1f2c\u1f24\n' '\u1f2d\u1f25\n' '\u1f2e\u1f26\n' '\u1f2f\u1f27\n'
+    '\u1f38\u1f30\n' '\u1f39\u1f31\n' '\u1f3a\u1f32\n' '\u1f3b\u1f33\n' '\u1f3c\u1f34\n'
+    '\u1f3d\u1f35\n' '\u1f3e\u1f36\n' '\u1f3f\u1f37\n' '\u1f48\u1f40\n' '\u1f49\u1f41\n'
+    '\u1f4a\u1f42\n' '\u1f4b\u1f43\n' '\u1f4c\u1f44\n' '\u1f4d\u1f45\n' '\u1f50\u03c5\u0313\n'
+    '\u1f52\u03c5\u0313\u0300\n' '\u1f54\u03c5\u0313\u0301\n' '\u1f56\u03c5\u0313\u0342\n'
+    '\u1f59\u1f51\n' '\u1f5b\u1f53\n' '\u1f5d\u1f55\n' '\u1f5f\u1f57\n' '\u1f68\u1f60\n'
+    '\u1f69\u1f61\n' '\u1f6a\u1f62\n' '\u1f6b\u1f63\n' '\u1f6c\u1f64\n' '\u1f6d\u1f65\n'
+    '\u1f6e\u1f66\n' '\u1f6f\u1f67\n' '\u1f80\u1f00\u03b9\n' '\u1f81\u1f01\u03b9\n'
+    '\u1f82\u1f02\u03b9\n' '\u1f83\u1f03\u03b9\n' '\u1f84\u1f04\u03b9\n' '\u1f85\u1f05\u03b9\n'
+    '\u1f86\u1f06\u03b9\n' '\u1f87\u1f07\u03b9\n' '\u1f88\u1f00\u03b9\n' '\u1f89\u1f01\u03b9\n'
+    '\u1f8a\u1f02\u03b9\n' '\u1f8b\u1f03\u03b9\n' '\u1f8c\u1f04\u03b9\n' '\u1f8d\u1f05\u03b9\n'
+    '\u1f8e\u1f06\u03b9\n' '\u1f8f\u1f07\u03b9\n' '\u1f90\u1f20\u03b9\n' '\u1f91\u1f21\u03b9\n'
+    '\u1f92\u1f22\u03b9\n' '\u1f93\u1f23\u03b9\n' '\u1f94\u1f24\u03b9\n' '\u1f95\u1f25\u03b9\n'
+    '\u1f96\u1f26\u03b9\n' '\u1f97\u1f27\u03b9\n' '\u1f98\u1f20\u03b9\n' '\u1f99\u1f21\u03b9\n'
+    '\u1f9a\u1f22\u03b9\n' '\u1f9b\u1f23\u03b9\n' '\u1f9c\u1f24\u03b9\n' '\u1f9d\u1f25\u03b9\n'
+    '\u1f9e\u1f26\u03b9\n' '\u1f9f\u1f27\u03b9\n' '\u1fa0\u1f60\u03b9\n' '\u1fa1\u1f61\u03b9\n'
+    '\u1fa2\u1f62\u03b9\n' '\u1fa3\u1f63\u03b9\n' '\u1fa4\u1f64\u03b9\n' '\u1fa5\u1f65\u03b9\n'
+    '\u1fa6\u1f66\u03b9\n' '\u1fa7\u1f67\u03b9\n' '\u1fa8\u1f60\u03b9\n' '\u1fa9\u1f61\u03b9\n'
+    '\u1faa\u1f62\u03b9\n' '\u1fab\u1f63\u03b9\n' '\u1fac\u1f64\u03b9\n' '\u1fad\u1f65\u03b9\n'
+    '\u1fae\u1f66\u03b9\n' '\u1faf\u1f67\u03b9\n' '\u1fb2\u1f70\u03b9\n' '\u1fb3\u03b1\u03b9\n'
+    '\u1fb4\u03ac\u03b9\n' '\u1fb6\u03b1\u0342\n' '\u1fb7\u03b1\u0342\u03b9\n' '\u1fb8\u1fb0\n'
+    '\u1fb9\u1fb1\n' '\u1fba\u1f70\n' '\u1fbb\u1f71\n' '\u1fbc\u03b1\u03b9\n' '\u1fbe\u03b9\n'
+    '\u1fc2\u1f74\u03b9\n' '\u1fc3\u03b7\u03b9\n' '\u1fc4\u03ae\u03b9\n' '\u1fc6\u03b7\u0342\n'
+    '\u1fc7\u03b7\u0342\u03b9\n' '\u1fc8\u1f72\n' '\u1fc9\u1f73\n' '\u1fca\u1f74\n'
+    '\u1fcb\u1f75\n' '\u1fcc\u03b7\u03b9\n' '\u1fd2\u03b9\u0308\u0300\n'
+    '\u1fd3\u03b9\u0308\u0301\n' '\u1fd6\u03b9\u0342\n' '\u1fd7\u03b9\u0308\u0342\n'
+    '\u1fd8\u1fd0\n' '\u1fd9\u1fd1\n' '\u1fda\u1f76\n' '\u1fdb\u1f77\n'
+    '\u1fe2\u03c5\u0308\u0300\n' '\u1fe3\u03c5\u0308\u0301\n' '\u1fe4\u03c1\u0313\n'
+    '\u1fe6\u03c5\u0342\n' '\u1fe7\u03c5\u0308\u0342\n' '\u1fe8\u1fe0\n' '\u1fe9\u1fe1\n'
+    '\u1fea\u1f7a\n' '\u1feb\u1f7b\n' '\u1fec\u1fe5\n' '\u1ff2\u1f7c\u03b9\n'
+    '\u1ff3\u03c9\u03b9\n' '\u1ff4\u03ce\u03b9\n' '\u1ff6\u03c9\u0342\n'
+    '\u1ff7\u03c9\u0342\u03b9\n' '\u1ff8\u1f78\n' '\u1ff9\u1f79\n' '\u1ffa\u1f7c\n'
+    '\u1ffb\u1f7d\n' '\u1ffc\u03c9\u03b9\n' '\u20a8rs\n' '\u2102c\n' '\u2103\xb0c\n'
+    '\u2107\u025b\n' '\u2109\xb0f\n' '\u210bh\n' '\u210ch\n' '\u210dh\n' '\u2110i\n' '\u2111i\n'
+    '\u2112l\n' '\u2115n\n' '\u2116no\n' '\u2119p\n' '\u211aq\n' '\u211br\n' '\u211cr\n'
+    '\u211dr\n' '\u2120sm\n' '\u2121tel\n' '\u2122tm\n' '\u2124z\n' '\u2126\u03c9\n' '\u2128z\n'
+    '\u212ak\n' '\u212b\xe5\n' '\u212cb\n' '\u212dc\n' '\u2130e\n' '\u2131f\n' '\u2132\u214e\n'
+    '\u2133m\n' '\u213e\u03b3\n' '\u213f\u03c0\n' '\u2145d\n' '\u2160\u2170\n' '\u2161\u2171\n'
+    '\u2162\u2172\n' '\u2163\u2173\n' '\u2164\u2174\n' '\u2165\u2175\n' '\u2166\u2176\n'
+    '\u2167\u2177\n' '\u2168\u2178\n' '\u2169\u2179\n' '\u216a\u217a\n' '\u216b\u217b\n'
+    '\u216c\u217c\n' '\u216d\u217d\n' '\u216e\u217e\n' '\u216f\u217f\n' '\u2183\u2184\n'
+    '\u24b6\u24d0\n' '\u24b7\u24d1\n' '\u24b8\u24d2\n' '\u24b9\u24d3\n' '\u24ba\u24d4\n'
+    '\u24bb\u24d5\n' '\u24bc\u24d6\n' '\u24bd\u24d7\n' '\u24be\u24d8\n' '\u24bf\u24d9\n'
+    '\u24c0\u24da\n' '\u24c1\u24db\n' '\u24c2\u24dc\n' '\u24c3\u24dd\n' '\u24c4\u24de\n'
+    '\u24c5\u24df\n' '\u24c6\u24e0\n' '\u24c7\u24e1\n' '\u24c8\u24e2\n' '\u24c9\u24e3\n'
+    '\u24ca\u24e4\n' '\u24cb\u24e5\n' '\u24cc\u24e6\n' '\u24cd\u24e7\n' '\u24ce\u24e8\n'
+    '\u24cf\u24e9\n' '\u3371hpa\n' '\u3373au\n' '\u3375ov\n' '\u3380pa\n' '\u3381na\n'
+    '\u3382\u03bca\n' '\u3383ma\n' '\u3384ka\n' '\u3385kb\n' '\u3386mb\n' '\u3387gb\n' '\u338apf\n'
+    '\u338bnf\n' '\u338c\u03bcf\n' '\u3390hz\n' '\u3391khz\n' '\u3392mhz\n' '\u3393ghz\n'
+    '\u3394thz\n' '\u33a9pa\n' '\u33aakpa\n' '\u33abmpa\n' '\u33acgpa\n' '\u33b4pv\n' '\u33b5nv\n'
+    '\u33b6\u03bcv\n' '\u33b7mv\n' '\u33b8kv\n' '\u33b9mv\n' '\u33bapw\n' '\u33bbnw\n'
+    '\u33bc\u03bcw\n' '\u33bdmw\n' '\u33bekw\n' '\u33bfmw\n' '\u33c0k\u03c9\n' '\u33c1m\u03c9\n'
+    '\u33c3bq\n' '\u33c6c\u2215kg\n' '\u33c7co.\n' '\u33c8db\n' '\u33c9gy\n' '\u33cbhp\n'
+    '\u33cdkk\n' '\u33cekm\n' '\u33d7ph\n' '\u33d9ppm\n' '\u33dapr\n' '\u33dcsv\n' '\u33ddwb\n'
+    '\ufb00ff\n' '\ufb01fi\n' '\ufb02fl\n' '\ufb03ffi\n' '\ufb04ffl\n' '\ufb05st\n' '\ufb06st\n'
+    '\ufb13\u0574\u0576\n' '\ufb14\u0574\u0565\n' '\ufb15\u0574\u056b\n' '\ufb16\u057e\u0576\n'
+    '\ufb17\u0574\u056d\n' '\uff21\uff41\n' '\uff22\uff42\n' '\uff23\uff43\n' '\uff24\uff44\n'
+    '\uff25\uff45\n' '\uff26\uff46\n' '\uff27\uff47\n' '\uff28\uff48\n' '\uff29\uff49\n'
+    '\uff2a\uff4a\n' '\uff2b\uff4b\n' '\uff2c\uff4c\n' '\uff2d\uff4d\n' '\uff2e\uff4e\n'
+    '\uff2f\uff4f\n' '\uff30\uff50\n' '\uff31\uff51\n' '\uff32\uff52\n' '\uff33\uff53\n'
+    '\uff34\uff54\n' '\uff35\uff55\n' '\uff36\uff56\n' '\uff37\uff57\n' '\uff38\uff58\n'
+    '\uff39\uff59\n' '\uff3a\uff5a\n' '\U00010400\U00010428\n' '\U00010401\U00010429\n'
+    '\U00010402\U0001042a\n' '\U00010403\U0001042b\n' '\U00010404\U0001042c\n'
+    '\U00010405\U0001042d\n' '\U00010406\U0001042e\n' '\U00010407\U0001042f\n'
+    '\U00010408\U00010430\n' '\U00010409\U00010431\n' '\U0001040a\U00010432\n'
+    '\U0001040b\U00010433\n' '\U0001040c\U00010434\n' '\U0001040d\U00010435\n'
+    '\U0001040e\U00010436\n' '\U0001040f\U00010437\n' '\U00010410\U00010438\n'
+    '\U00010411\U00010439\n' '\U00010412\U0001043a\n' '\U00010413\U0001043b\n'
+    '\U00010414\U0001043c\n' '\U00010415\U0001043d\n' '\U00010416\U0001043e\n'
+    '\U00010417\U0001043f\n' '\U00010418\U00010440\n' '\U00010419\U00010441\n'
+    '\U0001041a\U00010442\n' '\U0001041b\U00010443\n' '\U0001041c\U00010444\n'
+    '\U0001041d\U00010445\n' '\U0001041e\U00010446\n' '\U0001041f\U00010447\n'
+    '\U00010420\U00010448\n' '\U00010421\U00010449\n' '\U00010422\U0001044a\n'
+    '\U00010423\U0001044b\n' '\U00010424\U0001044c\n' '\U00010425\U0001044d\n' '\U0001d400a\n'
+    '\U0001d401b\n' '\U0001d402c\n' '\U0001d403d\n' '\U0001d404e\n' '\U0001d405f\n' '\U0001d406g\n'
+    '\U0001d407h\n' '\U0001d408i\n' '\U0001d409j\n' '\U0001d40ak\n' '\U0001d40bl\n' '\U0001d40cm\n'
+    '\U0001d40dn\n' '\U0001d40eo\n' '\U0001d40fp\n' '\U0001d410q\n' '\U0001d411r\n' '\U0001d412s\n'
+    '\U0001d413t\n' '\U0001d414u\n' '\U0001d415v\n' '\U0001d416w\n' '\U0001d417x\n' '\U0001d418y\n'
+    '\U0001d419z\n' '\U0001d434a\n' '\U0001d435b\n' '\U0001d436c\n' '\U0001d437d\n' '\U0001d438e\n'
+    '\U0001d439f\n' '\U0001d43ag\n' '\U0001d43bh\n' '\U0001d43ci\n' '\U0001d43dj\n' '\U0001d43ek\n'
+    '\U0001d43fl\n' '\U0001d440m\n' '\U0001d441n\n' '\U0001d442o\n' '\U0001d443p\n' '\U0001d444q\n'
+    '\U0001d445r\n' '\U0001d446s\n' '\U0001d447t\n' '\U0001d448u\n' '\U0001d449v\n' '\U0001d44aw\n'
+    '\U0001d44bx\n' '\U0001d44cy\n' '\U0001d44dz\n' '\U0001d468a\n' '\U0001d469b\n' '\U0001d46ac\n'
+    '\U0001d46bd\n' '\U0001d46ce\n' '\U0001d46df\n' '\U0001d46eg\n' '\U0001d46fh\n' '\U0001d470i\n'
+    '\U0001d471j\n' '\U0001d472k\n' '\U0001d473l\n' '\U0001d474m\n' '\U0001d475n\n' '\U0001d476o\n'
+    '\U0001d477p\n' '\U0001d478q\n' '\U0001d479r\n' '\U0001d47as\n' '\U0001d47bt\n' '\U0001d47cu\n'
+    '\U0001d47dv\n' '\U0001d47ew\n' '\U0001d47fx\n' '\U0001d480y\n' '\U0001d481z\n' '\U0001d49ca\n'
+    '\U0001d49ec\n' '\U0001d49fd\n' '\U0001d4a2g\n' '\U0001d4a5j\n' '\U0001d4a6k\n' '\U0001d4a9n\n'
+    '\U0001d4aao\n' '\U0001d4abp\n' '\U0001d4acq\n' '\U0001d4aes\n' '\U0001d4aft\n' '\U0001d4b0u\n'
+    '\U0001d4b1v\n' '\U0001d4b2w\n' '\U0001d4b3x\n' '\U0001d4b4y\n' '\U0001d4b5z\n' '\U0001d4d0a\n'
+    '\U0001d4d1b\n' '\U0001d4d2c\n' '\U0001d4d3d\n' '\U0001d4d4e\n' '\U0001d4d5f\n' '\U0001d4d6g\n'
+    '\U0001d4d7h\n' '\U0001d4d8i\n' '\U0001d4d9j\n' '\U0001d4dak\n' '\U0001d4dbl\n' '\U0001d4dcm\n'
+    '\U0001d4ddn\n' '\U0001d4deo\n' '\U0001d4dfp\n' '\U0001d4e0q\n' '\U0001d4e1r\n' '\U0001d4e2s\n'
+    '\U0001d4e3t\n' '\U0001d4e4u\n' '\U0001d4e5v\n' '\U0001d4e6w\n' '\U0001d4e7x\n' '\U0001d4e8y\n'
+    '\U0001d4e9z\n' '\U0001d504a\n' '\U0001d505b\n' '\U0001d507d\n' '\U0001d508e\n' '\U0001d509f\n'
+    '\U0001d50ag\n' '\U0001d50dj\n' '\U0001d50ek\n' '\U0001d50fl\n' '\U0001d510m\n' '\U0001d511n\n'
+    '\U0001d512o\n' '\U0001d513p\n' '\U0001d514q\n' '\U0001d516s\n' '\U0001d517t\n' '\U0001d518u\n'
+    '\U0001d519v\n' '\U0001d51aw\n' '\U0001d51bx\n' '\U0001d51cy\n' '\U0001d538a\n' '\U0001d539b\n'
+    '\U0001d53bd\n' '\U0001d53ce\n' '\U0001d53df\n' '\U0001d53eg\n' '\U0001d540i\n' '\U0001d541j\n'
+    '\U0001d542k\n' '\U0001d543l\n' '\U0001d544m\n' '\U0001d546o\n' '\U0001d54as\n' '\U0001d54bt\n'
+    '\U0001d54cu\n' '\U0001d54dv\n' '\U0001d54ew\n' '\U0001d54fx\n' '\U0001d550y\n' '\U0001d56ca\n'
+    '\U0001d56db\n' '\U0001d56ec\n' '\U0001d56fd\n' '\U0001d570e\n' '\U0001d571f\n' '\U0001d572g\n'
+    '\U0001d573h\n' '\U0001d574i\n' '\U0001d575j\n' '\U0001d576k\n' '\U0001d577l\n' '\U0001d578m\n'
+    '\U0001d579n\n' '\U0001d57ao\n' '\U0001d57bp\n' '\U0001d57cq\n' '\U0001d57dr\n' '\U0001d57es\n'
+    '\U0001d57ft\n' '\U0001d580u\n' '\U0001d581v\n' '\U0001d582w\n' '\U0001d583x\n' '\U0001d584y\n'
+    '\U0001d585z\n' '\U0001d5a0a\n' '\U0001d5a1b\n' '\U0001d5a2c\n' '\U0001d5a3d\n' '\U0001d5a4e\n'
+    '\U0001d5a5f\n' '\U0001d5a6g\n' '\U0001d5a7h\n' '\U0001d5a8i\n' '\U0001d5a9j\n' '\U0001d5aak\n'
+    '\U0001d5abl\n' '\U0001d5acm\n' '\U0001d5adn\n' '\U0001d5aeo\n' '\U0001d5afp\n' '\U0001d5b0q\n'
+    '\U0001d5b1r\n' '\U0001d5b2s\n' '\U0001d5b3t\n' '\U0001d5b4u\n' '\U0001d5b5v\n' '\U0001d5b6w\n'
+    '\U0001d5b7x\n' '\U0001d5b8y\n' '\U0001d5b9z\n' '\U0001d5d4a\n' '\U0001d5d5b\n' '\U0001d5d6c\n'
+    '\U0001d5d7d\n' '\U0001d5d8e\n' '\U0001d5d9f\n' '\U0001d5dag\n' '\U0001d5dbh\n' '\U0001d5dci\n'
+    '\U0001d5ddj\n' '\U0001d5dek\n' '\U0001d5dfl\n' '\U0001d5e0m\n' '\U0001d5e1n\n' '\U0001d5e2o\n'
+    '\U0001d5e3p\n' '\U0001d5e4q\n' '\U0001d5e5r\n' '\U0001d5e6s\n' '\U0001d5e7t\n' '\U0001d5e8u\n'
+    '\U0001d5e9v\n' '\U0001d5eaw\n' '\U0001d5ebx\n' '\U0001d5ecy\n' '\U0001d5edz\n' '\U0001d608a\n'
+    '\U0001d609b\n' '\U0001d60ac\n' '\U0001d60bd\n' '\U0001d60ce\n' '\U0001d60df\n' '\U0001d60eg\n'
+    '\U0001d60fh\n' '\U0001d610i\n' '\U0001d611j\n' '\U0001d612k\n' '\U0001d613l\n' '\U0001d614m\n'
+    '\U0001d615n\n' '\U0001d616o\n' '\U0001d617p\n' '\U0001d618q\n' '\U0001d619r\n' '\U0001d61as\n'
+    '\U0001d61bt\n' '\U0001d61cu\n' '\U0001d61dv\n' '\U0001d61ew\n' '\U0001d61fx\n' '\U0001d620y\n'
+    '\U0001d621z\n' '\U0001d63ca\n' '\U0001d63db\n' '\U0001d63ec\n' '\U0001d63fd\n' '\U0001d640e\n'
+    '\U0001d641f\n' '\U0001d642g\n' '\U0001d643h\n' '\U0001d644i\n' '\U0001d645j\n' '\U0001d646k\n'
+    '\U0001d647l\n' '\U0001d648m\n' '\U0001d649n\n' '\U0001d64ao\n' '\U0001d64bp\n' '\U0001d64cq\n'
+    '\U0001d64dr\n' '\U0001d64es\n' '\U0001d64ft\n' '\U0001d650u\n' '\U0001d651v\n' '\U0001d652w\n'
+    '\U0001d653x\n' '\U0001d654y\n' '\U0001d655z\n' '\U0001d670a\n' '\U0001d671b\n' '\U0001d672c\n'
+    '\U0001d673d\n' '\U0001d674e\n' '\U0001d675f\n' '\U0001d676g\n' '\U0001d677h\n' '\U0001d678i\n'
+    '\U0001d679j\n' '\U0001d67ak\n' '\U0001d67bl\n' '\U0001d67cm\n' '\U0001d67dn\n' '\U0001d67eo\n'
+    '\U0001d67fp\n' '\U0001d680q\n' '\U0001d681r\n' '\U0001d682s\n' '\U0001d683t\n' '\U0001d684u\n'
+    '\U0001d685v\n' '\U0001d686w\n' '\U0001d687x\n' '\U0001d688y\n' '\U0001d689z\n'
+    '\U0001d6a8\u03b1\n' '\U0001d6a9\u03b2\n' '\U0001d6aa\u03b3\n' '\U0001d6ab\u03b4\n'
+    '\U0001d6ac\u03b5\n' '\U0001d6ad\u03b6\n' '\U0001d6ae\u03b7\n' '\U0001d6af\u03b8\n'
+    '\U0001d6b0\u03b9\n' '\U0001d6b1\u03ba\n' '\U0001d6b2\u03bb\n' '\U0001d6b3\u03bc\n'
+    '\U0001d6b4\u03bd\n' '\U0001d6b5\u03be\n' '\U0001d6b6\u03bf\n' '\U0001d6b7\u03c0\n'
+    '\U0001d6b8\u03c1\n' '\U0001d6b9\u03b8\n' '\U0001d6ba\u03c3\n' '\U0001d6bb\u03c4\n'
+    '\U0001d6bc\u03c5\n' '\U0001d6bd\u03c6\n' '\U0001d6be\u03c7\n' '\U0001d6bf\u03c8\n'
+    '\U0001d6c0\u03c9\n' '\U0001d6d3\u03c3\n' '\U0001d6e2\u03b1\n' '\U0001d6e3\u03b2\n'
+    '\U0001d6e4\u03b3\n' '\U0001d6e5\u03b4\n' '\U0001d6e6\u03b5\n' '\U0001d6e7\u03b6\n'
+    '\U0001d6e8\u03b7\n' '\U0001d6e9\u03b8\n' '\U0001d6ea\u03b9\n' '\U0001d6eb\u03ba\n'
+    '\U0001d6ec\u03bb\n' '\U0001d6ed\u03bc\n' '\U0001d6ee\u03bd\n' '\U0001d6ef\u03be\n'
+    '\U0001d6f0\u03bf\n' '\U0001d6f1\u03c0\n' '\U0001d6f2\u03c1\n' '\U0001d6f3\u03b8\n'
+    '\U0001d6f4\u03c3\n' '\U0001d6f5\u03c4\n' '\U0001d6f6\u03c5\n' '\U0001d6f7\u03c6\n'
+    '\U0001d6f8\u03c7\n' '\U0001d6f9\u03c8\n' '\U0001d6fa\u03c9\n' '\U0001d70d\u03c3\n'
+    '\U0001d71c\u03b1\n' '\U0001d71d\u03b2\n' '\U0001d71e\u03b3\n' '\U0001d71f\u03b4\n'
+    '\U0001d720\u03b5\n' '\U0001d721\u03b6\n' '\U0001d722\u03b7\n' '\U0001d723\u03b8\n'
+    '\U0001d724\u03b9\n' '\U0001d725\u03ba\n' '\U0001d726\u03bb\n' '\U0001d727\u03bc\n'
+    '\U0001d728\u03bd\n' '\U0001d729\u03be\n' '\U0001d72a\u03bf\n' '\U0001d72b\u03c0\n'
+    '\U0001d72c\u03c1\n' '\U0001d72d\u03b8\n' '\U0001d72e\u03c3\n' '\U0001d72f\u03c4\n'
+    '\U0001d730\u03c5\n' '\U0001d731\u03c6\n' '\U0001d732\u03c7\n' '\U0001d733\u03c8\n'
+    '\U0001d734\u03c9\n' '\U0001d747\u03c3\n' '\U0001d756\u03b1\n' '\U0001d757\u03b2\n'
+    '\U0001d758\u03b3\n' '\U0001d759\u03b4\n' '\U0001d75a\u03b5\n' '\U0001d75b\u03b6\n'
+    '\U0001d75c\u03b7\n' '\U0001d75d\u03b8\n' '\U0001d75e\u03b9\n' '\U0001d75f\u03ba\n'
+    '\U0001d760\u03bb\n' '\U0001d761\u03bc\n' '\U0001d762\u03bd\n' '\U0001d763\u03be\n'
+    '\U0001d764\u03bf\n' '\U0001d765\u03c0\n' '\U0001d766\u03c1\n' '\U0001d767\u03b8\n'
+    '\U0001d768\u03c3\n' '\U0001d769\u03c4\n' '\U0001d76a\u03c5\n' '\U0001d76b\u03c6\n'
+    '\U0001d76c\u03c7\n' '\U0001d76d\u03c8\n' '\U0001d76e\u03c9\n' '\U0001d781\u03c3\n'
+    '\U0001d790\u03b1\n' '\U0001d791\u03b2\n' '\U0001d792\u03b3\n' '\U0001d793\u03b4\n'
+    '\U0001d794\u03b5\n' '\U0001d795\u03b6\n' '\U0001d796\u03b7\n' '\U0001d797\u03b8\n'
+    '\U0001d798\u03b9\n' '\U0001d799\u03ba\n' '\U0001d79a\u03bb\n' '\U0001d79b\u03bc\n'
+    '\U0001d79c\u03bd\n' '\U0001d79d\u03be\n' '\U0001d79e\u03bf\n' '\U0001d79f\u03c0\n'
+    '\U0001d7a0\u03c1\n' '\U0001d7a1\u03b8\n' '\U0001d7a2\u03c3\n' '\U0001d7a3\u03c4\n'
+    '\U0001d7a4\u03c5\n' '\U0001d7a5\u03c6\n' '\U0001d7a6\u03c7\n' '\U0001d7a7\u03c8\n'
+    '\U0001d7a8\u03c9\n' '\U0001d7bb\u03c3\n'
+)
+
+# Tables C.1.2 to C.9 as (first, last, table) tuples.
+PROHIBITED_RANGES = (
+    (0x00A0, 0x00A0, 'C.1.2'), (0x1680, 0x1680, 'C.1.2'), (0x2000, 0x200B, 'C.1.2'),
+    (0x202F, 0x202F, 'C.1.2'), (0x205F, 0x205F, 'C.1.2'), (0x3000, 0x3000, 'C.1.2'),
+    (0x0000, 0x001F, 'C.2.1'), (0x007F, 0x007F, 'C.2.1'), (0x0080, 0x009F, 'C.2.2'),
+    (0x06DD, 0x06DD, 'C.2.2'), (0x070F, 0x070F, 'C.2.2'), (0x180E, 0x180E, 'C.2.2'),
+    (0x200C, 0x200D, 'C.2.2'), (0x2028, 0x2029, 'C.2.2'), (0x2060, 0x2063, 'C.2.2'),
+    (0x206A, 0x206F, 'C.2.2'), (0xFEFF, 0xFEFF, 'C.2.2'), (0xFFF9, 0xFFFC, 'C.2.2'),
+    (0x1D173, 0x1D17A, 'C.2.2'), (0xE000, 0xF8FF, 'C.3'), (0xF0000, 0xFFFFD, 'C.3'),
+    (0x100000, 0x10FFFD, 'C.3'), (0xFDD0, 0xFDEF, 'C.4'), (0xFFFE, 0xFFFF, 'C.4'),
+    (0x1FFFE, 0x1FFFF, 'C.4'), (0x2FFFE, 0x2FFFF, 'C.4'), (0x3FFFE, 0x3FFFF, 'C.4'),
+    (0x4FFFE, 0x4FFFF, 'C.4'), (0x5FFFE, 0x5FFFF, 'C.4'), (0x6FFFE, 0x6FFFF, 'C.4'),
+    (0x7FFFE, 0x7FFFF, 'C.4'), (0x8FFFE, 0x8FFFF, 'C.4'), (0x9FFFE, 0x9FFFF, 'C.4'),
+    (0xAFFFE, 0xAFFFF, 'C.4'), (0xBFFFE, 0xBFFFF, 'C.4'), (0xCFFFE, 0xCFFFF, 'C.4'),
+    (0xDFFFE, 0xDFFFF, 'C.4'), (0xEFFFE, 0xEFFFF, 'C.4'), (0xFFFFE, 0xFFFFF, 'C.4'),
+    (0x10FFFE, 0x10FFFF, 'C.4'), (0xD800, 0xDFFF, 'C.5'), (0xFFF9, 0xFFFD, 'C.6'),
+    (0x2FF0, 0x2FFB, 'C.7'), (0x0340, 0x0341, 'C.8'), (0x200E, 0x200F, 'C.8'),
+    (0x202A, 0x202E, 'C.8'), (0x206A, 0x206F, 'C.8'), (0xE0001, 0xE0001, 'C.9'),
+    (0xE0020, 0xE007F, 'C.9'),
+)
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon. If
+# not, see <http://www.gnu.org/licenses/>.
+
+"""asyncio counterparts to the (un)marshal methods of content handlers.
+
+The functions in this module take a :py:class:`~.handlers.ContentHandler` instance as first
+argument. Unmarshalling functions read the body from an :py:class:`asyncio.StreamReader` (or any
+object with an awaitable ``read()`` method) or an async iterator of ``bytes`` chunks, marshalling
+functions are async generators yielding ``bytes`` chunks.
+
+Lists are parsed incrementally for JSON, MessagePack and XML and encoded incrementally by handlers
+that support partial lists (see :py:attr:`.ContentHandler.SUPPORT_PARTIAL_LISTS`), other formats
+buffer the whole body. In any case, these functions yield to the event
+loop regularly, so that a huge list does not block other tasks on the same loop.
+
+:py:attr:`.ContentHandler.MAX_BODY_BYTES` is enforced while reading the body. With incremental
+parsers, the other limits are checked for every element (including lists and dictionaries nested
+in it) as soon as it is parsed. Unlike :py:meth:`.ContentHandler.check_limits`, this happens after
+the element is built, so a single element may use up to :py:attr:`~.ContentHandler.MAX_BODY_BYTES`
+worth of memory before it is rejected. Elements nested too deeply to be parsed at all raise
+:py:exc:`~.error.UnmarshalError`.
+
+.. NOTE:: This module requires Python 3.6 or later.
+
+.. moduleauthor:: Mathias Ertl <mati@restauth.net>
+"""
+
+import asyncio
+import codecs
+
+from RestAuthCommon import error
+from RestAuthCommon.handlers import JSONContentHandler
+from RestAuthCommon.handlers import Limits
+from RestAuthCommon.handlers import MessagePackContentHandler
+from RestAuthCommon.handlers import XMLContentHandler
+
+CHUNK_SIZE = 65536
+"""Size of chunks read from a stream, fed to incremental parsers and yielded by marshal
+functions."""
+
+YIELD_EVERY = 1000
+"""Number of list elements after which functions yield to the event loop."""
+
+
+class JSONListParser(object):
+    """Incremental parser for JSON arrays."""
+
+    whitespace = ' \t\n\r'
+
+    def __init__(self, handler):
+        self.decoder = handler.library.JSONDecoder()
+        self.text = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.started = False
+        self.empty = True
+        self.done = False
+        self.separator = False  # True if the next token must be a ',' (or ']')
+
+    def _skip(self, pos):
+        while pos < len(self.buf) and self.buf[pos] in self.whitespace:
+            pos += 1
+        return pos
+
+    def feed(self, data, final=False):
+        self.buf += self.text.decode(data, final)
+        elements = []
+        pos = self._skip(0)
+
+        while pos < len(self.buf) and not self.done:
+            if not self.started:
+                if self.buf[pos] != '[':
+                    raise error.UnmarshalError('Body is not a JSON array.')
+                self.started = True
+                pos = self._skip(pos + 1)
+            elif self.buf[pos] == ']' and (self.separator or self.empty):
+                self.done = True
+                pos = self._skip(pos + 1)
+            elif self.separator:
+                if self.buf[pos] != ',':
+                    raise error.UnmarshalError('Expected "," at position %s.' % pos)
+                self.separator = False
+                pos = self._skip(pos + 1)
+            else:
+                try:
+                    element, end = self.decoder.raw_decode(self.buf, pos)
+                except ValueError as e:
+                    if final:
+                        raise error.UnmarshalError(e)
+                    break  # incomplete element, wait for more data
+                except RecursionError:
+                    raise error.UnmarshalError('List element is nested too deeply.')
+
+                # A number at the very end of the buffer might continue in the next chunk.
+                if end == len(self.buf) and not final:
+                    break
+
+                elements.append(element)
+                self.empty = False
+                self.separator = True
+                pos = self._skip(end)
+
+        if pos < len(self.buf) and self.done:
+            raise error.UnmarshalError('Extra data after JSON array.')
+        self.buf = self.buf[pos:]
+
+        if final and not self.done:
+            raise error.UnmarshalError('Incomplete JSON array.')
+        return elements
+
+
+class MessagePackListParser(object):
+    """Incremental parser for MessagePack arrays."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.unpacker = handler.library.Unpacker()
+        self.length = None
+        self.parsed = 0
+
+    def feed(self, data, final=False):
+        OutOfData = self.handler.library.OutOfData
+        self.unpacker.feed(data)
+        elements = []
+
+        try:
+            if self.length is None:
+                self.length = self.unpacker.read_array_header()
+            while self.parsed < self.length:
+                elements.append(self.handler.normalize_str(self.unpacker.unpack()))
+                self.parsed += 1
+        except OutOfData:
+            pass
+        except Exception as e:
+            raise error.UnmarshalError(e)
+
+        if final and (self.length is None or self.parsed < self.length):
+            raise error.UnmarshalError('Incomplete MessagePack array.')
+        return elements
+
+
+class XMLListParser(object):
+    """Incremental parser for lists encoded by :py:class:`~.handlers.XMLContentHandler`."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.parser = handler.library.XMLPullParser(events=('start', 'end'),
+                                                    **handler.PARSER_OPTIONS)
+        self.depth = 0
+
+    def feed(self, data, final=False):
+        elements = []
+        try:
+            self.parser.feed(data)
+            if final:
+                self.parser.close()
+
+            for event, elem in self.parser.read_events():
+                if event == 'start':
+                    self.depth += 1
+                    if self.depth == 1 and elem.getroottree().docinfo.internalDTD is not None:
+                        raise error.UnmarshalError('Document type declarations are not allowed.')
+                    continue
+
+                self.depth -= 1
+                if self.depth == 1:
+                    if elem.tag == 'str':
+                        elements.append(self.handler.normalize_str(elem.text or ''))
+
+                    # free memory of elements already parsed
+                    elem.clear()
+                    parent = elem.getparent()
+                    while elem.getprevious() is not None:
+                        del parent[0]
+        except self.handler.library.XMLSyntaxError as e:
+            raise error.UnmarshalError(e)
+        return elements
+
+
+class BufferedListParser(object):
+    """Fallback parser that buffers the whole body, used for handlers that can't parse
+    incrementally."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.chunks = []
+
+    def feed(self, data, final=False):
+        self.chunks.append(data)
+        if final:
+            return self.handler.unmarshal_list(b''.join(self.chunks))
+        return []
+
+
+LIST_PARSERS = {
+    JSONContentHandler: JSONListParser,
+    MessagePackContentHandler: MessagePackListParser,
+    XMLContentHandler: XMLListParser,
+}
+"""Mapping of handler classes to incremental parsers for lists.
+
+Subclasses of the handler classes use the same parser. Handlers not found here buffer the whole
+body before unmarshalling it.
+"""
+
+
+def _check_value(limits, value):
+    if isinstance(value, str):
+        limits.string(len(value))
+    elif isinstance(value, list):
+        limits.enter()
+        for item in value:
+            limits.item()
+            _check_value(limits, item)
+        limits.leave()
+    elif isinstance(value, dict):
+        limits.enter()
+        for key, item in value.items():
+            limits.item()
+            _check_value(limits, key)
+            _check_value(limits, item)
+        limits.leave()
+
+
+def _check_element(limits, element):
+    limits.item()
+    try:
+        _check_value(limits, element)
+    except RecursionError:
+        raise error.UnmarshalError('List element is nested too deeply.')
+
+
+def _lookup(registry, handler):
+    for cls in type(handler).__mro__:
+        if cls in registry:
+            return registry[cls]
+
+
+async def _read_chunks(source):
+    if hasattr(source, 'read'):
+        while True:
+            chunk = await source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        async for chunk in source:
+            for i in range(0, len(chunk), CHUNK_SIZE):
+                yield chunk[i:i + CHUNK_SIZE]
+
+
+async def iter_chunks(source, max_bytes=None):
+    """Iterate over ``bytes`` chunks of at most :py:data:`CHUNK_SIZE` bytes read from ``source``.
+
+    :param source: An :py:class:`asyncio.StreamReader` or an async iterator of ``bytes``.
+    :param int max_bytes: Raise :py:exc:`~.error.RequestEntityTooLarge` as soon as more than this
+        many bytes are read.
+    """
+    size = 0
+    chunks = _read_chunks(source)
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise error.RequestEntityTooLarge('Body is larger than %s bytes.' % max_bytes)
+            yield chunk
+    finally:  # do not leave finalizing the generator to the garbage collector
+        await chunks.aclose()
+
+
+async def read_body(source, max_bytes=None):
+    """Read the whole body from ``source``.
+
+    :param source: An :py:class:`asyncio.StreamReader` or an async iterator of ``bytes``.
+    :param int max_bytes: Raise :py:exc:`~.error.RequestEntityTooLarge` as soon as more than this
+        many bytes are read.
+    :rtype: bytes
+    """
+    return b''.join([chunk async for chunk in iter_chunks(source, max_bytes)])
+
+
+async def iter_list(handler, source):
+    """Incrementally unmarshal a list, yielding its elements as soon as they are parsed.
+
+    :param handler: The content handler to use.
+    :type  handler: :py:class:`~.handlers.ContentHandler`
+    :param source: An :py:class:`asyncio.StreamReader` or an async iterator of ``bytes``.
+    :raise error.UnmarshalError: If the body can't be unmarshalled.
+    """
+    parser = _lookup(LIST_PARSERS, handler)
+    if parser is None:  # handler checks limits itself
+        parser = BufferedListParser(handler)
+        limits = None
+    else:
+        parser = parser(handler)
+        limits = Limits(handler)
+        limits.enter()
+    parsed = 0
+
+    chunks = iter_chunks(source, handler.MAX_BODY_BYTES)
+    try:
+        async for chunk in chunks:
+            for element in parser.feed(chunk):
+                if limits is not None:
+                    _check_element(limits, element)
+                yield element
+                parsed += 1
+                if parsed % YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+    finally:
+        await chunks.aclose()
+
+    for element in parser.feed(b'', final=True):
+        if limits is not None:
+            _check_element(limits, element)
+        yield element
+        parsed += 1
+        if parsed % YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+
+
+async def unmarshal_list(handler, source):
+    """Async counterpart to :py:meth:`.ContentHandler.unmarshal_list`.
+
+    :param handler: The content handler to use.
+    :type  handler: :py:class:`~.handlers.ContentHandler`
+    :param source: An :py:class:`asyncio.StreamReader` or an async iterator of ``bytes``.
+    :rtype: list
+    :raise error.UnmarshalError: If the body can't be unmarshalled.
+    """
+    unmarshalled = [element async for element in iter_list(handler, source)]
+    if handler.INTERN:
+        return handler.intern_list(unmarshalled)
+    return unmarshalled
+
+
+async def unmarshal_dict(handler, source):
+    """Async counterpart to :py:meth:`.ContentHandler.unmarshal_dict`.
+
+    Dictionaries are never parsed incrementally, the whole body is read before unmarshalling it.
+    """
+    return handler.unmarshal_dict(await read_body(source, handler.MAX_BODY_BYTES))
+
+
+async def unmarshal_str(handler, source):
+    """Async counterpart to :py:meth:`.ContentHandler.unmarshal_str`."""
+    return handler.unmarshal_str(await read_body(source, handler.MAX_BODY_BYTES))
+
+
+async def _chunked(data, chunk_size):
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+async def marshal_list(handler, obj, chunk_size=CHUNK_SIZE):
+    """Async counterpart to :py:meth:`.ContentHandler.marshal_list`.
+
+    The concatenated chunks are identical to what ``handler.marshal_list(obj)`` returns.
+
+    :param handler: The content handler to use.
+    :type  handler: :py:class:`~.handlers.ContentHandler`
+    :param list obj: The list to marshal.
+    :param int chunk_size: Minimum size of yielded chunks (except for the last chunk).
+    :raise error.MarshalError: If marshalling goes wrong in any way.
+    """
+    if not handler.SUPPORT_PARTIAL_LISTS:
+        async for chunk in _chunked(handler.marshal_list(obj), chunk_size):
+            yield chunk
+        return
+
+    try:
+        parts = [handler.marshal_list_start(len(obj))]
+        size = len(parts[0])
+
+        for i in range(0, len(obj), YIELD_EVERY):
+            encoded = handler.marshal_list_items(obj[i:i + YIELD_EVERY], i == 0)
+            parts.append(encoded)
+            size += len(encoded)
+
+            if size >= chunk_size:
+                yield b''.join(parts)
+                parts = []
+                size = 0
+            await asyncio.sleep(0)
+        parts.append(handler.marshal_list_end(len(obj)))
+    except error.MarshalError:
+        raise
+    except Exception as e:
+        raise error.MarshalError(e)
+
+    yield b''.join(parts)
+
+
+async def marshal_dict(handler, obj, chunk_size=CHUNK_SIZE):
+    """Async counterpart to :py:meth:`.ContentHandler.marshal_dict`.
+
+    The dictionary is marshalled at once, the result is yielded in chunks.
+    """
+    async for chunk in _chunked(handler.marshal_dict(obj), chunk_size):
+        yield chunk
+
+
+async def marshal_str(handler, obj, chunk_size=CHUNK_SIZE):
+    """Async counterpart to :py:meth:`.ContentHandler.marshal_str`."""
+    async for chunk in _chunked(handler.marshal_str(obj), chunk_size):
+        yield chunk
@@ -0,0 +1,706 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon. If
+# not, see <http://www.gnu.org/licenses/>.
+
+"""Caches for marshalled and unmarshalled data.
+
+.. moduleauthor:: Mathias Ertl <mati@restauth.net>
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import pickle
+import struct
+import threading
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import MappingProxyType
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover - python < 3.8
+    shared_memory = None
+
+from RestAuthCommon.handlers import CONTENT_HANDLERS
+from RestAuthCommon.handlers import get_handler
+
+
+class CacheStore(object):
+    """Base class for stores used by :py:class:`ResponseCache`.
+
+    A store maps keys to bytes and evicts the least recently used entries once the total size of
+    all values exceeds ``max_bytes``. Stores must be thread-safe.
+
+    :param int max_bytes: The maximum total size of all values in bytes.
+    """
+
+    def __init__(self, max_bytes=67108864):
+        self.max_bytes = max_bytes
+
+    def get(self, key):  # pragma: no cover
+        """Get the value for ``key``, or ``None`` if it is not stored."""
+        raise NotImplementedError
+
+    def set(self, key, value):  # pragma: no cover
+        """Store ``value`` (bytes) for ``key``. Values larger than ``max_bytes`` are not stored."""
+        raise NotImplementedError
+
+    def delete(self, key):  # pragma: no cover
+        """Remove ``key`` from the store, if present."""
+        raise NotImplementedError
+
+    def clear(self):  # pragma: no cover
+        """Remove all entries from the store."""
+        raise NotImplementedError
+
+    def stats(self):  # pragma: no cover
+        """Get a dictionary with the keys ``entries``, ``bytes``, ``max_bytes`` and
+        ``evictions``."""
+        raise NotImplementedError
+
+
+class MemoryStore(CacheStore):
+    """Store keeping values in a dictionary of the current process."""
+
+    def __init__(self, max_bytes=67108864):
+        super(MemoryStore, self).__init__(max_bytes=max_bytes)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return None
+            self._data[key] = value  # move to the end
+            return value
+
+    def _size(self, value):
+        return len(value)
+
+    def set(self, key, value):
+        size = self._size(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(old)
+            if size > self.max_bytes:
+                return
+
+            while self._bytes + size > self.max_bytes:
+                evicted = self._data.popitem(last=False)[1]
+                self._bytes -= self._size(evicted)
+                self._evictions += 1
+
+            self._data[key] = value
+            self._bytes += size
+
+    def delete(self, key):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(old)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions,
+            }
+
+
+class SharedMemoryStore(CacheStore):
+    """Store keeping values in a :py:mod:`multiprocessing.shared_memory` segment.
+
+    The segment is shared by all processes forked after the store was created, so a pre-fork server
+    keeps only one copy of every cached value per machine::
+
+        >>> store = SharedMemoryStore(max_bytes=1048576)
+        >>> cache = ResponseCache(store=store)
+        >>> # ... fork workers, each using cache ...
+        >>> store.unlink()  # in the parent, once the workers exited
+
+    Keys are pickled and identified by their 16 byte blake2b digest, so they must be picklable.
+    Writers serialize via ``lock`` and increment a version number before and after every change.
+    :py:meth:`get` does not take the lock: It copies the value and retries if the version changed
+    in the meantime. :py:meth:`view` returns a :py:class:`memoryview` of the value without copying
+    it, but holds the lock until the ``with`` block is left.
+
+    Space for values is allocated first fit. If no free region is large enough (or all
+    ``max_entries`` slots are used), the least recently used entries are evicted.
+
+    :param int max_bytes: The size of the data area of the segment.
+    :param int max_entries: The maximum number of entries.
+    :param str name: Attach to the existing segment ``name`` instead of creating a new one. You
+        have to pass the ``lock``, ``max_bytes`` and ``max_entries`` of the creating store.
+    :param lock: A :py:func:`multiprocessing.Lock` (or compatible lock) shared by all processes
+        using the segment. A new lock is created if omitted.
+    """
+
+    _header = struct.Struct('<QQQQQ')  # version, clock, entries, bytes, evictions
+    _slot = struct.Struct('<QQQ')  # offset, length, last used
+    _digest_size = 16
+    _empty = b'\0' * 16
+    _retries = 3
+
+    def __init__(self, max_bytes=67108864, max_entries=4096, name=None, lock=None):
+        if shared_memory is None:  # pragma: no cover
+            raise RuntimeError('SharedMemoryStore requires Python 3.8 or later.')
+        super(SharedMemoryStore, self).__init__(max_bytes=max_bytes)
+
+        if lock is None:
+            import multiprocessing
+            lock = multiprocessing.Lock()
+        self.lock = lock
+        self.max_entries = max_entries
+
+        self._digests = self._header.size
+        self._slots = self._digests + max_entries * self._digest_size
+        self._data = self._slots + max_entries * self._slot.size
+        size = self._data + max_bytes
+
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shm.buf[:self._data] = b'\0' * self._data
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+
+    def _key(self, key):
+        return hashlib.blake2b(pickle.dumps(key, protocol=2),
+                               digest_size=self._digest_size).digest()
+
+    def _find(self, digest):
+        digests = self._shm.buf[self._digests:self._slots].tobytes()
+        index = digests.find(digest)
+        while index >= 0 and index % self._digest_size:
+            index = digests.find(digest, index + 1)
+        if index < 0:
+            return None
+        return index // self._digest_size
+
+    def _read_header(self):
+        return self._header.unpack_from(self._shm.buf, 0)
+
+    def _read_slot(self, index):
+        return self._slot.unpack_from(self._shm.buf, self._slots + index * self._slot.size)
+
+    def _write_slot(self, index, offset, length, used):
+        self._slot.pack_into(self._shm.buf, self._slots + index * self._slot.size,
+                             offset, length, used)
+
+    def _touch(self, index):
+        # Called by readers without the lock, so only the clock and the last used field of the slot
+        # are written. Races only lose an increment of the clock, which merely affects LRU order.
+        buf = self._shm.buf
+        clock = struct.unpack_from('<Q', buf, 8)[0] + 1
+        struct.pack_into('<Q', buf, 8, clock)
+        struct.pack_into('<Q', buf, self._slots + index * self._slot.size + 16, clock)
+
+    def _begin(self):
+        version = self._read_header()[0]
+        struct.pack_into('<Q', self._shm.buf, 0, version + 1)
+
+    def _end(self, entries_delta=0, bytes_delta=0, evictions_delta=0):
+        version, clock, entries, size, evictions = self._read_header()
+        self._header.pack_into(self._shm.buf, 0, version + 1, clock, entries + entries_delta,
+                               size + bytes_delta, evictions + evictions_delta)
+
+    def _lookup(self, digest):
+        index = self._find(digest)
+        if index is None:
+            return None
+        offset, length, used = self._read_slot(index)
+        self._touch(index)
+        return offset, length
+
+    def get(self, key):
+        digest = self._key(key)
+        buf = self._shm.buf
+
+        for i in range(self._retries):
+            version = self._read_header()[0]
+            if version % 2:  # a writer is active
+                continue
+
+            found = self._lookup(digest)
+            value = None if found is None else bytes(
+                buf[self._data + found[0]:self._data + found[0] + found[1]])
+            if self._read_header()[0] == version:
+                return value
+
+        with self.lock:  # too much contention, read with the lock held
+            found = self._lookup(digest)
+            if found is None:
+                return None
+            return bytes(buf[self._data + found[0]:self._data + found[0] + found[1]])
+
+    @contextmanager
+    def view(self, key):
+        """Context manager yielding a :py:class:`memoryview` of the value for ``key`` (or
+        ``None``) without copying it.
+
+        The lock is held while the ``with`` block executes, so keep it short and do not use the
+        view after the block was left.
+        """
+        with self.lock:
+            found = self._lookup(self._key(key))
+            if found is None:
+                yield None
+                return
+
+            start = self._data + found[0]
+            view = self._shm.buf[start:start + found[1]]
+            try:
+                yield view
+            finally:
+                view.release()
+
+    def _delete(self, index):
+        offset, length, used = self._read_slot(index)
+        start = self._digests + index * self._digest_size
+        self._shm.buf[start:start + self._digest_size] = self._empty
+        self._write_slot(index, 0, 0, 0)
+        return length
+
+    def _used(self):
+        """Get a list of ``(offset, length, used, index)`` tuples for all entries."""
+        digests = self._shm.buf[self._digests:self._slots].tobytes()
+        slots = self._shm.buf[self._slots:self._data].tobytes()
+        used = []
+        for index, (offset, length, last) in enumerate(self._slot.iter_unpack(slots)):
+            if digests[index * self._digest_size:(index + 1) * self._digest_size] != self._empty:
+                used.append((offset, length, last, index))
+        return used
+
+    def _allocate(self, size, used):
+        """Get the offset of the first free region of ``size`` bytes, or ``None``."""
+        position = 0
+        for offset, length, last, index in sorted(used):
+            if offset - position >= size:
+                return position
+            position = offset + length
+        if self.max_bytes - position >= size:
+            return position
+        return None
+
+    def set(self, key, value):
+        digest = self._key(key)
+        size = len(value)
+
+        with self.lock:
+            self._begin()
+            entries = added = removed = evictions = 0
+            try:
+                index = self._find(digest)
+                if index is not None:
+                    removed += self._delete(index)
+                    entries -= 1
+                if size > self.max_bytes:
+                    return
+
+                used = self._used()
+                offset = None
+                if len(used) < self.max_entries:
+                    offset = self._allocate(size, used)
+                while offset is None:  # evict least recently used entries until the value fits
+                    lru = min(used, key=lambda e: e[2])
+                    used.remove(lru)
+                    removed += self._delete(lru[3])
+                    entries -= 1
+                    evictions += 1
+                    offset = self._allocate(size, used)
+
+                index = self._find(self._empty)
+                start = self._data + offset
+                self._shm.buf[start:start + size] = value
+                start = self._digests + index * self._digest_size
+                self._shm.buf[start:start + self._digest_size] = digest
+                self._write_slot(index, offset, size, 0)
+                self._touch(index)
+                entries += 1
+                added = size
+            finally:
+                self._end(entries, added - removed, evictions)
+
+    def delete(self, key):
+        digest = self._key(key)
+        with self.lock:
+            self._begin()
+            index = self._find(digest)
+            if index is None:
+                self._end()
+            else:
+                self._end(-1, -self._delete(index))
+
+    def clear(self):
+        with self.lock:
+            self._begin()
+            try:
+                self._shm.buf[self._digests:self._data] = b'\0' * (self._data - self._digests)
+            finally:
+                version, clock, entries, size, evictions = self._read_header()
+                self._header.pack_into(self._shm.buf, 0, version + 1, clock, 0, 0, evictions)
+
+    def stats(self):
+        version, clock, entries, size, evictions = self._read_header()
+        return {
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'evictions': evictions,
+        }
+
+    def close(self):
+        """Close access to the segment from this instance (the segment itself is not removed)."""
+        self._shm.close()
+
+    def unlink(self):
+        """Remove the segment. Call this once, after all processes are done using the store."""
+        self._shm.close()
+        self._shm.unlink()
+
+
+class SingleFlight(object):
+    """Coalesce concurrent identical calls.
+
+    If a call with the same key is already in progress, :py:meth:`call` waits for it and returns
+    its result instead of calling ``func`` again. This prevents a thundering herd of identical
+    marshal calls e.g. after a popular group was modified::
+
+        >>> flight = SingleFlight()
+        >>> flight.call(('members', 'admins', 4), handler.marshal_list, members)  # doctest: +SKIP
+
+    If the call raises an exception, the exception is raised in all waiting callers. Results are
+    not cached: Once a call returned, the next call with the same key calls ``func`` again.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+        self.shared = 0
+        """Number of calls that waited for another call instead of calling ``func``."""
+
+    def call(self, key, func, *args):
+        """Call ``func(*args)``, unless a call with the same ``key`` is in progress in another
+        thread.
+
+        :param key: A hashable key identifying the call.
+        :param func: The function to call.
+        :return: The return value of ``func``.
+        """
+        from concurrent.futures import Future
+
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                leader = False
+            else:
+                future = self._calls[key] = Future()
+                leader = True
+
+        if leader:
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+        return future.result()
+
+    def call_async(self, key, func, *args):
+        """Like :py:meth:`call`, but for coroutine functions and :py:mod:`asyncio` tasks.
+
+        >>> body = await flight.call_async(key, handler.offload, 'marshal_list', members)
+
+        The coroutine runs in its own task, so it is not cancelled if one of the waiting tasks is
+        cancelled. Calls are only coalesced within the same event loop.
+
+        .. NOTE:: This method requires Python 3.4 or later.
+
+        :param func: A coroutine function (or any function returning an awaitable).
+        :rtype: :py:class:`asyncio.Future`
+        """
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is not None:
+                self.shared += 1
+            else:
+                task = self._tasks[task_key] = asyncio.ensure_future(func(*args), loop=loop)
+                task.add_done_callback(lambda t: self._tasks.pop(task_key, None))
+        return asyncio.shield(task)
+
+
+class ResponseCache(object):
+    """Cache for marshalled lists, dictionaries and strings.
+
+    Entries are identified by the MIME type and a key chosen by the caller. The key must change
+    whenever the data changes, e.g. by including a version number or modification timestamp::
+
+        >>> cache = ResponseCache(max_bytes=1048576)
+        >>> key = ('members', 'admins', 3)  # version 3 of the members of group "admins"
+        >>> cache.marshal_list('application/json', key, lambda: ['user1', 'user2'])
+        b'["user1","user2"]'
+
+    The object to marshal may be passed as a callable, so that it is only created if the entry is
+    not cached. The variant for every MIME type is created upon first request for that MIME type.
+    The objects returned by the most recently used callables are kept, so that the callable for a
+    key is called only once even if the key is requested in several MIME types. Concurrent
+    requests for the same missing entry are coalesced using :py:class:`SingleFlight`, so the
+    object is only marshalled once.
+
+    :param store: The store for marshalled data. If omitted, a :py:class:`MemoryStore` is used.
+    :type  store: :py:class:`CacheStore`
+    :param int max_bytes: Passed to the :py:class:`MemoryStore` if ``store`` is omitted.
+    :param int max_sources: The number of objects returned by callables that are kept.
+    """
+
+    def __init__(self, store=None, max_bytes=67108864, max_sources=16):
+        if store is None:
+            store = MemoryStore(max_bytes=max_bytes)
+        self.store = store
+        self.max_sources = max_sources
+        self.hits = 0
+        self.misses = 0
+        self._sources = OrderedDict()  # key -> object returned by the callable
+        self._lock = threading.Lock()  # protects hits, misses and sources
+        self._flight = SingleFlight()
+        self._source_flight = SingleFlight()
+
+    def _marshal(self, typ, mime, key, obj):
+        cache_key = (mime, key)
+        value = self.store.get(cache_key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+        return self._flight.call(cache_key, self._create, typ, mime, cache_key, obj)
+
+    def _resolve(self, key, func):
+        with self._lock:
+            if key in self._sources:
+                obj = self._sources.pop(key)
+                self._sources[key] = obj  # move to the end
+                return obj
+
+        obj = self._source_flight.call(key, func)
+        with self._lock:
+            self._sources[key] = obj
+            while len(self._sources) > self.max_sources:
+                self._sources.popitem(last=False)
+        return obj
+
+    def _create(self, typ, mime, cache_key, obj):
+        if callable(obj):
+            obj = self._resolve(cache_key[1], obj)
+        value = getattr(get_handler(mime), 'marshal_%s' % typ)(obj)
+        self.store.set(cache_key, value)
+        return value
+
+    def marshal_list(self, mime, key, obj):
+        """Get the marshalled list, marshal it if it is not cached.
+
+        :param str mime: The MIME type to marshal to, a key of
+            :py:data:`~.handlers.CONTENT_HANDLERS`.
+        :param key: The caller-supplied key. The key must be hashable and, depending on the store,
+            serializable.
+        :param obj: The list to marshal, or a callable returning it.
+        :rtype: bytes in python3, str in python2
+        :raise error.MarshalError: If marshalling goes wrong in any way.
+        """
+        return self._marshal('list', mime, key, obj)
+
+    def marshal_dict(self, mime, key, obj):
+        """Same as :py:meth:`marshal_list`, but for dictionaries."""
+        return self._marshal('dict', mime, key, obj)
+
+    def marshal_str(self, mime, key, obj):
+        """Same as :py:meth:`marshal_list`, but for strings."""
+        return self._marshal('str', mime, key, obj)
+
+    def invalidate(self, key, mimes=None):
+        """Remove the entries for ``key``.
+
+        :param key: The key passed to the marshal_* methods.
+        :param list mimes: Only remove entries for these MIME types, the default removes entries
+            for all keys of :py:data:`~.handlers.CONTENT_HANDLERS`.
+        """
+        if mimes is None:
+            mimes = CONTENT_HANDLERS
+        for mime in mimes:
+            self.store.delete((mime, key))
+        with self._lock:
+            self._sources.pop(key, None)
+
+    def clear(self):
+        """Remove all entries and reset hit/miss statistics."""
+        self.store.clear()
+        with self._lock:
+            self._sources.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Get statistics of this cache.
+
+        :return: The statistics of the store (see :py:meth:`CacheStore.stats`) plus ``hits`` and
+            ``misses`` of this cache.
+        :rtype: dict
+        """
+        stats = self.store.stats()
+        with self._lock:
+            stats['hits'] = self.hits
+            stats['misses'] = self.misses
+        return stats
+
+
+def freeze(obj):
+    """Get an immutable copy of an unmarshalled object.
+
+    Lists become tuples and dictionaries become read-only :py:class:`~types.MappingProxyType`
+    instances, recursively. Strings are returned unchanged.
+    """
+    if isinstance(obj, list):
+        return tuple(freeze(e) for e in obj)
+    elif isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    return obj
+
+
+OBJECT_SIZE = 56
+"""Memory used by every string, list and dictionary of an unmarshalled object in addition to its
+characters, used by :py:class:`UnmarshalCache` to estimate the size of a result. This is about the
+size of a short ``str`` object plus a reference to it."""
+
+
+def _count_objects(obj):
+    """Count the strings, lists and dictionaries of an unmarshalled object.
+
+    Lists returned by content handlers only contain strings, so their elements are not inspected.
+    """
+    if isinstance(obj, list):
+        return 1 + len(obj)
+    elif isinstance(obj, dict):
+        return 1 + len(obj) + sum(_count_objects(v) for v in obj.values())
+    return 1
+
+
+class _ObjectStore(MemoryStore):
+    """Store for ``(size, obj)`` tuples, where size is provided by the caller."""
+
+    def _size(self, value):
+        return value[0]
+
+
+class UnmarshalCache(object):
+    """Cache for unmarshalled lists and dictionaries.
+
+    Entries are identified by the MIME type and a blake2b digest of the body, so identical bodies
+    are only unmarshalled once. Hashing is much cheaper than unmarshalling, especially for XML and
+    YAML::
+
+        >>> cache = UnmarshalCache(max_bytes=1048576, min_bytes=0)
+        >>> cache.unmarshal_list('application/json', b'["user1","user2"]')
+        ('user1', 'user2')
+
+    Since cached results are shared by all callers, they are returned :py:func:`frozen <freeze>`:
+    Lists are returned as tuples and dictionaries as read-only mappings. The memory used by a
+    result is estimated as the size of the body plus :py:data:`OBJECT_SIZE` bytes for every string,
+    list and dictionary, since the unmarshalled objects take several times the size of the body.
+
+    :param int max_bytes: The maximum total (estimated) memory used by all cached results.
+    :param int min_bytes: Bodies smaller than this are unmarshalled without caching, as hashing and
+        the lookup cost about as much as unmarshalling small bodies.
+    """
+
+    def __init__(self, max_bytes=67108864, min_bytes=256):
+        self.store = _ObjectStore(max_bytes=max_bytes)
+        self.min_bytes = min_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # protects hits and misses
+
+    def _unmarshal(self, typ, mime, body):
+        handler = get_handler(mime)
+        if len(body) < self.min_bytes:
+            return freeze(getattr(handler, 'unmarshal_%s' % typ)(body))
+
+        key = (mime, typ, hashlib.blake2b(body, digest_size=16).digest())
+        value = self.store.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value[1]
+
+        with self._lock:
+            self.misses += 1
+        obj = getattr(handler, 'unmarshal_%s' % typ)(body)
+        size = len(body) + _count_objects(obj) * OBJECT_SIZE
+        obj = freeze(obj)
+        self.store.set(key, (size, obj))
+        return obj
+
+    def unmarshal_list(self, mime, body):
+        """Unmarshal a list, or get the result of a previous call with an identical body.
+
+        :param str mime: The MIME type of the body, a key of
+            :py:data:`~.handlers.CONTENT_HANDLERS`.
+        :param bytes body: The body to unmarshal.
+        :rtype: tuple
+        :raise error.UnmarshalError: If the body is invalid. Errors are not cached.
+        """
+        return self._unmarshal('list', mime, body)
+
+    def unmarshal_dict(self, mime, body):
+        """Same as :py:meth:`unmarshal_list`, but for dictionaries.
+
+        :rtype: :py:class:`~types.MappingProxyType`
+        """
+        return self._unmarshal('dict', mime, body)
+
+    def clear(self):
+        """Remove all entries and reset hit/miss statistics."""
+        self.store.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Get statistics of this cache, see :py:meth:`ResponseCache.stats`."""
+        stats = self.store.stats()
+        with self._lock:
+            stats['hits'] = self.hits
+            stats['misses'] = self.misses
+        return stats
@@ -24,6 +24,9 @@ class RestAuthException(Exception):
     """Common base class for all Exceptions in this module."""
     response_code = 500
 
+    resource_type = None
+    """The value of the ``Resource-Type`` header sent with this error, if any."""
+
 
 class RestAuthImplementationException(RestAuthException):
     """Base class for errors that should not occur in a production environment.
@@ -51,6 +54,15 @@ class UnmarshalError(RestAuthImplementationException):
     response_code = 400
 
 
+class RequestEntityTooLarge(UnmarshalError):
+    """Thrown if data exceeds the limits configured for a content handler.
+
+    See :py:attr:`.ContentHandler.MAX_BODY_BYTES` and related attributes for limits that can be
+    configured. On a protocol level, this represents HTTP status code 413.
+    """
+    response_code = 413
+
+
 class RestAuthSetupException(RestAuthException):
     """Base class for errors that should not occur in an correctly configured environment."""
     pass
@@ -115,6 +127,7 @@ class RestAuthError(RestAuthException):
 class ResourceNotFound(RestAuthError):
     """Thrown when a queried resource is not found."""
     response_code = 404
+    response = None
 
     def __init__(self, response=None):  # pragma: no cover
         """
@@ -146,17 +159,17 @@ class ResourceNotFound(RestAuthError):
 
 class UserNotFound(ResourceNotFound):
     """Raised when a user was not found."""
-    pass
+    resource_type = 'user'
 
 
 class PropertyNotFound(ResourceNotFound):
     """Raised when a property was not found."""
-    pass
+    resource_type = 'property'
 
 
 class GroupNotFound(ResourceNotFound):
     """Raised when a group was not found."""
-    pass
+    resource_type = 'group'
 
 
 class ResourceConflict(RestAuthError):
@@ -169,17 +182,17 @@ class ResourceConflict(RestAuthError):
 
 class UserExists(ResourceConflict):
     """Raised when a user already exists."""
-    pass
+    resource_type = 'user'
 
 
 class PropertyExists(ResourceConflict):
     """Raised when a property already exists."""
-    pass
+    resource_type = 'property'
 
 
 class GroupExists(ResourceConflict):
     """Raised when a group already exists."""
-    pass
+    resource_type = 'group'
 
 
 class PreconditionFailed(RestAuthError):
@@ -189,3 +202,104 @@ class PreconditionFailed(RestAuthError):
     level, this represents HTTP status code 412.
     """
     response_code = 412
+
+
+EXCEPTIONS = {
+    (400, None): BadRequest,
+    (401, None): Unauthorized,
+    (403, None): Forbidden,
+    (404, None): ResourceNotFound,
+    (404, 'user'): UserNotFound,
+    (404, 'group'): GroupNotFound,
+    (404, 'property'): PropertyNotFound,
+    (406, None): NotAcceptable,
+    (409, None): ResourceConflict,
+    (409, 'user'): UserExists,
+    (409, 'group'): GroupExists,
+    (409, 'property'): PropertyExists,
+    (412, None): PreconditionFailed,
+    (413, None): RequestEntityTooLarge,
+    (415, None): UnsupportedMediaType,
+    (500, None): InternalServerError,
+}
+"""Mapping of ``(response_code, resource_type)`` tuples to the exception representing them.
+
+The resource type is the value of the ``Resource-Type`` header, or ``None`` for the generic
+exception for a response code. Use :py:func:`get_exception` to look up an exception.
+"""
+
+
+def get_exception(response_code, resource_type=None):
+    """Get the exception class for a response.
+
+    The lookup falls back to the generic exception for the response code if the resource type is
+    unknown, and to :py:exc:`RestAuthException` if the response code is unknown::
+
+        >>> get_exception(404, 'user')
+        <class 'RestAuthCommon.error.UserNotFound'>
+        >>> get_exception(404, 'foobar')
+        <class 'RestAuthCommon.error.ResourceNotFound'>
+
+    :param int response_code: The HTTP status code of the response.
+    :param str resource_type: The value of the ``Resource-Type`` header, if any.
+    :rtype: type
+    """
+    try:
+        return EXCEPTIONS[(response_code, resource_type)]
+    except KeyError:
+        return EXCEPTIONS.get((response_code, None), RestAuthException)
+
+
+def create_error(response_code, resource_type=None, message=None):
+    """Create the exception for a response without raising it.
+
+    The exception class is looked up with :py:func:`get_exception`. The exception is created
+    without calling its constructor. Since it is never raised, Python does not build a traceback
+    for it, so this is the cheapest way to handle expected errors (e.g. a user that does not
+    exist) if you return or store the exception instead of raising it::
+
+        >>> create_error(404, 'user', 'foobar')
+        UserNotFound('foobar')
+
+    :param int response_code: The HTTP status code of the response.
+    :param str resource_type: The value of the ``Resource-Type`` header, if any.
+    :param str message: The message of the exception (usually the body of the response).
+    :rtype: RestAuthException
+    """
+    cls = get_exception(response_code, resource_type)
+    if message is None:
+        exc = cls.__new__(cls)
+    else:
+        exc = cls.__new__(cls, message)
+
+    if cls is RestAuthException:
+        exc.response_code = response_code
+    return exc
+
+
+def raise_error(response_code, resource_type=None, message=None, context=True):
+    """Raise the exception for a response.
+
+    The exception is created with :py:func:`create_error`, so this is cheaper than raising the
+    exception manually::
+
+        >>> raise_error(404, 'user', 'foobar')
+        Traceback (most recent call last):
+            ...
+        RestAuthCommon.error.UserNotFound: foobar
+
+    Python builds a traceback for every raised exception while it propagates, so use
+    :py:func:`create_error` if you don't need to raise the exception.
+
+    :param int response_code: The HTTP status code of the response.
+    :param str resource_type: The value of the ``Resource-Type`` header, if any.
+    :param str message: The message of the exception (usually the body of the response).
+    :param bool context: Set to ``False`` if called while handling another exception (e.g. one
+        raised by your HTTP library) to suppress that exception as context, like ``raise ... from
+        None``.
+    :raise RestAuthException: Always.
+    """
+    exc = create_error(response_code, resource_type, message)
+    if context is False:
+        exc.__suppress_context__ = True  # only the new exception is changed
+    raise exc
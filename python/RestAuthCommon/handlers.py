@@ -21,6 +21,7 @@
 from __future__ import unicode_literals
 
 import sys
+import threading
 
 from RestAuthCommon import error
 
@@ -29,8 +30,164 @@ PY3 = sys.version_info[0] == 3
 
 if PY2:  # pragma: py2
     string_types = basestring
+    text_type = unicode
+    intern_key = lambda key: key  # intern() does not support unicode in python2
+
+    def accumulate(iterable):
+        total = 0
+        for value in iterable:
+            total += value
+            yield total
 else:  # pragma: py3
+    from itertools import accumulate
+
     string_types = (str, bytes, )
+    text_type = str
+    intern_key = sys.intern
+    unichr = chr
+
+_libraries = {}
+_libraries_lock = threading.Lock()
+
+_interned_values = {}
+
+
+def _decode_utf8(raw):
+    return raw.decode('utf-8')
+
+
+def _load_library(path):
+    """Import the library named by ``path`` only once per process.
+
+    Both the imported library and an ``ImportError`` (if the library is not installed) are cached,
+    so repeated calls never try to import the library again.
+    """
+    try:
+        library = _libraries[path]
+    except KeyError:
+        with _libraries_lock:
+            if path not in _libraries:
+                try:
+                    if '.' in path:
+                        mod, lib = path.rsplit('.', 1)
+                        _temp = __import__(mod, fromlist=[str(lib)])
+                        _libraries[path] = getattr(_temp, lib)
+                    else:
+                        _libraries[path] = __import__(path)
+                except ImportError as e:
+                    _libraries[path] = e
+            library = _libraries[path]
+
+    if isinstance(library, ImportError):
+        raise ImportError('Could not import %s: %s' % (path, library))
+    return library
+
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def _get_default_executor():
+    """Get the thread pool used by :py:meth:`.ContentHandler.submit` if a handler does not
+    configure its own executor."""
+    global _default_executor
+    if _default_executor is None:
+        with _default_executor_lock:
+            if _default_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _default_executor = ThreadPoolExecutor(max_workers=4)
+    return _default_executor
+
+
+_offload_handlers = {}
+
+
+def _offload_call(cls, settings, method, *args):
+    """Call ``method`` of a handler of class ``cls`` in a worker process.
+
+    Handler instances can't be pickled (their library is a module), so only the class and the
+    settings of the handler (see :py:meth:`.ContentHandler.get_settings`) are passed to the worker
+    process, which keeps one instance per class and settings.
+    """
+    try:
+        key = (cls, frozenset(settings.items()))
+        handler = _offload_handlers[key]
+    except TypeError:  # unhashable settings (e.g. PARSER_OPTIONS), use a new instance
+        handler = cls(**settings)
+    except KeyError:
+        handler = _offload_handlers.setdefault(key, cls(**settings))
+    return getattr(handler, method)(*args)
+
+
+def _marshal_list_shard(cls, settings, shard, offset):
+    """Marshal a shard of a list starting at ``offset`` in a worker process."""
+    return _offload_call(cls, settings, 'marshal_list_items', shard, offset == 0)
+
+
+class Limits(object):
+    """Keeps track of the limits configured for a content handler while parsing a single body.
+
+    Content handlers call the methods of this class while scanning the structure of a body, the
+    methods raise :py:exc:`~.error.RequestEntityTooLarge` as soon as a limit is exceeded.
+
+    :param handler: The handler whose ``MAX_*`` attributes are used.
+    :type  handler: :py:class:`.ContentHandler`
+    """
+
+    def __init__(self, handler):
+        self.max_depth = handler.MAX_DEPTH
+        self.max_items = handler.MAX_ITEMS
+        self.max_string_length = handler.MAX_STRING_LENGTH
+        self.deadline = None
+        if handler.MAX_SCAN_TIME is not None:
+            from timeit import default_timer  # imported here to keep importing this module fast
+            self.timer = default_timer
+            self.deadline = default_timer() + handler.MAX_SCAN_TIME
+
+        self.depth = 0
+        self.items = 0
+
+    def enter(self):
+        """Called when a list or dictionary starts."""
+        self.depth += 1
+        if self.max_depth is not None and self.depth > self.max_depth:
+            raise error.RequestEntityTooLarge('Nesting exceeds %s levels.' % self.max_depth)
+
+    def leave(self):
+        """Called when a list or dictionary ends."""
+        self.depth -= 1
+
+    def item(self):
+        """Called for every list item and dictionary key."""
+        self.items += 1
+        if self.max_items is not None and self.items > self.max_items:
+            raise error.RequestEntityTooLarge('Body has more than %s items.' % self.max_items)
+        if self.deadline is not None and self.items % 100 == 0:
+            self.check_time()
+
+    def string(self, length):
+        """Called for every string with its length."""
+        if self.max_string_length is not None and length > self.max_string_length:
+            raise error.RequestEntityTooLarge(
+                'String is longer than %s characters.' % self.max_string_length)
+
+    def reference(self, items, depth):
+        """Called for a reference to an earlier part of the body (e.g. a YAML alias).
+
+        :param int items: The number of items in the part that is referred to.
+        :param int depth: The nesting depth of the part that is referred to.
+        """
+        if self.max_depth is not None and self.depth + depth > self.max_depth:
+            raise error.RequestEntityTooLarge('Nesting exceeds %s levels.' % self.max_depth)
+        self.items += items
+        if self.max_items is not None and self.items > self.max_items:
+            raise error.RequestEntityTooLarge('Body has more than %s items.' % self.max_items)
+        self.check_time()
+
+    def check_time(self):
+        """Check if the time budget is exceeded."""
+        if self.deadline is not None and self.timer() > self.deadline:
+            raise error.RequestEntityTooLarge('Body took too long to scan.')
 
 
 class ContentHandler(object):
@@ -74,20 +231,131 @@ class ContentHandler(object):
     """Set to False if your content handler does not support nested dictionaries as used e.g.
     during user-creation."""
 
+    OFFLOAD_BYTES = 262144
+    """:py:meth:`submit` and :py:meth:`offload` unmarshal bodies of at least this many bytes in
+    :py:attr:`executor`, smaller bodies are unmarshalled inline. Set to ``None`` to never offload
+    unmarshalling."""
+
+    OFFLOAD_ITEMS = 10000
+    """:py:meth:`submit` and :py:meth:`offload` marshal lists and dictionaries with at least this
+    many items in :py:attr:`executor`, smaller objects are marshalled inline. Set to ``None`` to
+    never offload marshalling."""
+
+    MAX_BODY_BYTES = None
+    """Maximum size of bodies passed to unmarshal_* methods in bytes.
+
+    Larger bodies raise :py:exc:`~.error.RequestEntityTooLarge` before parsing starts. ``None``
+    (the default) means no limit. This and the other ``MAX_*`` limits can be set per handler::
+
+        >>> handler = JSONContentHandler(MAX_BODY_BYTES=1048576, MAX_DEPTH=3)
+    """
+
+    MAX_DEPTH = None
+    """Maximum nesting depth of lists and dictionaries when unmarshalling. A list of strings has a
+    depth of one. ``None`` means no limit."""
+
+    MAX_ITEMS = None
+    """Maximum total number of list items and dictionary keys when unmarshalling. ``None`` means no
+    limit."""
+
+    MAX_STRING_LENGTH = None
+    """Maximum length of any string (including dictionary keys) when unmarshalling. The length is
+    measured on the encoded data, so it may be slightly larger than the decoded string. ``None``
+    means no limit."""
+
+    MAX_SCAN_TIME = None
+    """Time in seconds a handler may spend scanning a body for the other limits. ``None`` means no
+    limit.
+
+    This only bounds the scan that precedes unmarshalling, not unmarshalling itself, which is done
+    by libraries that can't be interrupted. Since scanning is usually faster than unmarshalling, a
+    body that takes too long to scan is rejected before the (more expensive) unmarshalling starts.
+    The incremental parsers used by :py:mod:`.aio` check this limit while parsing."""
+
+    SUPPORT_PARTIAL_LISTS = False
+    """Set to True if your content handler implements :py:meth:`marshal_list_start`,
+    :py:meth:`marshal_list_items` and :py:meth:`marshal_list_end`, which allow marshalling a list
+    in parts (see :py:meth:`marshal_list_parallel`)."""
+
+    SUPPORT_REFERENCES = False
+    """Set to True if bodies can refer to earlier parts of the body (e.g. YAML aliases). The size
+    of such a body does not bound the number of items, nesting levels or characters in it, so
+    :py:meth:`check_limits` always scans it if any limit is set. :py:meth:`scan` must report
+    references with :py:meth:`.Limits.reference`."""
+
+    PARALLEL_MIN_ITEMS = 100000
+    """:py:meth:`marshal_list_parallel` marshals lists with fewer items using
+    :py:meth:`marshal_list`."""
+
+    INTERN = False
+    """Set to True to deduplicate strings returned by unmarshal_list and unmarshal_dict.
+
+    Dictionary keys are interned with :py:func:`sys.intern`. Other strings (e.g. usernames in
+    lists) are looked up in a table shared by all handlers, so that a process holding many lists
+    keeps only one copy of every name. This costs some time while unmarshalling::
+
+        >>> handler = JSONContentHandler(INTERN=True)
+    """
+
+    INTERN_VALUES = 1048576
+    """Strings are only added to the table used by :py:attr:`INTERN` while it holds fewer strings,
+    strings that are already in the table are still deduplicated."""
+
+    executor = None
+    """The :py:class:`concurrent.futures.Executor` used by :py:meth:`submit` and
+    :py:meth:`offload`. If ``None``, a thread pool shared by all handlers is used.
+
+    If you use a :py:class:`~concurrent.futures.ProcessPoolExecutor`, the worker processes use
+    their own instance of the handler class, created with the settings returned by
+    :py:meth:`get_settings`.
+    """
+
     _library = None
 
     @property
     def library(self):
-        """Library configured with the ``librarypath`` class variable."""
+        """Library configured with the ``librarypath`` class variable.
+
+        The library is imported only once per process and shared by all handlers using the same
+        ``librarypath``. If the library is not installed, every access raises an ``ImportError``
+        without trying to import the library again.
+        """
         if self._library is None:
-            if '.' in self.librarypath:
-                mod, lib = self.librarypath.rsplit('.', 1)
-                _temp = __import__(mod, fromlist=[str(lib)])
-                self._library = getattr(_temp, lib)
-            else:
-                self._library = __import__(self.librarypath)
+            self._library = _load_library(self.librarypath)
         return self._library
 
+    def get_settings(self):
+        """Get the settings of this instance, i.e. all upper case instance attributes.
+
+        These are the settings passed to the constructor (or set later) that override class
+        attributes like :py:attr:`MAX_ITEMS` or :py:attr:`INTERN`. Worker processes of a
+        :py:class:`~concurrent.futures.ProcessPoolExecutor` create their handler with these
+        settings, so they must be picklable.
+
+        >>> JSONContentHandler(MAX_ITEMS=10, executor=None).get_settings()
+        {'MAX_ITEMS': 10}
+
+        :rtype: dict
+        """
+        return {k: v for k, v in vars(self).items() if k.isupper()}
+
+    @classmethod
+    def is_available(cls):
+        """Check if the library used by this handler is installed.
+
+        :return: ``True`` if the library can be imported (or the handler does not use a library),
+            ``False`` otherwise.
+        :rtype: bool
+        """
+        if cls.librarypath is None:
+            return True
+
+        try:
+            _load_library(cls.librarypath)
+            return True
+        except ImportError:
+            return False
+
     def __init__(self, **kwargs):
         for k, w in kwargs.items():
             setattr(self, k, w)
@@ -134,6 +402,54 @@ class ContentHandler(object):
         """Converts str objects to unicode."""
         return s.decode('utf-8') if isinstance(s, str) else s
 
+    def _intern_str(self, value):
+        try:
+            return _interned_values[value]
+        except KeyError:
+            if len(_interned_values) >= self.INTERN_VALUES:
+                return value
+            return _interned_values.setdefault(value, value)
+
+    def _intern_value(self, value):
+        if isinstance(value, text_type):
+            return self._intern_str(value)
+        elif isinstance(value, list):
+            return self.intern_list(value)
+        elif isinstance(value, dict):
+            return self.intern_dict(value)
+        return value
+
+    def intern_list(self, l):
+        """Deduplicate strings in an unmarshalled list, see :py:attr:`INTERN`.
+
+        :param list l: The list, it is not modified.
+        :rtype: list
+        """
+        values = _interned_values
+        intern_value = self._intern_value
+
+        result = []
+        append = result.append
+        for e in l:
+            if e.__class__ is text_type and e in values:  # fast path for names already interned
+                append(values[e])
+            else:
+                append(intern_value(e))
+        return result
+
+    def intern_dict(self, d):
+        """Deduplicate keys and strings in an unmarshalled dictionary, see :py:attr:`INTERN`.
+
+        :param dict d: The dictionary, it is not modified.
+        :rtype: dict
+        """
+        return self._intern_pairs(d.items())
+
+    def _intern_pairs(self, pairs):
+        intern_value = self._intern_value
+        return {intern_key(k) if isinstance(k, text_type) else k: intern_value(v)
+                for k, v in pairs}
+
     def marshal(self, obj):
         """Shortcut for marshalling just any object.
 
@@ -158,6 +474,173 @@ class ContentHandler(object):
         except Exception as e:
             raise error.MarshalError(e)
 
+    def check_limits(self, body):
+        """Check that ``body`` does not exceed the limits configured for this handler.
+
+        This is called by every unmarshal_* method before unmarshalling a body. The body size is
+        checked first, the other limits are checked while scanning the structure of the body with
+        :py:meth:`scan`. Every item, nesting level and character of a string takes at least one
+        byte of the body, so the scan is skipped if the body is not larger than any configured
+        limit (unless :py:attr:`MAX_SCAN_TIME` or :py:attr:`SUPPORT_REFERENCES` is set).
+
+        :param body: The body to check.
+        :raise error.RequestEntityTooLarge: If any limit is exceeded.
+        :raise error.UnmarshalError: If the body is invalid and could not be scanned.
+        """
+        if self.MAX_BODY_BYTES is not None and len(body) > self.MAX_BODY_BYTES:
+            raise error.RequestEntityTooLarge(
+                'Body is larger than %s bytes.' % self.MAX_BODY_BYTES)
+
+        limits = [limit for limit in (self.MAX_DEPTH, self.MAX_ITEMS, self.MAX_STRING_LENGTH)
+                  if limit is not None]
+        if self.MAX_SCAN_TIME is None:
+            if not limits:
+                return
+            if not self.SUPPORT_REFERENCES and len(body) <= min(limits):
+                return
+
+        limits = Limits(self)
+        self.scan(body, limits)
+        limits.check_time()
+
+    def scan(self, body, limits):
+        """Scan the structure of ``body`` and report it to ``limits``.
+
+        Implement this method in your handler to support limits other than
+        :py:attr:`MAX_BODY_BYTES`. Implementations must not build the unmarshalled object, so that
+        a limit is hit before allocating the memory for it. The default implementation does
+        nothing.
+
+        :param body: The body to scan.
+        :param limits: The limits to call.
+        :type  limits: :py:class:`.Limits`
+        """
+        pass
+
+    def should_offload(self, method, obj):
+        """Decide if calling ``method`` for ``obj`` should be offloaded to :py:attr:`executor`.
+
+        :param str method: The name of a marshal_* or unmarshal_* method.
+        :param obj: The object passed to ``method``.
+        :rtype: bool
+        """
+        if method.startswith('unmarshal'):
+            threshold = self.OFFLOAD_BYTES
+        else:
+            threshold = self.OFFLOAD_ITEMS
+        return threshold is not None and len(obj) >= threshold
+
+    def submit(self, method, obj):
+        """Call ``method`` for ``obj``, offloading large objects to :py:attr:`executor`.
+
+        Small objects (see :py:attr:`OFFLOAD_BYTES` and :py:attr:`OFFLOAD_ITEMS`) are
+        (un)marshalled immediately in the current thread, so their latency does not change.
+
+        >>> future = handler.submit('unmarshal_list', body)
+        >>> future.result()
+        ['foo', 'bar']
+
+        :param str method: The name of a marshal_* or unmarshal_* method, e.g. ``"marshal_list"``.
+        :param obj: The object passed to ``method``.
+        :rtype: :py:class:`concurrent.futures.Future`
+        """
+        from concurrent.futures import Future
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not self.should_offload(method, obj):
+            future = Future()
+            try:
+                future.set_result(getattr(self, method)(obj))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        executor = self.executor or _get_default_executor()
+        if isinstance(executor, ProcessPoolExecutor):
+            return executor.submit(_offload_call, type(self), self.get_settings(), method, obj)
+        return executor.submit(getattr(self, method), obj)
+
+    def offload(self, method, obj):
+        """Like :py:meth:`submit`, but return an :py:mod:`asyncio` future.
+
+        >>> body = await handler.offload('marshal_list', members)
+
+        .. NOTE:: This method requires Python 3.4 or later.
+
+        :rtype: :py:class:`asyncio.Future`
+        """
+        import asyncio
+        return asyncio.wrap_future(self.submit(method, obj))
+
+    def marshal_list_parallel(self, obj, executor=None, shard_size=None):
+        """Marshal a (huge) list using multiple processes.
+
+        The list is split into shards that are marshalled in a
+        :py:class:`~concurrent.futures.ProcessPoolExecutor`, the result is identical to what
+        :py:meth:`marshal_list` returns. Lists shorter than :py:attr:`PARALLEL_MIN_ITEMS` and lists
+        passed to handlers that do not support partial lists (see
+        :py:attr:`SUPPORT_PARTIAL_LISTS`) are marshalled with :py:meth:`marshal_list` instead.
+
+        :param list obj: The list to marshal.
+        :param executor: The executor to use. If ``None``, a new process pool with one process
+            per CPU is created (and shut down again) for this call.
+        :type  executor: :py:class:`concurrent.futures.ProcessPoolExecutor`
+        :param int shard_size: Number of list items marshalled by a single task. The default
+            splits the list in four shards per CPU.
+        :rtype: bytes in python3, str in python2
+        :raise error.MarshalError: If marshalling goes wrong in any way.
+        """
+        if not self.SUPPORT_PARTIAL_LISTS or len(obj) < self.PARALLEL_MIN_ITEMS:
+            return self.marshal_list(obj)
+
+        from functools import partial
+        from RestAuthCommon._parallel import map_shards
+
+        try:
+            func = partial(_marshal_list_shard, type(self), self.get_settings())
+            parts = [self.marshal_list_start(len(obj))]
+            parts += map_shards(func, obj, executor, shard_size)
+            parts.append(self.marshal_list_end(len(obj)))
+            return b''.join(parts)
+        except error.MarshalError:
+            raise
+        except Exception as e:
+            raise error.MarshalError(e)
+
+    def marshal_list_start(self, length):  # pragma: no cover
+        """Marshal the start of a list with ``length`` items.
+
+        Only required if :py:attr:`SUPPORT_PARTIAL_LISTS` is ``True``.
+
+        :param int length: The number of items of the list.
+        :rtype: bytes in python3, str in python2
+        """
+        raise NotImplementedError
+
+    def marshal_list_items(self, obj, first):  # pragma: no cover
+        """Marshal a slice of a list.
+
+        Concatenating the result of :py:meth:`marshal_list_start`, of this method for consecutive
+        slices of a list and of :py:meth:`marshal_list_end` must be identical to what
+        :py:meth:`marshal_list` returns for the whole list. Only required if
+        :py:attr:`SUPPORT_PARTIAL_LISTS` is ``True``.
+
+        :param list obj: The slice to marshal, never empty.
+        :param bool first: ``True`` if the slice is at the start of the list.
+        :rtype: bytes in python3, str in python2
+        """
+        raise NotImplementedError
+
+    def marshal_list_end(self, length):  # pragma: no cover
+        """Marshal the end of a list with ``length`` items.
+
+        Only required if :py:attr:`SUPPORT_PARTIAL_LISTS` is ``True``.
+
+        :param int length: The number of items of the list.
+        :rtype: bytes in python3, str in python2
+        """
+        raise NotImplementedError
+
     def unmarshal_str(self, data):  # pragma: no cover
         """Unmarshal a string.
 
@@ -185,6 +668,89 @@ class ContentHandler(object):
         """
         pass
 
+    def unmarshal_list_lazy(self, body):
+        """Unmarshal a list of strings, but only decode elements when they are accessed.
+
+        Handlers that support this return a :py:class:`~.views.LazyList`, which only holds the body
+        and the offsets of all elements. This uses much less memory than :py:meth:`unmarshal_list`
+        if a huge list is only iterated once or only a few elements are accessed::
+
+            >>> members = handler.unmarshal_list_lazy(body)
+            >>> len(members), members[0]
+            (1000000, 'user0')
+
+        The default implementation returns the result of :py:meth:`unmarshal_list`. Handlers also
+        fall back to it for bodies that their index can not handle (e.g. lists that do not only
+        contain strings).
+
+        :param body: Data to unmarshal.
+        :type  body: bytes in python3, str in python2
+        :rtype: :py:class:`~.views.LazyList` or list
+        """
+        return self.unmarshal_list(body)
+
+    def unmarshal_list_index(self, body):
+        """Unmarshal a list of names into a :py:class:`~.views.MembershipIndex`.
+
+        The index is built from :py:meth:`unmarshal_list_lazy`, so for handlers that support lazy
+        lists, the unmarshalled list is never held in memory as a whole::
+
+            >>> members = handler.unmarshal_list_index(body)
+            >>> 'User1' in members  # names are prepared with strprep.stringprep()
+            True
+
+        :param body: Data to unmarshal.
+        :type  body: bytes in python3, str in python2
+        :rtype: :py:class:`~.views.MembershipIndex`
+        """
+        from RestAuthCommon.views import MembershipIndex
+        return MembershipIndex(self.unmarshal_list_lazy(body))
+
+    def unmarshal_dict_lazy(self, body, keys=None):
+        """Unmarshal a dictionary, but only decode values when they are accessed.
+
+        Handlers that support this return a :py:class:`~.views.LazyDict`, which indexes all keys
+        up front. If ``keys`` is given, other keys are skipped entirely::
+
+            >>> properties = handler.unmarshal_dict_lazy(body, keys=['email'])
+            >>> dict(properties)
+            {'email': 'user@example.com'}
+
+        The default implementation returns the result of :py:meth:`unmarshal_dict`, handlers also
+        fall back to it for bodies that their index can not handle.
+
+        :param body: Data to unmarshal.
+        :type  body: bytes in python3, str in python2
+        :param keys: Only include these keys (if present) in the result.
+        :rtype: :py:class:`~.views.LazyDict` or dict
+        """
+        unmarshalled = self.unmarshal_dict(body)
+        if keys is not None:
+            return {k: unmarshalled[k] for k in keys if k in unmarshalled}
+        return unmarshalled
+
+    def _lazy_dict(self, data, items, decode, keys):
+        """Create a :py:class:`~.views.LazyDict` from ``(key, start, end)`` tuples."""
+        from RestAuthCommon.views import LazyDict
+        from RestAuthCommon.views import offsets
+
+        if keys is not None:
+            keys = set(keys)
+
+        positions = {}
+        index = offsets(len(data))
+        for key, start, end in items:
+            if keys is not None and key not in keys:
+                continue
+            if key in positions:  # the last value wins, like in a normal dictionary
+                index[positions[key] * 2] = start
+                index[positions[key] * 2 + 1] = end
+            else:
+                positions[key] = len(index) // 2
+                index.append(start)
+                index.append(end)
+        return LazyDict(data, positions, index, decode)
+
     def marshal_str(self, obj):  # pragma: no cover
         """Marshal a string.
 
@@ -234,6 +800,7 @@ class JSONContentHandler(ContentHandler):
     """The mime-type used by this content handler is 'application/json'."""
 
     SEPARATORS = (str(','), str(':'))
+    SUPPORT_PARTIAL_LISTS = True
 
     def __init__(self, **kwargs):
         super(JSONContentHandler, self).__init__(**kwargs)
@@ -268,7 +835,38 @@ class JSONContentHandler(ContentHandler):
         else:  # pragma: py2
             self.encoder = self.library.JSONEncoder
 
+    _scan_pattern = None
+
+    def scan(self, body, limits):
+        if self._scan_pattern is None:
+            import re
+            JSONContentHandler._scan_pattern = re.compile(
+                r'"(?:[^"\\]|\\.)*"|[\[\]{},:]|[^\s\[\]{},:"]+')
+
+        start = False  # True if the next token starts a list item or dictionary key
+        for match in self._scan_pattern.finditer(self.normalize_str(body)):
+            token = match.group(0)
+            if token in ('[', '{'):
+                if start and limits.depth:
+                    limits.item()
+                limits.enter()
+                start = True
+            elif token in (']', '}'):
+                limits.leave()
+                start = False
+            elif token == ',':
+                start = True
+            elif token == ':':
+                start = False
+            else:
+                if token[0] == '"':
+                    limits.string(len(token) - 2)
+                if start and limits.depth:
+                    limits.item()
+                start = False
+
     def unmarshal_str(self, body):
+        self.check_limits(body)
         try:
             pure = self.library.loads(self.normalize_str(body))
             if not isinstance(pure, list) or len(pure) != 1:
@@ -282,16 +880,192 @@ class JSONContentHandler(ContentHandler):
             raise error.UnmarshalError(e)
 
     def unmarshal_dict(self, body):
+        self.check_limits(body)
         try:
+            if self.INTERN:  # nested dictionaries are interned by the hook as well
+                return self.library.loads(self.normalize_str(body),
+                                          object_pairs_hook=self._intern_pairs)
             return self.library.loads(self.normalize_str(body))
         except ValueError as e:
             raise error.UnmarshalError(e)
 
     def unmarshal_list(self, body):
+        self.check_limits(body)
         try:
-            return self.library.loads(self.normalize_str(body))
+            unmarshalled = self.library.loads(self.normalize_str(body))
         except ValueError as e:
             raise error.UnmarshalError(e)
+        if self.INTERN:
+            return self.intern_list(unmarshalled)
+        return unmarshalled
+
+    _lazy_list_patterns = None
+
+    def _decode_lazy(self, raw):
+        if b'\\' in raw:
+            return self.library.loads('"%s"' % raw.decode('utf-8'))
+        return raw.decode('utf-8')
+
+    LAZY_CHUNK_SIZE = 65536
+    """:py:meth:`unmarshal_list_lazy` processes bodies in chunks of about this many bytes, which
+    bounds the memory used for temporary objects while building the index."""
+
+    def _index_simple(self, body, index):
+        """Index a list whose strings contain no escape sequences.
+
+        Without backslashes, every quote starts or ends a string, so chunks of the body are split
+        at quotes. Chunks end after a quote that is followed by a comma, so they always start
+        outside of a string.
+        """
+        from itertools import chain
+
+        pos = 0
+        while pos < len(body):
+            end = body.find(b'",', pos + self.LAZY_CHUNK_SIZE)
+            end = len(body) if end < 0 else end + 1
+            parts = body[pos:end].split(b'"')
+            if len(parts) % 2 == 0:  # unterminated string
+                return False
+
+            # Between strings, there must be "[" at the start, "]" at the end and "," otherwise.
+            if len(parts) == 1:
+                return pos == 0 and b''.join(parts[0].split()) == b'[]'
+            elif parts[0].strip() != (b',' if pos else b'[') or \
+                    parts[-1].strip() != (b']' if end == len(body) else b''):
+                return False
+            if any(sep.strip() != b',' for sep in set(parts[2:-1:2])):
+                return False
+
+            # Accumulated sizes are the start and end offsets of the strings (without quotes).
+            sizes = [len(part) for part in parts]
+            sizes[2::2] = [size + 2 for size in sizes[2::2]]
+            index.extend(accumulate(chain((pos + sizes[0] + 1, ), sizes[1:-1])))
+            pos = end
+        return pos > 0  # the body is not empty
+
+    def _index_escaped(self, body, index):
+        """Index a list with regular expressions, which is slower but handles escape sequences."""
+        if self._lazy_list_patterns is None:
+            import re
+            JSONContentHandler._lazy_list_patterns = (
+                re.compile(br'\s*\[\s*'),
+                re.compile(br'"([^"\\]*(?:\\.[^"\\]*)*)"\s*(?:,\s*|(\]))'),
+            )
+        start, element = self._lazy_list_patterns
+
+        match = start.match(body)
+        if match is None:
+            return False
+
+        pos = match.end()
+        closed = body[pos:pos + 1] == b']'
+        if closed:
+            pos += 1
+        else:
+            for match in element.finditer(body, pos):
+                if match.start() != pos:
+                    break
+                index.extend(match.span(1))
+                pos = match.end()
+                if match.group(2):
+                    closed = True
+                    break
+        return closed and not body[pos:].strip()
+
+    def unmarshal_list_lazy(self, body):
+        from RestAuthCommon.views import LazyList
+        from RestAuthCommon.views import offsets
+
+        self.check_limits(body)
+        if not isinstance(body, bytes):  # pragma: no cover
+            body = body.encode('utf-8')
+
+        index = offsets(len(body))
+        if b'\\' in body:
+            indexed = self._index_escaped(body, index)
+        else:
+            indexed = self._index_simple(body, index)
+
+        if not indexed:
+            return self.unmarshal_list(body)  # raises UnmarshalError or handles non-strings
+        return LazyList(body, index, self._decode_lazy)
+
+    _lazy_dict_patterns = None
+
+    def _index_dict(self, body):
+        """Get ``(key, start, end)`` tuples for a dictionary, or ``None`` if the body is invalid.
+
+        Every key/value pair is matched with a single regular expression, nested dictionaries and
+        lists are skipped by only looking at brackets outside of strings.
+        """
+        if self._lazy_dict_patterns is None:
+            import re
+            string = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+            nested = r'[^"\[\]{}]*(?:%s[^"\[\]{}]*)*' % string
+            try:  # possessive quantifiers (python 3.11+) don't keep backtracking information
+                nested = re.compile(nested + '+')
+            except re.error:  # pragma: no cover
+                nested = re.compile(nested)
+
+            JSONContentHandler._lazy_dict_patterns = (
+                re.compile(r'\s*\{\s*'),
+                re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"\s*:\s*(?:(%s|[^\s\[\]{},:"]+)|([\[{]))'
+                           % string),
+                re.compile(r'\s*([,}])\s*'),
+                nested,
+            )
+        start, item, separator, nested = self._lazy_dict_patterns
+
+        match = start.match(body)
+        if match is None:
+            return None
+        pos = match.end()
+        if body[pos:pos + 1] == '}':
+            return [] if not body[pos + 1:].strip() else None
+
+        items = []
+        while True:
+            match = item.match(body, pos)
+            if match is None:
+                return None
+            key = match.group(1)
+            if '\\' in key:
+                key = self.library.loads('"%s"' % key)
+
+            pos = match.end()
+            if match.group(3):  # skip a nested dictionary or list
+                depth = 1
+                while depth:
+                    pos = nested.match(body, pos).end()
+                    if pos == len(body) or body[pos] == '"':  # unterminated
+                        return None
+                    depth += 1 if body[pos] in '[{' else -1
+                    pos += 1
+                items.append((key, match.start(3), pos))
+            else:
+                items.append((key, match.start(2), pos))
+
+            match = separator.match(body, pos)
+            if match is None:
+                return None
+            pos = match.end()
+            if match.group(1) == '}':
+                break
+
+        if body[pos:].strip():
+            return None
+        return items
+
+    def unmarshal_dict_lazy(self, body, keys=None):
+        self.check_limits(body)
+        body = self.normalize_str(body)  # offsets refer to the decoded body
+        items = self._index_dict(body)
+        if items is None:
+            return super(JSONContentHandler, self).unmarshal_dict_lazy(body, keys=keys)
+        return self._lazy_dict(body, items, self._decode_value, keys)
+
+    def _decode_value(self, raw):
+        return self.library.loads(raw)
 
     def marshal_str(self, obj):
         try:
@@ -314,6 +1088,21 @@ class JSONContentHandler(ContentHandler):
         except Exception as e:
             raise error.MarshalError(e)
 
+    def marshal_list_start(self, length):
+        return b'['
+
+    def marshal_list_items(self, obj, first):
+        try:
+            # Encode the slice as a whole and strip the brackets, so it takes a single call.
+            dumped = self.library.dumps(obj, separators=self.SEPARATORS, cls=self.encoder)
+            dumped = dumped[1:-1].encode('utf-8')
+            return dumped if first else b',' + dumped
+        except Exception as e:
+            raise error.MarshalError(e)
+
+    def marshal_list_end(self, length):
+        return b']'
+
 
 class BSONContentHandler(ContentHandler):
     """Handler for BSON ("Binary JSON") encoded content.
@@ -359,32 +1148,137 @@ class BSONContentHandler(ContentHandler):
         except Exception as e:
             raise error.MarshalError(e)
 
+    # sizes of fixed-size BSON types
+    _bson_sizes = {0x01: 8, 0x07: 12, 0x08: 1, 0x09: 8, 0x0A: 0, 0x10: 4, 0x11: 8, 0x12: 8,
+                   0x13: 16, 0xFF: 0, 0x7F: 0}
+
+    def scan(self, body, limits):
+        import struct
+
+        if PY2:  # pragma: py2
+            body = bytearray(body)
+
+        try:
+            # stack of open documents: (end position, True if the document is an array)
+            stack = [(struct.unpack_from('<i', body, 0)[0], False)]
+            pos = 4
+            while stack:
+                etype = body[pos]
+                if etype == 0:
+                    pos += 1
+                    if pos != stack.pop()[0]:
+                        raise error.UnmarshalError('Invalid document size.')
+                    if stack:  # the toplevel document only wraps the unmarshalled object
+                        limits.leave()
+                    continue
+
+                name_end = body.index(b'\x00', pos + 1)
+                if len(stack) > 1:
+                    limits.item()
+                    if not stack[-1][1]:
+                        limits.string(name_end - pos - 1)
+                pos = name_end + 1
+
+                if etype == 0x02:  # string
+                    length = struct.unpack_from('<i', body, pos)[0]
+                    limits.string(length - 1)
+                    pos += 4 + length
+                elif etype in (0x03, 0x04):  # document or array
+                    limits.enter()
+                    stack.append((pos + struct.unpack_from('<i', body, pos)[0], etype == 0x04))
+                    pos += 4
+                elif etype == 0x05:  # binary
+                    pos += 5 + struct.unpack_from('<i', body, pos)[0]
+                elif etype in self._bson_sizes:
+                    pos += self._bson_sizes[etype]
+                else:
+                    raise error.UnmarshalError('Unsupported BSON type: %s' % etype)
+        except (IndexError, ValueError, struct.error) as e:
+            raise error.UnmarshalError(e)
+
     def _unmarshal_dict2(self, body):  # pragma: py2
         # NOTE: We convert unicode because some old versions of RestAuthClient
         #       pass unicode and bson can't handle it.
         if isinstance(body, unicode):  # pragma: no cover
             body = body.encode('utf-8')
+        self.check_limits(body)
+        if self.INTERN:
+            return self.intern_dict(self.loads(body)['d'])
         return self.loads(body)['d']
 
     def _unmarshal_list2(self, body):  # pragma: py2
         if isinstance(body, unicode):  # pragma: no cover
             body = body.encode('utf-8')
+        self.check_limits(body)
+        if self.INTERN:
+            return self.intern_list(self.loads(body)['l'])
         return self.loads(body)['l']
 
     def _unmarshal_str2(self, body):  # pragma: py2
         if isinstance(body, unicode):  # pragma: no cover
             body = body.encode('utf-8')
+        self.check_limits(body)
         return self.loads(body)['s']
 
     def _unmarshal_dict3(self, body):  # pragma: py3
+        self.check_limits(body)
+        if self.INTERN:
+            return self.intern_dict(self.loads(body)['d'])
         return self.loads(body)['d']
 
     def _unmarshal_list3(self, body):  # pragma: py3
+        self.check_limits(body)
+        if self.INTERN:
+            return self.intern_list(self.loads(body)['l'])
         return self.loads(body)['l']
 
     def _unmarshal_str3(self, body):  # pragma: py3
+        self.check_limits(body)
         return self.loads(body)['s']
 
+    def _decode_value(self, raw):
+        """Decode a single element by wrapping it in a document."""
+        import struct
+
+        document = self.loads(struct.pack('<i', len(raw) + 5) + bytes(raw) + b'\x00')
+        return next(iter(document.values()))
+
+    def unmarshal_dict_lazy(self, body, keys=None):
+        import struct
+
+        self.check_limits(body)
+        data = bytearray(body) if PY2 else body  # pragma: no branch
+        if data[4:7] != b'\x03d\x00':  # the document does not contain a dictionary
+            return super(BSONContentHandler, self).unmarshal_dict_lazy(body, keys=keys)
+
+        items = []
+        try:
+            end = 7 + struct.unpack_from('<i', body, 7)[0]
+            pos = 11
+            while data[pos] != 0:
+                etype = data[pos]
+                name_end = data.index(b'\x00', pos + 1)
+                key = body[pos + 1:name_end].decode('utf-8')
+                start = pos
+                pos = name_end + 1
+
+                if etype in (0x02, 0x05):  # string or binary
+                    pos += 4 + struct.unpack_from('<i', body, pos)[0] + (etype == 0x05)
+                elif etype in (0x03, 0x04):  # document or array
+                    pos += struct.unpack_from('<i', body, pos)[0]
+                elif etype in self._bson_sizes:
+                    pos += self._bson_sizes[etype]
+                else:
+                    raise error.UnmarshalError('Unsupported BSON type: %s' % etype)
+                items.append((key, start, pos))
+        except (IndexError, ValueError, struct.error) as e:
+            raise error.UnmarshalError(e)
+
+        if pos + 1 != end or struct.unpack_from('<i', body, 0)[0] != len(body) or \
+                end + 1 != len(body):
+            raise error.UnmarshalError('Invalid document size.')
+        return self._lazy_dict(body, items, self._decode_value, keys)
+
     if PY3:  # pragma: py3
         unmarshal_dict = _unmarshal_dict3
         unmarshal_list = _unmarshal_list3
@@ -410,6 +1304,7 @@ class MessagePackContentHandler(ContentHandler):
     """The mime-type used by this content handler is 'application/messagepack'."""
 
     librarypath = 'msgpack'
+    SUPPORT_PARTIAL_LISTS = True
 
     def marshal_dict(self, obj):
         try:
@@ -429,15 +1324,243 @@ class MessagePackContentHandler(ContentHandler):
         except Exception as e:
             raise error.MarshalError(e)
 
+    def marshal_list_start(self, length):
+        return self.library.Packer().pack_array_header(length)
+
+    def marshal_list_items(self, obj, first):
+        try:
+            # Pack the slice as a whole and strip the array header, so it takes a single call.
+            packed = self.library.packb(self.normalize_list(obj))
+            return packed[len(self.marshal_list_start(len(obj))):]
+        except Exception as e:
+            raise error.MarshalError(e)
+
+    def marshal_list_end(self, length):
+        return b''
+
+    # Sizes of MessagePack types by their first byte: A tuple of the header size and the format
+    # of the length field (or the size of the payload if it has a fixed size).
+    _msgpack_types = {
+        0xc0: (1, 0), 0xc2: (1, 0), 0xc3: (1, 0),  # nil, false, true
+        0xc4: (2, '>B'), 0xc5: (3, '>H'), 0xc6: (5, '>I'),  # bin
+        0xc7: (3, '>B'), 0xc8: (4, '>H'), 0xc9: (6, '>I'),  # ext
+        0xca: (1, 4), 0xcb: (1, 8),  # float
+        0xcc: (1, 1), 0xcd: (1, 2), 0xce: (1, 4), 0xcf: (1, 8),  # uint
+        0xd0: (1, 1), 0xd1: (1, 2), 0xd2: (1, 4), 0xd3: (1, 8),  # int
+        0xd4: (2, 1), 0xd5: (2, 2), 0xd6: (2, 4), 0xd7: (2, 8), 0xd8: (2, 16),  # fixext
+        0xd9: (2, '>B'), 0xda: (3, '>H'), 0xdb: (5, '>I'),  # str
+    }
+
+    def scan(self, body, limits):
+        import struct
+
+        if PY2:  # pragma: py2
+            body = bytearray(body)
+
+        # stack of open containers: [number of remaining objects, True for maps, objects seen]
+        stack = []
+        pos = 0
+        try:
+            while True:
+                if stack:
+                    parent = stack[-1]
+                    if not parent[1] or parent[2] % 2 == 0:
+                        limits.item()
+                    parent[0] -= 1
+                    parent[2] += 1
+
+                first = body[pos]
+                children = None
+                if first <= 0x7f or first >= 0xe0:  # fixint
+                    pos += 1
+                elif first <= 0x8f:  # fixmap
+                    children, is_map = (first & 0x0f) * 2, True
+                    pos += 1
+                elif first <= 0x9f:  # fixarray
+                    children, is_map = first & 0x0f, False
+                    pos += 1
+                elif first <= 0xbf:  # fixstr
+                    limits.string(first & 0x1f)
+                    pos += 1 + (first & 0x1f)
+                elif first in (0xdc, 0xdd, 0xde, 0xdf):  # array 16/32, map 16/32
+                    fmt = '>H' if first in (0xdc, 0xde) else '>I'
+                    children = struct.unpack_from(fmt, body, pos + 1)[0]
+                    is_map = first >= 0xde
+                    if is_map:
+                        children *= 2
+                    pos += 1 + struct.calcsize(fmt)
+                elif first in self._msgpack_types:
+                    header, size = self._msgpack_types[first]
+                    if not isinstance(size, int):
+                        size = struct.unpack_from(size, body, pos + 1)[0]
+                        if first >= 0xd9 or first <= 0xc6:  # str or bin
+                            limits.string(size)
+                    pos += header + size
+                else:
+                    raise error.UnmarshalError('Invalid MessagePack type: %s' % first)
+
+                if children is not None:
+                    limits.enter()
+                    stack.append([children, is_map, 0])
+
+                while stack and stack[-1][0] == 0:
+                    stack.pop()
+                    limits.leave()
+
+                if not stack:
+                    break
+        except (IndexError, struct.error) as e:
+            raise error.UnmarshalError(e)
+
+        if pos > len(body):
+            raise error.UnmarshalError('Incomplete MessagePack data.')
+
     def unmarshal_dict(self, body):
+        self.check_limits(body)
+        if self.INTERN:
+            return self.intern_dict(self.normalize_dict(self.library.unpackb(body)))
         return self.normalize_dict(self.library.unpackb(body))
 
     def unmarshal_list(self, body):
+        self.check_limits(body)
+        if self.INTERN:
+            return self.intern_list(self.normalize_list(self.library.unpackb(body)))
         return self.normalize_list(self.library.unpackb(body))
 
     def unmarshal_str(self, body):
+        self.check_limits(body)
         return self.normalize_str(self.library.unpackb(body))
 
+    # Header size and format of the length of str and bin types
+    _msgpack_strings = {0xd9: (2, '>B'), 0xda: (3, '>H'), 0xdb: (5, '>I'),
+                        0xc4: (2, '>B'), 0xc5: (3, '>H'), 0xc6: (5, '>I')}
+
+    def unmarshal_list_lazy(self, body):
+        import struct
+        from RestAuthCommon.views import LazyList
+        from RestAuthCommon.views import offsets
+
+        self.check_limits(body)
+        data = bytearray(body) if PY2 else body  # pragma: no branch
+        strings = self._msgpack_strings
+        index = offsets(len(body))
+
+        try:
+            first = data[0]
+            if 0x90 <= first <= 0x9f:  # fixarray
+                length, pos = first & 0x0f, 1
+            elif first == 0xdc:
+                length, pos = struct.unpack_from('>H', body, 1)[0], 3
+            elif first == 0xdd:
+                length, pos = struct.unpack_from('>I', body, 1)[0], 5
+            else:
+                raise error.UnmarshalError('Body is not a MessagePack array.')
+
+            for i in range(length):
+                first = data[pos]
+                if 0xa0 <= first <= 0xbf:  # fixstr
+                    size = first & 0x1f
+                    pos += 1
+                elif first in strings:
+                    header, fmt = strings[first]
+                    size = struct.unpack_from(fmt, body, pos + 1)[0]
+                    pos += header
+                else:  # not a list of strings
+                    return self.unmarshal_list(body)
+
+                index.append(pos)
+                pos += size
+                index.append(pos)
+        except (IndexError, struct.error) as e:
+            raise error.UnmarshalError(e)
+
+        if pos != len(body):
+            raise error.UnmarshalError('Invalid MessagePack array.')
+        return LazyList(body, index, _decode_utf8)
+
+    def _skip(self, data, pos):
+        """Get the position after the object at ``pos``."""
+        import struct
+
+        remaining = 1
+        while remaining:
+            remaining -= 1
+            first = data[pos]
+            if first <= 0x7f or first >= 0xe0:  # fixint
+                pos += 1
+            elif first <= 0x8f:  # fixmap
+                remaining += (first & 0x0f) * 2
+                pos += 1
+            elif first <= 0x9f:  # fixarray
+                remaining += first & 0x0f
+                pos += 1
+            elif first <= 0xbf:  # fixstr
+                pos += 1 + (first & 0x1f)
+            elif first in (0xdc, 0xdd, 0xde, 0xdf):  # array 16/32, map 16/32
+                fmt = '>H' if first in (0xdc, 0xde) else '>I'
+                children = struct.unpack_from(fmt, data, pos + 1)[0]
+                remaining += children * 2 if first >= 0xde else children
+                pos += 1 + struct.calcsize(fmt)
+            elif first in self._msgpack_types:
+                header, size = self._msgpack_types[first]
+                if not isinstance(size, int):
+                    size = struct.unpack_from(size, data, pos + 1)[0]
+                pos += header + size
+            else:
+                raise error.UnmarshalError('Invalid MessagePack type: %s' % first)
+        return pos
+
+    def _decode_value(self, raw):
+        value = self.library.unpackb(raw)
+        if isinstance(value, dict):
+            return self.normalize_dict(value)
+        elif isinstance(value, list):
+            return self.normalize_list(value)
+        return self.normalize_str(value)
+
+    def unmarshal_dict_lazy(self, body, keys=None):
+        import struct
+
+        self.check_limits(body)
+        data = bytearray(body) if PY2 else body  # pragma: no branch
+        strings = self._msgpack_strings
+        items = []
+
+        try:
+            first = data[0]
+            if 0x80 <= first <= 0x8f:  # fixmap
+                length, pos = first & 0x0f, 1
+            elif first == 0xde:
+                length, pos = struct.unpack_from('>H', body, 1)[0], 3
+            elif first == 0xdf:
+                length, pos = struct.unpack_from('>I', body, 1)[0], 5
+            else:
+                return super(MessagePackContentHandler, self).unmarshal_dict_lazy(body, keys=keys)
+
+            for i in range(length):
+                first = data[pos]
+                if 0xa0 <= first <= 0xbf:  # fixstr
+                    size = first & 0x1f
+                    pos += 1
+                elif first in strings:
+                    header, fmt = strings[first]
+                    size = struct.unpack_from(fmt, body, pos + 1)[0]
+                    pos += header
+                else:  # keys that are not strings
+                    return super(MessagePackContentHandler, self).unmarshal_dict_lazy(
+                        body, keys=keys)
+
+                key = body[pos:pos + size].decode('utf-8')
+                start = pos + size
+                pos = self._skip(data, start)
+                items.append((key, start, pos))
+        except (IndexError, ValueError, struct.error) as e:
+            raise error.UnmarshalError(e)
+
+        if pos != len(body):
+            raise error.UnmarshalError('Invalid MessagePack map.')
+        return self._lazy_dict(body, items, self._decode_value, keys)
+
 
 class FormContentHandler(ContentHandler):
     """Handler for HTML Form urlencoded content.
@@ -488,7 +1611,20 @@ class FormContentHandler(ContentHandler):
     def _normalize_dict2(self, d):  # pragma: py2
         return {self._normalize_str2(k): self._normalize_str2(v) for k, v in d.iteritems()}
 
+    def scan(self, body, limits):
+        if PY3:  # pragma: no branch py3
+            body = body.decode('utf-8')
+
+        limits.enter()
+        for field in body.split('&') if body else []:
+            key, _, value = field.partition('=')
+            limits.item()
+            limits.string(len(key))
+            limits.string(len(value))
+        limits.leave()
+
     def unmarshal_dict(self, body):
+        self.check_limits(body)
         if PY3:  # pragma: no branch py3
             body = body.decode('utf-8')
 
@@ -500,9 +1636,12 @@ class FormContentHandler(ContentHandler):
         if PY2:  # pragma: no branch py2
             ret_dict = self._decode_dict(ret_dict)
 
+        if self.INTERN:
+            return self.intern_dict(ret_dict)
         return ret_dict
 
     def unmarshal_list(self, body):
+        self.check_limits(body)
         if PY3:  # pragma: no branch py3
             body = body.decode('utf-8')
 
@@ -513,9 +1652,12 @@ class FormContentHandler(ContentHandler):
 
         if PY2:  # pragma: no branch py2
             parsed = [e.decode('utf-8') for e in parsed]
+        if self.INTERN:
+            return self.intern_list(parsed)
         return parsed
 
     def unmarshal_str(self, body):
+        self.check_limits(body)
         if PY3:  # pragma: no branch py3
             body = body.decode('utf-8')
 
@@ -575,6 +1717,9 @@ class PickleContentHandler(ContentHandler):
     librarypath = 'pickle'
     PROTOCOL = 2
 
+    # NOTE: This handler does not implement scan(), so only MAX_BODY_BYTES is enforced. Never
+    #       unpickle data from untrusted sources in the first place.
+
     def marshal_str(self, obj):
         try:
             return self.library.dumps(self.normalize_str(obj), protocol=self.PROTOCOL)
@@ -594,22 +1739,31 @@ class PickleContentHandler(ContentHandler):
             raise error.MarshalError(str(e))
 
     def unmarshal_str(self, data):
+        self.check_limits(data)
         try:
             return self.normalize_str(self.library.loads(data))
         except Exception as e:
             raise error.UnmarshalError(str(e))
 
     def unmarshal_list(self, data):
+        self.check_limits(data)
         try:
-            return self.normalize_list(self.library.loads(data))
+            unmarshalled = self.normalize_list(self.library.loads(data))
         except Exception as e:
             raise error.UnmarshalError(str(e))
+        if self.INTERN:
+            return self.intern_list(unmarshalled)
+        return unmarshalled
 
     def unmarshal_dict(self, data):
+        self.check_limits(data)
         try:
-            return self.normalize_dict(self.library.loads(data))
+            unmarshalled = self.normalize_dict(self.library.loads(data))
         except Exception as e:
             raise error.UnmarshalError(str(e))
+        if self.INTERN:
+            return self.intern_dict(unmarshalled)
+        return unmarshalled
 
 
 class Pickle3ContentHandler(PickleContentHandler):
@@ -641,6 +1795,93 @@ class YAMLContentHandler(ContentHandler):
     """The mime-type used by this content handler is 'application/yaml'."""
 
     librarypath = 'yaml'
+    SUPPORT_REFERENCES = True
+    OFFLOAD_BYTES = 16384
+    OFFLOAD_ITEMS = 1000
+
+    MAX_ALIASES = 100
+    """Maximum number of aliases (``*name``) that are resolved when unmarshalling.
+
+    Aliases are never produced by the marshal_* methods of this handler, but they allow a tiny
+    body to expand into an exponentially large object ("billion laughs"). Bodies with more aliases
+    raise :py:exc:`~.error.RequestEntityTooLarge`. ``None`` means no limit.
+    """
+
+    MAX_ALIAS_NODES = 10000
+    """Maximum total number of nodes that aliases expand to when unmarshalling.
+
+    An alias to a list or dictionary counts with all nodes (lists, dictionaries, keys and values)
+    it contains, so a few aliases to large nodes can't expand into a huge object either. Bodies
+    that expand to more nodes raise :py:exc:`~.error.RequestEntityTooLarge` before the object is
+    copied by the unmarshal_* methods. ``None`` means no limit.
+    """
+
+    _loader = None
+
+    @property
+    def loader(self):
+        """The loader class used by the unmarshal_* methods.
+
+        The class is based on ``CSafeLoader`` (or ``SafeLoader`` if PyYAML was built without
+        libyaml) and counts resolved aliases and the nodes they expand to. It is created only once
+        per process.
+        """
+        if YAMLContentHandler._loader is None:
+            yaml = self.library
+            base = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+            class Loader(base):
+                max_aliases = None
+                max_alias_nodes = None
+                aliases = 0
+                alias_nodes = 0
+
+                def __init__(self, stream):
+                    base.__init__(self, stream)
+                    self.node_sizes = {}
+
+                def count_nodes(self, node):
+                    size = self.node_sizes.get(node)
+                    if size == 0:
+                        raise yaml.constructor.ConstructorError(
+                            None, None, 'found recursive alias', node.start_mark)
+                    elif size is None:
+                        self.node_sizes[node] = 0  # marks nodes that are being counted
+                        size = 1
+                        if isinstance(node, yaml.MappingNode):
+                            for key, value in node.value:
+                                size += self.count_nodes(key) + self.count_nodes(value)
+                        elif isinstance(node, yaml.SequenceNode):
+                            for value in node.value:
+                                size += self.count_nodes(value)
+                        self.node_sizes[node] = size
+                    return size
+
+                def construct_object(self, node, deep=False):
+                    if node in self.constructed_objects or node in self.recursive_objects:
+                        self.aliases += 1
+                        if self.max_aliases is not None and self.aliases > self.max_aliases:
+                            raise error.RequestEntityTooLarge(
+                                'Body contains more than %s aliases.' % self.max_aliases)
+
+                        if self.max_alias_nodes is not None:
+                            self.alias_nodes += self.count_nodes(node)
+                            if self.alias_nodes > self.max_alias_nodes:
+                                raise error.RequestEntityTooLarge(
+                                    'Aliases expand to more than %s nodes.' % self.max_alias_nodes)
+                    return base.construct_object(self, node, deep=deep)
+
+            YAMLContentHandler._loader = Loader
+        return YAMLContentHandler._loader
+
+    def _load(self, data):
+        loader = self.loader(data)
+        loader.max_aliases = self.MAX_ALIASES
+        loader.max_alias_nodes = self.MAX_ALIAS_NODES
+        try:
+            return loader.get_single_data()
+        finally:
+            loader.dispose()
 
     def _marshal_str3(self, obj):  # pragma: py3
         return self.library.dump(self.normalize_str(obj), encoding='utf-8')
@@ -732,24 +1973,74 @@ class YAMLContentHandler(ContentHandler):
         except Exception as e:
             raise error.MarshalError(e)
 
+    def scan(self, body, limits):
+        yaml = self.library
+        node_events = (yaml.ScalarEvent, yaml.SequenceStartEvent, yaml.MappingStartEvent,
+                       yaml.AliasEvent)
+
+        # stack of open collections: [True for mappings, nodes seen, anchor, items before the
+        # collection, depth of the collection]
+        stack = []
+        anchors = {}  # anchor -> (items, depth) of the anchored node
+        try:
+            for event in yaml.parse(body, Loader=self.loader):
+                if isinstance(event, node_events) and stack:
+                    parent = stack[-1]
+                    if not parent[0] or parent[1] % 2 == 0:
+                        limits.item()
+                    parent[1] += 1
+
+                if isinstance(event, yaml.ScalarEvent):
+                    limits.string(len(event.value))
+                    if event.anchor is not None:
+                        anchors[event.anchor] = (0, 0)
+                elif isinstance(event, yaml.AliasEvent):
+                    # an alias expands to a copy of the anchored node
+                    items, depth = anchors.get(event.anchor, (0, 0))
+                    limits.reference(items, depth)
+                    if stack:
+                        stack[-1][4] = max(stack[-1][4], depth + 1)
+                elif isinstance(event, yaml.CollectionStartEvent):
+                    limits.enter()
+                    stack.append([isinstance(event, yaml.MappingStartEvent), 0, event.anchor,
+                                  limits.items, 1])
+                elif isinstance(event, yaml.CollectionEndEvent):
+                    limits.leave()
+                    _mapping, _nodes, anchor, items, depth = stack.pop()
+                    if anchor is not None:
+                        anchors[anchor] = (limits.items - items, depth)
+                    if stack:
+                        stack[-1][4] = max(stack[-1][4], depth + 1)
+        except yaml.YAMLError as e:
+            raise error.UnmarshalError(e)
+
     def unmarshal_str(self, data):
+        self.check_limits(data)
         try:
-            unmarshalled = self.library.load(data)
+            unmarshalled = self._load(data)
             return self.normalize_str(unmarshalled)
         except self.library.YAMLError as e:  # pragma: no cover
             raise error.UnmarshalError(e)
 
     def unmarshal_list(self, data):
+        self.check_limits(data)
         try:
-            return self.normalize_list(self.library.load(data))
+            unmarshalled = self.normalize_list(self._load(data))
         except self.library.YAMLError as e:
             raise error.UnmarshalError(e)
+        if self.INTERN:
+            return self.intern_list(unmarshalled)
+        return unmarshalled
 
     def unmarshal_dict(self, data):
+        self.check_limits(data)
         try:
-            return self.normalize_dict(self.library.load(data))
+            unmarshalled = self.normalize_dict(self._load(data))
         except self.library.YAMLError as e:
             raise error.UnmarshalError(e)
+        if self.INTERN:
+            return self.intern_dict(unmarshalled)
+        return unmarshalled
 
     if PY3:  # pragma: py3
         _marshal_str = _marshal_str3
@@ -773,9 +2064,81 @@ class XMLContentHandler(ContentHandler):
     """The mime-type used by this content handler is 'application/xml'."""
 
     librarypath = 'lxml.etree'
+    OFFLOAD_BYTES = 65536
+    OFFLOAD_ITEMS = 2000
+    SUPPORT_PARTIAL_LISTS = True
+
+    PARSER_OPTIONS = {
+        'resolve_entities': False,
+        'no_network': True,
+        'load_dtd': False,
+        'huge_tree': False,
+    }
+    """Keyword arguments for all parsers created by this handler.
+
+    Entities are never resolved and no documents are loaded from the network. Bodies that contain
+    a document type declaration (and thus could declare entities) raise
+    :py:exc:`~.error.UnmarshalError` in any case.
+    """
+
+    _parsers = threading.local()
+
+    @property
+    def parser(self):
+        """The :py:class:`lxml.etree.XMLParser` used by the unmarshal_* methods.
+
+        Parsers are configured with :py:attr:`PARSER_OPTIONS` and created once per thread and
+        options, since lxml parsers may not be used by multiple threads at the same time.
+        """
+        try:
+            parsers = self._parsers.parsers
+        except AttributeError:
+            parsers = self._parsers.parsers = {}
+
+        key = tuple(sorted(self.PARSER_OPTIONS.items()))
+        parser = parsers.get(key)
+        if parser is None:
+            parser = parsers[key] = self.library.XMLParser(**self.PARSER_OPTIONS)
+        return parser
+
+    def _parse(self, body):
+        try:
+            root = self.library.fromstring(body, self.parser)
+        except self.library.XMLSyntaxError as e:
+            raise error.UnmarshalError(e)
+
+        if root.getroottree().docinfo.internalDTD is not None:
+            raise error.UnmarshalError('Document type declarations are not allowed.')
+        return root
+
+    def scan(self, body, limits):
+        from io import BytesIO
+
+        if not isinstance(body, bytes):  # pragma: no cover
+            body = body.encode('utf-8')
+
+        try:
+            for event, elem in self.library.iterparse(BytesIO(body), events=('start', 'end'),
+                                                     **self.PARSER_OPTIONS):
+                container = elem.tag in ('list', 'dict')
+                if event == 'start':
+                    if limits.depth:
+                        limits.item()
+                    if container:
+                        limits.enter()
+                    continue
+
+                if container:
+                    limits.leave()
+                limits.string(len(elem.text or ''))
+                limits.string(len(elem.get('key', '')))
+                elem.clear()
+        except self.library.XMLSyntaxError as e:
+            raise error.UnmarshalError(e)
 
     def unmarshal_str(self, data):
-        text = self.library.fromstring(data).text
+        self.check_limits(data)
+        text = self._parse(data).text
         if text is None:
             text = ''
 
@@ -800,8 +2163,11 @@ class XMLContentHandler(ContentHandler):
         return d
 
     def unmarshal_dict(self, body):
-        d = self._unmarshal_dict(self.library.fromstring(body))
-        return self.normalize_dict(d)
+        self.check_limits(body)
+        d = self.normalize_dict(self._unmarshal_dict(self._parse(body)))
+        if self.INTERN:
+            return self.intern_dict(d)
+        return d
 
     def _unmarshal_list(self, tree):
         l = []
@@ -813,7 +2179,156 @@ class XMLContentHandler(ContentHandler):
         return self.normalize_list(l)
 
     def unmarshal_list(self, body):
-        return self._unmarshal_list(self.library.fromstring(body))
+        self.check_limits(body)
+        if self.INTERN:
+            return self.intern_list(self._unmarshal_list(self._parse(body)))
+        return self._unmarshal_list(self._parse(body))
+
+    _lazy_list_patterns = None
+
+    def _decode_lazy(self, raw):
+        if b'&' in raw or b'\r' in raw:  # entities or line endings that the parser normalizes
+            return self.library.fromstring(b'<str>' + raw + b'</str>', self.parser).text or ''
+        return raw.decode('utf-8')
+
+    def unmarshal_list_lazy(self, body):
+        """Like :py:meth:`.ContentHandler.unmarshal_list_lazy`.
+
+        Only lists as created by :py:meth:`marshal_list` (optionally with an XML declaration and
+        whitespace between elements) are indexed, other documents (e.g. with comments or CDATA
+        sections) are unmarshalled with :py:meth:`unmarshal_list`.
+        """
+        from RestAuthCommon.views import LazyList
+        from RestAuthCommon.views import offsets
+
+        self.check_limits(body)
+        if self._lazy_list_patterns is None:
+            import re
+            XMLContentHandler._lazy_list_patterns = (
+                re.compile(br'\s*(?:<\?xml\s+version=(["\'])1\.[0-9]\1'
+                           br'(?:\s+encoding=(["\'])(?i:utf-8)\2)?\s*\?>)?\s*<list\s*(/)?>'),
+                re.compile(br'\s*(?:<str>([^<]*)</str>|<str\s*/>)'),
+                re.compile(br'\s*</list>\s*'),
+            )
+        start, element, end = self._lazy_list_patterns
+
+        match = start.match(body)
+        if match is None:
+            return self.unmarshal_list(body)
+        pos = match.end()
+        index = offsets(len(body))
+
+        if match.group(3) is None:  # not an empty element
+            for match in element.finditer(body, pos):
+                if match.start() != pos:
+                    break
+                if match.start(1) < 0:  # <str/>
+                    index.extend((match.end(), match.end()))
+                else:
+                    index.extend(match.span(1))
+                pos = match.end()
+
+            match = end.match(body, pos)
+            if match is None or match.end() != len(body):
+                return self.unmarshal_list(body)
+        elif body[pos:].strip():
+            return self.unmarshal_list(body)
+
+        return LazyList(body, index, self._decode_lazy)
+
+    _lazy_dict_patterns = None
+
+    def _decode_value(self, raw):
+        elem = self.library.fromstring(raw, self.parser)
+        if elem.tag == 'dict':
+            return self.normalize_dict(self._unmarshal_dict(elem))
+        elif elem.tag == 'list':
+            return self._unmarshal_list(elem)
+        return self.normalize_str(elem.text or '')
+
+    _entities = {'lt': '<', 'gt': '>', 'amp': '&', 'quot': '"', 'apos': "'"}
+
+    def _unescape(self, value):
+        """Replace predefined entities and character references, ``None`` if there are others."""
+        import re
+
+        def replace(match):
+            name = match.group(1)
+            if name.startswith('#x'):
+                return unichr(int(name[2:], 16))
+            elif name.startswith('#'):
+                return unichr(int(name[1:]))
+            return self._entities[name]
+
+        try:
+            return re.sub(r'&(#x[0-9a-fA-F]+|#[0-9]+|[a-z]+);', replace, value)
+        except (KeyError, ValueError, OverflowError):
+            return None
+
+    def _index_dict(self, body):
+        """Get ``(key, start, end)`` tuples, or ``None`` if the body can't be indexed."""
+        if self._lazy_dict_patterns is None:
+            import re
+            XMLContentHandler._lazy_dict_patterns = (
+                re.compile(br'\s*(?:<\?xml\s+version=(["\'])1\.[0-9]\1'
+                           br'(?:\s+encoding=(["\'])(?i:utf-8)\2)?\s*\?>)?\s*<dict\s*(/)?>'),
+                re.compile(br'<(/?)(str|dict|list)(?:\s+key=(?:"([^"]*)"|\'([^\']*)\'))?\s*(/?)>'),
+            )
+        start, tag = self._lazy_dict_patterns
+
+        match = start.match(body)
+        if match is None:
+            return None
+        if match.group(3):  # <dict/>
+            return [] if not body[match.end():].strip() else None
+
+        items = []
+        depth = 1
+        pos = match.end()
+        for match in tag.finditer(body, pos):
+            if b'<' in body[pos:match.start()]:  # comments, CDATA sections, other elements, ...
+                return None
+            pos = match.end()
+            closing, empty = match.group(1), match.group(5)
+
+            if depth == 1 and not closing:
+                key = match.group(3) if match.group(3) is not None else match.group(4)
+                if key is None or any(c in key for c in (b'\r', b'\n', b'\t')):
+                    return None  # no key or a key that needs whitespace normalization
+                key = key.decode('utf-8')
+                if '&' in key:
+                    key = self._unescape(key)
+                    if key is None:
+                        return None
+                value_start = match.start()
+                if empty:
+                    items.append((key, value_start, pos))
+                else:
+                    depth += 1
+            elif closing:
+                depth -= 1
+                if depth == 1:
+                    items.append((key, value_start, pos))
+                elif depth == 0:
+                    break
+            elif not empty:
+                depth += 1
+
+        if depth != 0 or body[pos:].strip():
+            return None
+        return items
+
+    def unmarshal_dict_lazy(self, body, keys=None):
+        """Like :py:meth:`.ContentHandler.unmarshal_dict_lazy`.
+
+        Like with :py:meth:`unmarshal_list_lazy`, only documents as created by
+        :py:meth:`marshal_dict` are indexed.
+        """
+        self.check_limits(body)
+        items = self._index_dict(body)
+        if items is None:
+            return super(XMLContentHandler, self).unmarshal_dict_lazy(body, keys=keys)
+        return self._lazy_dict(body, items, self._decode_value, keys)
 
     def marshal_str(self, obj):
         try:
@@ -842,6 +2357,19 @@ class XMLContentHandler(ContentHandler):
     def marshal_list(self, obj):
         return self.library.tostring(self._marshal_list(obj))
 
+    def marshal_list_start(self, length):
+        return b'<list>' if length else b'<list/>'
+
+    def marshal_list_items(self, obj, first):
+        try:
+            # Serialize the slice as a whole and strip the <list> tags, so it takes a single call.
+            return self.library.tostring(self._marshal_list(obj))[6:-7]
+        except Exception as e:
+            raise error.MarshalError(e)
+
+    def marshal_list_end(self, length):
+        return b'</list>' if length else b''
+
     def _marshal_dict(self, obj, key=None):
         root = self.library.Element('dict')
         if key is not None:
@@ -898,3 +2426,169 @@ application/messagepack           :py:class:`.handlers.MessagePackContentHandler
 If you want to provide your own implementation of a :py:class:`.ContentHandler`, you can add it to
 this dictionary with the appropriate MIME type as the key.
 """
+
+_shared_handlers = {}
+
+
+def get_handler(mime):
+    """Get a shared instance of the handler for the given MIME type.
+
+    The instance is created upon first use and the same instance is returned for every subsequent
+    call, so this is cheaper than instantiating a handler for every request. Handlers do not keep
+    any per-request state, so the instance can safely be shared between threads.
+
+    :param str mime: The MIME type, a key of :py:data:`CONTENT_HANDLERS`.
+    :rtype: :py:class:`.ContentHandler`
+    :raise KeyError: If there is no handler for the given MIME type.
+    """
+    try:
+        return _shared_handlers[mime]
+    except KeyError:
+        return _shared_handlers.setdefault(mime, CONTENT_HANDLERS[mime]())
+
+
+_preference_order = None
+
+
+def _library_version(mime):
+    """Get the version of the library used by the handler for ``mime``, used to invalidate cached
+    calibration results."""
+    handler = get_handler(mime)
+    if handler.librarypath is None:
+        return ''
+    return str(getattr(handler.library, '__version__', ''))
+
+
+def _measure(handler, payloads, repeat):
+    """Get the minimum time (in seconds) to marshal and unmarshal all payloads once."""
+    from timeit import default_timer
+
+    timings = []
+    for i in range(repeat):
+        start = default_timer()
+        for typ, obj in payloads:
+            getattr(handler, 'unmarshal_%s' % typ)(getattr(handler, 'marshal_%s' % typ)(obj))
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+def _write_json(path, data):
+    """Atomically write ``data`` as JSON to ``path``.
+
+    The data is written to a temporary file in the same directory that then replaces ``path``, so
+    processes reading the file (or writing it at the same time) never see a partial file.
+    """
+    import json
+    import os
+    import tempfile
+
+    try:
+        replace = os.replace
+    except AttributeError:  # pragma: py2
+        replace = os.rename  # atomic on POSIX
+
+    directory, filename = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.%s.' % filename, dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as stream:
+            json.dump(data, stream, indent=4, sort_keys=True)
+        replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def calibrate(mimes=None, path=None, size=100, repeat=5):
+    """Measure the throughput of content handlers and set the preference order used by
+    :py:func:`preferred_mime`.
+
+    Every handler marshals and unmarshals a representative list (of ``size`` usernames),
+    dictionary (of ``size`` properties) and string. Handlers whose library is not installed are
+    skipped. The result depends on the optional libraries installed (e.g. if PyYAML uses libyaml),
+    so it should be measured at startup of the server::
+
+        >>> calibrate(mimes=['application/json', 'application/yaml'])  # doctest: +SKIP
+        ['application/json', 'application/yaml']
+
+    If ``path`` is given, results are stored as JSON in that file and subsequent calls read the
+    results from that file. Handlers are measured again if the file has no results for them or if
+    the Python version or the version of their library changed.
+
+    :param list mimes: MIME types to calibrate, the default is all keys of
+        :py:data:`CONTENT_HANDLERS`.
+    :param str path: Path of a file used to cache the results.
+    :param int size: Number of list items and dictionary keys of the payloads.
+    :param int repeat: Number of times every measurement is repeated, the fastest is used.
+    :return: The calibrated MIME types, fastest first.
+    :rtype: list
+    """
+    global _preference_order
+    import json
+
+    if mimes is None:
+        mimes = sorted(CONTENT_HANDLERS)
+    mimes = [m for m in mimes if CONTENT_HANDLERS[m].is_available()]
+    python = sys.version.split()[0]
+
+    # cached results as {mime: [library version, seconds]}, only valid for this Python version
+    cached = {}
+    if path is not None:
+        try:
+            with open(path) as stream:
+                data = json.load(stream)
+            if data['python'] == python:
+                cached = data['timings']
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            pass  # no (valid) cached results
+
+    payloads = None
+    timings = {}
+    for mime in mimes:
+        version = _library_version(mime)
+        try:
+            cached_version, timing = cached[mime]
+            if cached_version == version:
+                timings[mime] = timing
+                continue
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        if payloads is None:
+            payloads = [
+                ('list', ['user%s' % i for i in range(size)]),
+                ('dict', dict(('property%s' % i, 'value%s' % i) for i in range(size))),
+                ('str', 'username'),
+            ]
+        timings[mime] = _measure(get_handler(mime), payloads, repeat)
+        cached[mime] = [version, timings[mime]]
+
+    if path is not None and payloads is not None:
+        _write_json(path, {'python': python, 'timings': cached})
+
+    _preference_order = sorted(mimes, key=lambda m: timings[m])
+    return list(_preference_order)
+
+
+def preferred_mime(mimes):
+    """Choose the preferred MIME type from a list of equally acceptable MIME types.
+
+    Use this function during content negotiation if the ``Accept`` header of a client has the same
+    quality for several formats. MIME types are ranked by the order set by :py:func:`calibrate`.
+    If it was not called, or if none of the MIME types was calibrated, the first MIME type is
+    returned::
+
+        >>> preferred_mime(['application/yaml', 'application/json'])  # doctest: +SKIP
+        'application/json'
+
+    :param list mimes: The MIME types to choose from.
+    :return: The preferred MIME type, or ``None`` if ``mimes`` is empty.
+    :rtype: str
+    """
+    if not mimes:
+        return None
+    if _preference_order is None:
+        return mimes[0]
+
+    order = _preference_order
+    ranked = len(order)
+    return min(mimes, key=lambda m: order.index(m) if m in order else ranked)
@@ -20,13 +20,16 @@
 
 from __future__ import unicode_literals, absolute_import
 
-import re
+import sys
 
+from collections import namedtuple
 from unicodedata import ucd_3_2_0 as unicodedata
 
 from RestAuthCommon.error import PreconditionFailed
 
-check_pattern = re.compile(
+# NOTE: Patterns are only compiled upon first use (see _get_patterns()), as compiling the astral
+#       plane ranges below is by far the most expensive part of importing this module.
+CHECK_PATTERN = (
     '['
 
     # C.1.2 Non-ASCII space characters
@@ -132,20 +135,430 @@ check_pattern = re.compile(
 )
 
 # Table B.1 Commonly mapped to nothing:
-prep_pattern = re.compile(
+PREP_PATTERN = (
     '[\u00AD\u034F\u1806\u180B\u180C\u180D\u200B\u200C\u200D\u2060\uFE00\uFE01\uFE02\uFE03\uFE04'
     '\uFE05\uFE06\uFE07\uFE08\uFE09\uFE0A\uFE0B\uFE0C\uFE0D\uFE0E\uFE0F\uFEFF]')
 
+_TABLES = ['C.1.2', 'C.2.1', 'C.2.2', 'C.3', 'C.4', 'C.5', 'C.6', 'C.7', 'C.8', 'C.9']
+
+_patterns = None
+_tables = None
+_b2 = None
+_numpy_table = None
+
+
+def _get_patterns():
+    """Get a tuple of the compiled ``check_pattern`` and ``prep_pattern``, compile them if
+    necessary."""
+    global _patterns
+    if _patterns is None:
+        import re
+        _patterns = re.compile(CHECK_PATTERN), re.compile(PREP_PATTERN)
+    return _patterns
+
+
+def __getattr__(name):
+    """Lazily compile ``check_pattern`` and ``prep_pattern`` upon first access (Python 3.7+)."""
+    if name == 'check_pattern':
+        return _get_patterns()[0]
+    elif name == 'prep_pattern':
+        return _get_patterns()[1]
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    check_pattern, prep_pattern = _get_patterns()
+
+
+def _get_tables():
+    """Get the lookup tables used by the "tables" engine, build them if necessary.
+
+    This is a tuple of a :py:meth:`str.translate` map that removes all characters in table B.1, a
+    bytearray with the (1-based) index in ``_TABLES`` for every character in the BMP (0 if the
+    character is allowed) and three lists with the first and last character and table index of
+    all ranges outside the BMP. The tables are built from the module generated by ``python
+    setup.py generate_tables``.
+    """
+    global _tables
+    if _tables is None:
+        from RestAuthCommon._tables import B1
+        from RestAuthCommon._tables import PROHIBITED_RANGES
+
+        bmp = bytearray(0x10000)
+        astral = []
+
+        # insert ranges in reverse order, so the first table listed wins
+        for first, last, table in reversed(PROHIBITED_RANGES):
+            index = _TABLES.index(table) + 1
+            if first < 0x10000:
+                bmp[first:last + 1] = bytearray([index]) * (last - first + 1)
+            else:
+                astral.append((first, last, index))
+
+        astral.sort()
+        _tables = (B1, bmp, [r[0] for r in astral], [r[1] for r in astral],
+                   [r[2] for r in astral])
+    return _tables
+
+
+def _lookup(code):
+    """Get the name of the table the code point ``code`` is prohibited in, or ``None``."""
+    from bisect import bisect_right
+
+    bmp, starts, ends, indexes = _get_tables()[1:]
+    if code < 0x10000:
+        index = bmp[code]
+    else:
+        i = bisect_right(starts, code) - 1
+        index = indexes[i] if i >= 0 and code <= ends[i] else 0
+    return _TABLES[index - 1] if index else None
+
+
+def _regex_remove(name):
+    return _get_patterns()[1].sub('', name)
+
+
+def _regex_search(name):
+    match = _get_patterns()[0].search(name)
+    return None if match is None else match.group()
+
+
+def _tables_remove(name):
+    removed = name.translate(_get_tables()[0])
+    return name if len(removed) == len(name) else removed
+
+
+def _tables_search(name):
+    bmp = _get_tables()[1]
+    for char in name:
+        code = ord(char)
+        if bmp[code] if code < 0x10000 else _lookup(code):
+            return char
+    return None
+
+
+_ENGINES = {
+    'regex': (_regex_remove, _regex_search),
+    'tables': (_tables_remove, _tables_search),
+}
+
+# Functions removing characters in table B.1 and finding the first prohibited character.
+_remove, _search = _ENGINES['regex']
+
+
+try:
+    _isascii = str.isascii
+except AttributeError:  # pragma: no cover - Python < 3.7
+    def _isascii(name):
+        return False
+
+
+def _normalize(name):
+    """NFC-normalize ``name``, but return ``name`` itself if it is already normalized.
+
+    ``unicodedata.ucd_3_2_0.is_normalized()`` has no quick check for Unicode 3.2 and costs as much
+    as normalizing, so the name is always normalized once.
+    """
+    normalized = unicodedata.normalize('NFC', name)
+    return name if normalized == name else normalized
+
+
+def _lower(name):
+    """Lowercase ``name``, but return ``name`` itself if it is already lowercase."""
+    if name.islower():
+        return name
+    lowered = name.lower()
+    return name if lowered == name else lowered
+
+
+def _stringprep(name):
+    # Table B.1 contains no ASCII characters and ASCII strings are always NFC-normalized.
+    if _isascii(name):
+        return _lower(name)
+
+    return _lower(_remove(_normalize(name)))
+
+
+def _stringcheck(name):
+    # The only prohibited ASCII characters are control characters (C.2.1), which are exactly the
+    # ASCII characters that are not printable.
+    if _isascii(name):
+        if name.isprintable():
+            return _lower(name)
+        raise PreconditionFailed("Invalid characters")
+
+    name = _remove(name)
+
+    if _search(name) is None:
+        return _lower(_normalize(name))
+    raise PreconditionFailed("Invalid characters")
+
+
+# Implementations used by stringprep()/stringcheck(), replaced by set_cache_size().
+_cached_stringprep = _stringprep
+_cached_stringcheck = _stringcheck
+_cache_size = 0
+
+
+def set_engine(engine):
+    """Set the engine used to find characters that are removed or prohibited.
+
+    The ``"regex"`` engine (the default) uses :py:data:`prep_pattern` and :py:data:`check_pattern`.
+    The ``"tables"`` engine uses a :py:meth:`str.translate` map to remove characters and a lookup
+    table to find prohibited characters, both are generated from the stringprep tables of Unicode
+    3.2. Both engines return identical results, but the regular expressions are faster since they
+    do not look at every character in Python code. Setting the engine clears the cache configured
+    with :py:func:`set_cache_size`.
+
+    :param str engine: Either ``"regex"`` or ``"tables"``.
+    :raise ValueError: If the engine is unknown.
+    """
+    global _remove, _search
+
+    if engine not in _ENGINES:
+        raise ValueError('Unknown engine: %s' % engine)
+    _remove, _search = _ENGINES[engine]
+    set_cache_size(_cache_size)
+
+
+def set_cache_size(maxsize):
+    """Cache the results of :py:func:`stringprep` and :py:func:`stringcheck`.
+
+    Both functions get their own least-recently-used cache holding up to ``maxsize`` names. The
+    cache is disabled by default. Calling this function again replaces (and thus clears) any
+    existing cache. Names rejected by :py:func:`stringcheck` are never cached, so they raise
+    :py:exc:`~.error.PreconditionFailed` on every call.
+
+    :param maxsize: The maximum number of cached names per function, ``0`` disables the cache and
+        ``None`` lets it grow without bounds.
+    :type  maxsize: int
+    """
+    global _cached_stringprep, _cached_stringcheck, _cache_size
+
+    _cache_size = maxsize
+    if maxsize == 0:
+        _cached_stringprep, _cached_stringcheck = _stringprep, _stringcheck
+    else:
+        from functools import lru_cache
+        _cached_stringprep = lru_cache(maxsize=maxsize)(_stringprep)
+        _cached_stringcheck = lru_cache(maxsize=maxsize)(_stringcheck)
+
+
+def cache_info():
+    """Get statistics for the cache configured with :py:func:`set_cache_size`.
+
+    :return: A dictionary with the keys ``"stringprep"`` and ``"stringcheck"``, with values as
+        returned by :py:func:`functools.lru_cache`'s ``cache_info()`` (a named tuple of ``hits``,
+        ``misses``, ``maxsize`` and ``currsize``), or ``None`` if the cache is disabled.
+    :rtype: dict
+    """
+    return {
+        'stringprep': getattr(_cached_stringprep, 'cache_info', lambda: None)(),
+        'stringcheck': getattr(_cached_stringcheck, 'cache_info', lambda: None)(),
+    }
+
+
+def cache_clear():
+    """Clear the cache configured with :py:func:`set_cache_size` (if any) and reset statistics."""
+    for func in (_cached_stringprep, _cached_stringcheck):
+        if hasattr(func, 'cache_clear'):
+            func.cache_clear()
+
+
+def casefold(name):
+    """Map characters using table B.2 (case folding for use with NFKC) of RFC 3454.
+
+    Unlike :py:meth:`str.lower` (used by :py:func:`stringprep`), this uses Unicode 3.2 and also
+    maps some characters to multiple characters (e.g. "ß" to "ss")::
+
+        >>> casefold('Stra\u00dfe')
+        'strasse'
+
+    :param str name: The name to map.
+    :rtype: str
+    """
+    global _b2
+    if _b2 is None:
+        from RestAuthCommon._tables import B2
+        _b2 = dict((ord(line[0]), line[1:]) for line in B2.splitlines())
+    return name.translate(_b2)
+
 
 def stringprep(name):
     """Lowercase, normalize and remove stringprep B.1 characters."""
-    return prep_pattern.sub('', unicodedata.normalize('NFC', name)).lower()
+    return _cached_stringprep(name)
 
 
 def stringcheck(name):
     """Same as :py:func:`stringprep` but raises PreconditionFailed if name contains invalid characters."""
-    name = prep_pattern.sub('', name)
+    return _cached_stringcheck(name)
 
-    if check_pattern.search(name) is None:
-        return unicodedata.normalize('NFC', name).lower()
-    raise PreconditionFailed("Invalid characters")
+
+PARALLEL_MIN_NAMES = 100000
+"""Lists with fewer names are processed by :py:func:`stringprep_many` and
+:py:func:`stringcheck_many` in the current process."""
+
+
+Rejection = namedtuple('Rejection', ['index', 'name', 'character', 'table'])
+Rejection.__doc__ = """A name rejected by :py:func:`stringcheck_many`.
+
+The index of the name in the list, the name itself, the first prohibited character in it and the
+stringprep table the character is listed in (e.g. ``"C.2.1"`` for ASCII control characters).
+"""
+
+
+def _stringcheck_chunk(names, offset):
+    prepared = []
+    rejections = []
+    for i, name in enumerate(names, offset):
+        try:
+            prepared.append(_cached_stringcheck(name))
+        except PreconditionFailed:
+            char = _search(_remove(name))
+            prepared.append(None)
+            rejections.append(Rejection(i, name, char, _lookup(ord(char))))
+    return prepared, rejections
+
+
+def _stringprep_chunk(names, offset):
+    return [_cached_stringprep(name) for name in names]
+
+
+def _map_chunks(func, names, executor, chunk_size):
+    if len(names) < PARALLEL_MIN_NAMES:
+        return [func(names, 0)]
+
+    from RestAuthCommon._parallel import map_shards
+    return map_shards(func, names, executor, chunk_size)
+
+
+def stringprep_many(names, executor=None, chunk_size=None):
+    """Apply :py:func:`stringprep` to a list of names.
+
+    Lists with at least :py:data:`PARALLEL_MIN_NAMES` names are split into chunks that are
+    processed in a :py:class:`~concurrent.futures.ProcessPoolExecutor`. Since
+    :py:func:`stringprep` never rejects a name, this function only returns the prepared names.
+
+    :param list names: The names to prepare.
+    :param executor: The executor to use, see :py:meth:`.ContentHandler.marshal_list_parallel`.
+    :type  executor: :py:class:`concurrent.futures.ProcessPoolExecutor`
+    :param int chunk_size: Number of names processed by a single task, like ``shard_size`` in
+        :py:meth:`.ContentHandler.marshal_list_parallel`.
+    :return: The prepared names, in the same order as ``names``.
+    :rtype: list
+    """
+    prepared = []
+    for chunk in _map_chunks(_stringprep_chunk, names, executor, chunk_size):
+        prepared += chunk
+    return prepared
+
+
+def stringcheck_many(names, executor=None, chunk_size=None):
+    """Apply :py:func:`stringcheck` to a list of names.
+
+    Unlike :py:func:`stringcheck`, invalid names do not raise
+    :py:exc:`~.error.PreconditionFailed` but are reported in the second element of the returned
+    tuple, so a single call validates all names::
+
+        >>> prepared, rejections = stringcheck_many(['Foo', 'b\\x00r'])
+        >>> prepared
+        ['foo', None]
+        >>> rejections
+        [Rejection(index=1, name='b\\x00r', character='\\x00', table='C.2.1')]
+
+    Parallel processing and the ``executor`` and ``chunk_size`` parameters work the same way as
+    in :py:func:`stringprep_many`.
+
+    :param list names: The names to check.
+    :return: A tuple of the prepared names (``None`` for rejected names) in the same order as
+        ``names`` and a list of :py:class:`Rejection` instances ordered by index.
+    :rtype: tuple
+    """
+    prepared = []
+    rejections = []
+    for chunk, chunk_rejections in _map_chunks(_stringcheck_chunk, names, executor, chunk_size):
+        prepared += chunk
+        rejections += chunk_rejections
+    return prepared, rejections
+
+
+def _validate_python(names):
+    valid = []
+    offsets = []
+    for name in names:
+        char = _search(_remove(name))
+        valid.append(char is None)
+        offsets.append(-1 if char is None else name.index(char))
+    return valid, offsets
+
+
+def _get_numpy_table(np):
+    """Get a NumPy array with a boolean for every code point, True if it is prohibited.
+
+    Characters in table B.1 are not prohibited, as :py:func:`stringcheck` removes them before
+    checking for prohibited characters.
+    """
+    global _numpy_table
+    if _numpy_table is None:
+        deletions, bmp, starts, ends, indexes = _get_tables()
+        table = np.zeros(0x110000, dtype=bool)
+        table[:0x10000] = np.frombuffer(bytes(bmp), dtype=np.uint8) != 0
+        for first, last in zip(starts, ends):
+            table[first:last + 1] = True
+        table[list(deletions)] = False
+        _numpy_table = table
+    return _numpy_table
+
+
+def _validate_numpy(np, names):
+    count = len(names)
+    lengths = np.fromiter((len(name) for name in names), dtype=np.intp, count=count)
+    starts = np.zeros(count, dtype=np.intp)
+    np.cumsum(lengths[:-1], out=starts[1:])
+
+    # decode all names into one array of code points, names start at the indexes in starts
+    codes = np.frombuffer(''.join(names).encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    prohibited = np.flatnonzero(_get_numpy_table(np)[codes])
+
+    # prohibited is sorted, so the first index per name is the first prohibited character
+    owners = np.searchsorted(starts, prohibited, side='right') - 1
+    invalid, first = np.unique(owners, return_index=True)
+
+    valid = np.ones(count, dtype=bool)
+    valid[invalid] = False
+    offsets = np.full(count, -1, dtype=np.intp)
+    offsets[invalid] = prohibited[first] - starts[invalid]
+    return valid, offsets
+
+
+def validate_many(names, use_numpy=None):
+    """Check a (huge) list of names for prohibited characters.
+
+    A name is valid if :py:func:`stringcheck` would accept it. Instead of raising an exception,
+    this function returns a validity mask and the offset of the first prohibited character (or
+    ``-1``) for every name::
+
+        >>> valid, offsets = validate_many(['foo', 'b\\x00r'])
+        >>> print(valid[0], offsets[0], valid[1], offsets[1])
+        True -1 False 1
+
+    If `NumPy <https://numpy.org>`_ is installed, all names are checked with a single vectorized
+    table lookup and the results are NumPy arrays. Otherwise names are checked one by one and the
+    results are lists.
+
+    :param list names: The names to check.
+    :param bool use_numpy: Set to ``False`` to never use NumPy, or to ``True`` to raise
+        ``ImportError`` if NumPy is not installed. The default uses NumPy if it is available.
+    :return: A tuple of the validity mask and the offsets of the first prohibited character.
+    :rtype: tuple
+    """
+    if use_numpy is not False:
+        try:
+            import numpy as np
+        except ImportError:
+            if use_numpy is True:
+                raise
+        else:
+            return _validate_numpy(np, names)
+
+    return _validate_python(names)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon.  If
+# not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import unittest
+
+from RestAuthCommon import aio
+from RestAuthCommon.error import RequestEntityTooLarge
+from RestAuthCommon.error import UnmarshalError
+from RestAuthCommon.handlers import CONTENT_HANDLERS
+
+lists = [
+    [],
+    [''],
+    ['abc'],
+    ['abc', 'def', ''],
+    ['unicode1 愑', 'with "quotes", [brackets] and <tags> & entities'],
+    ['user%s' % i for i in range(5000)],
+]
+
+dicts = [
+    {},
+    {'a': '1', 'b': ''},
+    {'a': {'foo': 'bar'}, 'b': ['x', 'y']},
+]
+
+
+def handlers():
+    for mime, cls in sorted(CONTENT_HANDLERS.items()):
+        if cls.is_available():
+            yield cls()
+
+
+class AsyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    async def iterate(self, data, size):
+        for i in range(0, len(data), size):
+            yield data[i:i + size]
+
+    def stream(self, data):
+        reader = asyncio.StreamReader(loop=self.loop)
+        reader.feed_data(data)
+        reader.feed_eof()
+        return reader
+
+    async def collect(self, agen):
+        return b''.join([chunk async for chunk in agen])
+
+    def test_unmarshal_list(self):
+        for handler in handlers():
+            for testlist in lists:
+                if handler.mime == 'application/x-www-form-urlencoded' and '' in testlist:
+                    continue  # forms do not support empty strings in lists
+                body = handler.marshal_list(testlist)
+
+                for size in (1, 7, len(body) + 1):
+                    unmarshalled = self.run_async(
+                        aio.unmarshal_list(handler, self.iterate(body, size)))
+                    self.assertEqual(unmarshalled, testlist, (handler.mime, size))
+
+                unmarshalled = self.run_async(aio.unmarshal_list(handler, self.stream(body)))
+                self.assertEqual(unmarshalled, testlist)
+
+    def test_marshal_list(self):
+        for handler in handlers():
+            for testlist in lists:
+                for chunk_size in (1, 100, aio.CHUNK_SIZE):
+                    marshalled = self.run_async(
+                        self.collect(aio.marshal_list(handler, testlist, chunk_size=chunk_size)))
+                    self.assertEqual(marshalled, handler.marshal_list(testlist), handler.mime)
+
+                # bytes are supported as well
+                bytelist = [e.encode('utf-8') for e in testlist]
+                marshalled = self.run_async(self.collect(aio.marshal_list(handler, bytelist)))
+                self.assertEqual(marshalled, handler.marshal_list(testlist), handler.mime)
+
+    def test_dict(self):
+        for handler in handlers():
+            for testdict in dicts:
+                if not handler.SUPPORT_NESTED_DICTS and testdict.get('a') == {'foo': 'bar'}:
+                    continue
+                marshalled = self.run_async(self.collect(aio.marshal_dict(handler, testdict)))
+                self.assertEqual(marshalled, handler.marshal_dict(testdict))
+
+                unmarshalled = self.run_async(
+                    aio.unmarshal_dict(handler, self.iterate(marshalled, 3)))
+                self.assertEqual(unmarshalled, testdict)
+
+    def test_str(self):
+        for handler in handlers():
+            marshalled = self.run_async(self.collect(aio.marshal_str(handler, 'foo 愑')))
+            self.assertEqual(marshalled, handler.marshal_str('foo 愑'))
+
+            unmarshalled = self.run_async(aio.unmarshal_str(handler, self.stream(marshalled)))
+            self.assertEqual(unmarshalled, 'foo 愑')
+
+    def test_invalid_json(self):
+        handler = CONTENT_HANDLERS['application/json']()
+        for body in [b'{"a": "b"}', b'["a"', b'["a" "b"]', b'["a",]', b'["a"] x', b'["a', b'']:
+            with self.assertRaises(UnmarshalError):
+                self.run_async(aio.unmarshal_list(handler, self.iterate(body, 2)))
+
+    def test_limits(self):
+        for handler in handlers():
+            body = handler.marshal_list(['abc', 'def', 'ghi'])
+            for kwargs in [{'MAX_BODY_BYTES': len(body) - 1}, {'MAX_ITEMS': 2},
+                           {'MAX_STRING_LENGTH': 2}]:
+                pickle = handler.mime.startswith('application/pickle')
+                if 'MAX_BODY_BYTES' not in kwargs and pickle:
+                    continue  # pickle only supports MAX_BODY_BYTES
+                limited = type(handler)(**kwargs)
+                with self.assertRaises(RequestEntityTooLarge):
+                    self.run_async(aio.unmarshal_list(limited, self.iterate(body, 1)))
+
+            limited = type(handler)(MAX_BODY_BYTES=len(body), MAX_ITEMS=3, MAX_STRING_LENGTH=4)
+            self.assertEqual(self.run_async(aio.unmarshal_list(limited, self.stream(body))),
+                             ['abc', 'def', 'ghi'])
+
+        handler = CONTENT_HANDLERS['application/json'](MAX_BODY_BYTES=5)
+        with self.assertRaises(RequestEntityTooLarge):
+            self.run_async(aio.unmarshal_dict(handler, self.stream(b'{"a":"b"}')))
+
+    def test_nested_limits(self):
+        cls = CONTENT_HANDLERS['application/json']
+        body = b'[["x", "y", "z"], {"a": ["bcd"]}]'
+        expected = [['x', 'y', 'z'], {'a': ['bcd']}]
+        limited = cls(MAX_ITEMS=7, MAX_DEPTH=3, MAX_STRING_LENGTH=3)
+        self.assertEqual(self.run_async(aio.unmarshal_list(limited, self.stream(body))), expected)
+        self.assertEqual(cls(MAX_ITEMS=7).unmarshal_list(body), expected)
+
+        for kwargs in [{'MAX_ITEMS': 6}, {'MAX_DEPTH': 2}, {'MAX_STRING_LENGTH': 2}]:
+            with self.assertRaises(RequestEntityTooLarge):
+                self.run_async(aio.unmarshal_list(cls(**kwargs), self.iterate(body, 4)))
+
+        body = b'[["x"' + b', "x"' * 100000 + b']]'
+        with self.assertRaises(RequestEntityTooLarge):
+            self.run_async(aio.unmarshal_list(cls(MAX_ITEMS=10, MAX_DEPTH=2), self.stream(body)))
+
+    def test_deep(self):
+        handler = CONTENT_HANDLERS['application/json'](MAX_DEPTH=5)
+        body = b'[' * 100000 + b']' * 100000
+        with self.assertRaises(UnmarshalError):
+            self.run_async(aio.unmarshal_list(handler, self.stream(body)))
+
+    def test_xml_dtd(self):
+        handler = CONTENT_HANDLERS['application/xml']()
+        body = b'<!DOCTYPE list [<!ENTITY a "foo">]><list><str>&a;</str></list>'
+        with self.assertRaises(UnmarshalError):
+            self.run_async(aio.unmarshal_list(handler, self.stream(body)))
+
+    def test_yields(self):
+        """Test that other tasks run while a list is unmarshalled."""
+        handler = CONTENT_HANDLERS['application/json']()
+        body = handler.marshal_list(lists[-1])
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def main():
+            task = self.loop.create_task(ticker())
+            await asyncio.sleep(0)
+            result = await aio.unmarshal_list(handler, self.iterate(body, len(body)))
+            task.cancel()
+            return result
+
+        self.assertEqual(self.run_async(main()), lists[-1])
+        self.assertGreater(len(ticks), len(lists[-1]) // aio.YIELD_EVERY)
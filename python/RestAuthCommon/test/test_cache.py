@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon.  If
+# not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+
+import multiprocessing
+import threading
+import time
+import unittest
+
+from RestAuthCommon.cache import MemoryStore
+from RestAuthCommon.cache import OBJECT_SIZE
+from RestAuthCommon.cache import ResponseCache
+from RestAuthCommon.cache import SharedMemoryStore
+from RestAuthCommon.cache import SingleFlight
+from RestAuthCommon.cache import UnmarshalCache
+from RestAuthCommon.cache import freeze
+from RestAuthCommon.cache import shared_memory
+from RestAuthCommon.error import UnmarshalError
+from RestAuthCommon.handlers import get_handler
+
+
+class StoreTestMixin(object):
+    def test_basic(self):
+        self.assertIsNone(self.store.get('a'))
+        self.store.set('a', b'foo')
+        self.assertEqual(self.store.get('a'), b'foo')
+        self.store.set('a', b'foobar')
+        self.assertEqual(self.store.get('a'), b'foobar')
+        self.assertEqual(self.store.stats()['bytes'], 6)
+        self.assertEqual(self.store.stats()['entries'], 1)
+
+        self.store.delete('a')
+        self.store.delete('a')  # no error
+        self.assertIsNone(self.store.get('a'))
+        self.assertEqual(self.store.stats()['bytes'], 0)
+
+    def test_eviction(self):
+        self.store.set('a', b'a' * 40)
+        self.store.set('b', b'b' * 40)
+        self.store.get('a')  # a is now more recently used than b
+        self.store.set('c', b'c' * 40)
+
+        self.assertEqual(self.store.get('a'), b'a' * 40)
+        self.assertIsNone(self.store.get('b'))
+        self.assertEqual(self.store.get('c'), b'c' * 40)
+        stats = self.store.stats()
+        self.assertEqual(stats['bytes'], 80)
+        self.assertEqual(stats['evictions'], 1)
+
+        # values larger than the budget are never stored
+        self.store.set('d', b'd' * 101)
+        self.assertIsNone(self.store.get('d'))
+        self.assertEqual(self.store.stats()['bytes'], 80)
+
+    def test_clear(self):
+        self.store.set('a', b'foo')
+        self.store.set(('application/json', ('members', 'admins', 1)), b'foo')
+        self.store.clear()
+        self.assertIsNone(self.store.get('a'))
+        self.assertEqual(self.store.stats()['entries'], 0)
+        self.assertEqual(self.store.stats()['bytes'], 0)
+
+
+class MemoryStoreTestCase(StoreTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStore(max_bytes=100)
+
+
+def _shared_child(name, lock):
+    store = SharedMemoryStore(max_bytes=100, max_entries=4, name=name, lock=lock)
+    try:
+        store.set('child', store.get('parent') + b'bar')
+    finally:
+        store.close()
+
+
+@unittest.skipIf(shared_memory is None, 'multiprocessing.shared_memory is not available.')
+class SharedMemoryStoreTestCase(StoreTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.store = SharedMemoryStore(max_bytes=100, max_entries=4)
+
+    def tearDown(self):
+        self.store.unlink()
+
+    def test_max_entries(self):
+        for key in 'abcd':
+            self.store.set(key, key.encode('ascii'))
+        self.store.get('a')
+        self.store.set('e', b'e')
+        self.assertIsNone(self.store.get('b'))
+        self.assertEqual([self.store.get(k) for k in 'acde'], [b'a', b'c', b'd', b'e'])
+        self.assertEqual(self.store.stats()['entries'], 4)
+
+    def test_fragmentation(self):
+        self.store.set('a', b'a' * 30)
+        self.store.set('b', b'b' * 30)
+        self.store.set('c', b'c' * 30)
+        self.store.delete('b')
+
+        # 40 bytes are free, but not in one region, so 'a' is evicted
+        self.store.get('c')
+        self.store.set('d', b'd' * 40)
+        self.assertIsNone(self.store.get('a'))
+        self.assertEqual(self.store.get('c'), b'c' * 30)
+        self.assertEqual(self.store.get('d'), b'd' * 40)
+        self.assertEqual(self.store.stats()['bytes'], 70)
+
+    def test_view(self):
+        self.store.set('a', b'foo')
+        with self.store.view('a') as view:
+            self.assertEqual(view, b'foo')
+        with self.store.view('b') as view:
+            self.assertIsNone(view)
+
+    def test_processes(self):
+        ctx = multiprocessing.get_context('spawn')
+        lock = ctx.Lock()
+        store = SharedMemoryStore(max_bytes=100, max_entries=4, lock=lock)
+        try:
+            store.set('parent', b'foo')
+            proc = ctx.Process(target=_shared_child, args=(store.name, lock))
+            proc.start()
+            proc.join()
+            self.assertEqual(proc.exitcode, 0)
+            self.assertEqual(store.get('child'), b'foobar')
+            self.assertEqual(store.stats()['entries'], 2)
+        finally:
+            store.unlink()
+
+    def test_response_cache(self):
+        cache = ResponseCache(store=self.store)
+        key = ('members', 'admins', 1)
+        self.assertEqual(cache.marshal_list('application/json', key, ['user1']), b'["user1"]')
+        self.assertEqual(cache.marshal_list('application/json', key, []), b'["user1"]')
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.event = threading.Event()
+        self.calls = 0
+
+    def func(self, value):
+        self.calls += 1
+        self.event.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def run_threads(self, value, count=5):
+        results = []
+
+        def target():
+            try:
+                results.append(self.flight.call('key', self.func, value))
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=target) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for i in range(500):  # wait until all other threads wait for the first one
+            if self.flight.shared == count - 1:
+                break
+            time.sleep(0.01)
+        self.event.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_threads(self):
+        self.assertEqual(self.run_threads('foo'), ['foo'] * 5)
+        self.assertEqual(self.calls, 1)
+
+        # the next call is not coalesced with a call that already returned
+        self.assertEqual(self.flight.call('key', self.func, 'bar'), 'bar')
+        self.assertEqual(self.calls, 2)
+
+    def test_threads_error(self):
+        error = ValueError('foo')
+        self.assertEqual(self.run_threads(error), [error] * 5)
+        self.assertEqual(self.calls, 1)
+
+    def test_async(self):
+        import asyncio
+
+        async def func(value):
+            self.calls += 1
+            for i in range(3):
+                await asyncio.sleep(0)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        async def main(value):
+            return await asyncio.gather(*[self.flight.call_async('key', func, value)
+                                          for i in range(5)], return_exceptions=True)
+
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertEqual(loop.run_until_complete(main('foo')), ['foo'] * 5)
+            self.assertEqual(self.calls, 1)
+
+            error = ValueError('foo')
+            self.assertEqual(loop.run_until_complete(main(error)), [error] * 5)
+            self.assertEqual(self.calls, 2)
+        finally:
+            loop.close()
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(max_bytes=1024)
+        self.calls = 0
+
+    def members(self):
+        self.calls += 1
+        return ['user1', 'user2']
+
+    def test_marshal(self):
+        json = get_handler('application/json')
+        xml = get_handler('application/xml')
+        key = ('members', 'admins', 1)
+
+        for i in range(3):
+            self.assertEqual(self.cache.marshal_list('application/json', key, self.members),
+                             json.marshal_list(['user1', 'user2']))
+        self.assertEqual(self.calls, 1)
+        # the list is reused for other MIME types
+        self.assertEqual(self.cache.marshal_list('application/xml', key, self.members),
+                         xml.marshal_list(['user1', 'user2']))
+        self.assertEqual(self.calls, 1)
+
+        self.assertEqual(self.cache.marshal_dict('application/json', 'props', {'a': 'b'}),
+                         json.marshal_dict({'a': 'b'}))
+        self.assertEqual(self.cache.marshal_str('application/json', 'name', 'foo'),
+                         json.marshal_str('foo'))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 4)
+        self.assertEqual(stats['entries'], 4)
+
+    def test_invalidate(self):
+        key = ('members', 'admins', 1)
+        self.cache.marshal_list('application/json', key, self.members)
+        self.cache.marshal_list('application/xml', key, self.members)
+        self.cache.marshal_list('application/json', 'other', self.members)
+
+        self.assertEqual(self.calls, 2)
+
+        self.cache.invalidate(key, mimes=['application/xml'])
+        self.cache.marshal_list('application/json', key, self.members)
+        self.cache.marshal_list('application/xml', key, self.members)
+        self.assertEqual(self.calls, 3)
+
+        self.cache.invalidate(key)
+        self.assertEqual(self.cache.stats()['entries'], 1)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.stats(), {'entries': 0, 'bytes': 0, 'max_bytes': 1024,
+                                              'evictions': 0, 'hits': 0, 'misses': 0})
+
+    def test_sources(self):
+        cache = ResponseCache(max_bytes=1024, max_sources=1)
+        cache.marshal_list('application/json', 'a', self.members)
+        cache.marshal_list('application/json', 'b', self.members)
+        cache.marshal_list('application/xml', 'b', self.members)
+        self.assertEqual(self.calls, 2)
+
+        # the list for "a" was evicted
+        cache.marshal_list('application/xml', 'a', self.members)
+        self.assertEqual(self.calls, 3)
+
+    def test_concurrent(self):
+        event = threading.Event()
+
+        def members():
+            self.calls += 1
+            event.wait(5)
+            return ['user1']
+
+        threads = [threading.Thread(target=self.cache.marshal_list,
+                                    args=('application/json', 'key', members)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for i in range(500):
+            if self.cache._flight.shared == 2:
+                break
+            time.sleep(0.01)
+        event.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.calls, 1)
+
+    def test_concurrent_stats(self):
+        def target():
+            for i in range(1000):
+                self.cache.marshal_str('application/json', i % 10, 'foo')
+
+        threads = [threading.Thread(target=target) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 4000)
+
+
+class UnmarshalCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = UnmarshalCache(max_bytes=1024, min_bytes=10)
+
+    def test_freeze(self):
+        frozen = freeze({'a': ['b', {'c': 'd'}], 'e': 'f'})
+        self.assertEqual(frozen, {'a': ('b', {'c': 'd'}), 'e': 'f'})
+        with self.assertRaises(TypeError):
+            frozen['a'] = 'b'
+        with self.assertRaises(TypeError):
+            frozen['a'][1]['c'] = 'e'
+
+    def test_unmarshal(self):
+        for mime in ['application/json', 'application/xml']:
+            handler = get_handler(mime)
+            body = handler.marshal_list(['user1', 'user2'])
+            first = self.cache.unmarshal_list(mime, body)
+            self.assertEqual(first, ('user1', 'user2'))
+            self.assertIs(self.cache.unmarshal_list(mime, body), first)
+
+            body = handler.marshal_dict({'email': 'user@example.com'})
+            first = self.cache.unmarshal_dict(mime, body)
+            self.assertEqual(first, {'email': 'user@example.com'})
+            self.assertIs(self.cache.unmarshal_dict(mime, body), first)
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (4, 4, 4))
+
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_small(self):
+        self.assertEqual(self.cache.unmarshal_list('application/json', b'[]'), ())
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_budget(self):
+        bodies = [get_handler('application/json').marshal_list(['user%s' % i] * 50)
+                  for i in range(3)]
+
+        # results are charged for their objects, not only for the body
+        size = len(bodies[0]) + 51 * OBJECT_SIZE
+        self.cache.unmarshal_list('application/json', bodies[0])
+        self.assertEqual(self.cache.stats()['bytes'], 0)  # larger than max_bytes
+
+        cache = UnmarshalCache(max_bytes=size * 2, min_bytes=10)
+        for body in bodies:
+            cache.unmarshal_list('application/json', body)
+        stats = cache.stats()
+        self.assertEqual(stats['bytes'], size * 2)
+        self.assertEqual(stats['evictions'], 1)
+
+        body = b'{"a": {"b": ["c", "d"]}, "e": "f"}'  # nine strings, lists and dictionaries
+        cache.unmarshal_dict('application/json', body)
+        self.assertEqual(cache.stats()['bytes'], size + len(body) + 9 * OBJECT_SIZE)
+
+    def test_error(self):
+        for i in range(2):
+            with self.assertRaises(UnmarshalError):
+                self.cache.unmarshal_list('application/json', b'["user1", "user2"')
+        self.assertEqual(self.cache.stats()['misses'], 2)
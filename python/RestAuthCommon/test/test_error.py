@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon. If
+# not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+
+import sys
+import unittest
+
+from RestAuthCommon import error
+
+
+class get_exception_tests(unittest.TestCase):
+    def test_registry(self):
+        for (code, resource_type), cls in error.EXCEPTIONS.items():
+            self.assertEqual(cls.response_code, code)
+            self.assertEqual(cls.resource_type, resource_type)
+            self.assertIs(error.get_exception(code, resource_type), cls)
+
+    def test_fallback(self):
+        self.assertIs(error.get_exception(404), error.ResourceNotFound)
+        self.assertIs(error.get_exception(404, 'foobar'), error.ResourceNotFound)
+        self.assertIs(error.get_exception(412, 'user'), error.PreconditionFailed)
+        self.assertIs(error.get_exception(599), error.RestAuthException)
+
+
+class create_error_tests(unittest.TestCase):
+    def test_create(self):
+        exc = error.create_error(404, 'user', 'foobar')
+        self.assertIsInstance(exc, error.UserNotFound)
+        self.assertEqual(exc.args, ('foobar', ))
+        self.assertIsNone(getattr(exc, '__traceback__', None))  # Python 2 has no __traceback__
+
+        exc = error.create_error(599)
+        self.assertIs(type(exc), error.RestAuthException)
+        self.assertEqual(exc.response_code, 599)
+
+
+class raise_error_tests(unittest.TestCase):
+    def test_raise(self):
+        with self.assertRaises(error.UserNotFound) as cm:
+            error.raise_error(404, 'user', 'foobar')
+        self.assertEqual(cm.exception.args, ('foobar', ))
+        self.assertEqual(str(cm.exception), 'foobar')
+        self.assertIsNone(cm.exception.response)
+
+        with self.assertRaises(error.GroupExists) as cm:
+            error.raise_error(409, 'group')
+        self.assertEqual(cm.exception.args, ())
+
+    def test_unknown(self):
+        with self.assertRaises(error.RestAuthException) as cm:
+            error.raise_error(599)
+        self.assertEqual(cm.exception.response_code, 599)
+        self.assertEqual(error.RestAuthException.response_code, 500)
+
+    @unittest.skipIf(sys.version_info[0] == 2, 'Python 2 has no exception context')
+    def test_context(self):
+        for context in (True, False):
+            try:
+                try:
+                    raise ValueError('foo')
+                except ValueError:
+                    error.raise_error(404, 'property', context=context)
+            except error.PropertyNotFound as e:
+                self.assertIsInstance(e.__context__, ValueError)
+                self.assertEqual(e.__suppress_context__, not context)
+                # the handled exception is left untouched
+                self.assertIsNotNone(e.__context__.__traceback__)
+                self.assertFalse(e.__context__.__suppress_context__)
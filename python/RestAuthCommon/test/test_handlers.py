@@ -23,7 +23,9 @@ import unittest
 
 import bson
 
+from RestAuthCommon import handlers
 from RestAuthCommon.error import MarshalError
+from RestAuthCommon.error import RequestEntityTooLarge
 from RestAuthCommon.error import UnmarshalError
 from RestAuthCommon.handlers import BSONContentHandler
 from RestAuthCommon.handlers import ContentHandler
@@ -34,6 +36,8 @@ from RestAuthCommon.handlers import PickleContentHandler
 from RestAuthCommon.handlers import Pickle3ContentHandler
 from RestAuthCommon.handlers import XMLContentHandler
 from RestAuthCommon.handlers import YAMLContentHandler
+from RestAuthCommon.handlers import _libraries
+from RestAuthCommon.handlers import get_handler
 
 PY2 = sys.version_info[0] == 2
 PY3 = sys.version_info[0] == 3
@@ -84,6 +88,386 @@ class TestLibraryImport(unittest.TestCase):
         except ImportError:
             pass
 
+        # the error is cached and raised again on the next access
+        self.assertTrue(isinstance(_libraries['foobar'], ImportError))
+        self.assertRaises(ImportError, getattr, TestHandler('foobar'), 'library')
+
+    def test_shared(self):
+        handler = TestHandler('json')
+        self.assertEqual(handler.library, json)
+        self.assertTrue(_libraries['json'] is json)
+
+    def test_available(self):
+        self.assertTrue(JSONContentHandler.is_available())
+        self.assertTrue(FormContentHandler.is_available())
+
+        class MissingContentHandler(ContentHandler):
+            librarypath = 'foobar.baz'
+
+        self.assertFalse(MissingContentHandler.is_available())
+        self.assertRaises(ImportError, getattr, MissingContentHandler(), 'library')
+
+
+class TestGetHandler(unittest.TestCase):
+    def test_get_handler(self):
+        handler = get_handler('application/json')
+        self.assertTrue(isinstance(handler, JSONContentHandler))
+        self.assertTrue(handler is get_handler('application/json'))
+
+    def test_unknown(self):
+        self.assertRaises(KeyError, get_handler, 'application/foobar')
+
+
+class FailingExecutor(object):
+    def submit(self, *args, **kwargs):
+        raise AssertionError('Executor was used.')
+
+
+class TestOffload(unittest.TestCase):
+    def test_inline(self):
+        handler = JSONContentHandler(executor=FailingExecutor())
+        future = handler.submit('marshal_list', ['foo'])
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), b'["foo"]')
+
+        future = handler.submit('unmarshal_list', b'["foo"')
+        self.assertTrue(isinstance(future.exception(), UnmarshalError))
+
+    def test_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            handler = JSONContentHandler(OFFLOAD_BYTES=4, OFFLOAD_ITEMS=2, executor=executor)
+            self.assertTrue(handler.should_offload('marshal_list', ['a', 'b']))
+            self.assertFalse(handler.should_offload('marshal_list', ['a']))
+            self.assertTrue(handler.should_offload('unmarshal_list', b'["a"]'))
+
+            self.assertEqual(handler.submit('marshal_list', ['a', 'b']).result(), b'["a","b"]')
+            self.assertEqual(handler.submit('unmarshal_list', b'["a"]').result(), ['a'])
+
+        # default executor
+        handler = JSONContentHandler(OFFLOAD_ITEMS=1)
+        self.assertEqual(handler.submit('marshal_dict', {'a': 'b'}).result(), b'{"a":"b"}')
+
+    def test_disabled(self):
+        handler = JSONContentHandler(OFFLOAD_BYTES=None, OFFLOAD_ITEMS=None)
+        self.assertFalse(handler.should_offload('marshal_list', ['a'] * 100000))
+        self.assertFalse(handler.should_offload('unmarshal_list', b' ' * 10000000))
+
+    def test_processes(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            handler = JSONContentHandler(OFFLOAD_BYTES=1, OFFLOAD_ITEMS=1, executor=executor)
+            self.assertEqual(handler.submit('marshal_list', ['a', 'b']).result(), b'["a","b"]')
+            self.assertEqual(handler.submit('unmarshal_list', b'["a"]').result(), ['a'])
+
+            # settings apply in the worker process as well
+            body = handler.marshal_list(['a'] * 11)
+            limited = JSONContentHandler(OFFLOAD_BYTES=1, MAX_ITEMS=10, executor=executor)
+            self.assertRaises(RequestEntityTooLarge,
+                              limited.submit('unmarshal_list', body).result)
+            handler = XMLContentHandler(OFFLOAD_BYTES=1, executor=executor,
+                                        PARSER_OPTIONS={'huge_tree': False})
+            body = handler.marshal_list(['a'])
+            self.assertEqual(handler.submit('unmarshal_list', body).result(), ['a'])
+
+    def test_settings(self):
+        handler = JSONContentHandler(MAX_ITEMS=10, INTERN=True, executor=FailingExecutor())
+        handler.MAX_DEPTH = 2
+        self.assertEqual(handler.get_settings(), {'MAX_ITEMS': 10, 'INTERN': True, 'MAX_DEPTH': 2})
+        self.assertEqual(JSONContentHandler().get_settings(), {})
+
+    @unittest.skipIf(PY2, "Only in Python3")
+    def test_asyncio(self):
+        import asyncio
+
+        handler = JSONContentHandler(OFFLOAD_ITEMS=2)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self.assertEqual(loop.run_until_complete(handler.offload('marshal_list', ['a'])),
+                             b'["a"]')
+            self.assertEqual(loop.run_until_complete(handler.offload('marshal_list', ['a', 'b'])),
+                             b'["a","b"]')
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+class TestParallel(unittest.TestCase):
+    testlists = [
+        [],
+        ['foo'],
+        ['', 'unicode1 \u6111', '<xml> & "json"'],
+        ['user%s' % i for i in range(1000)],
+    ]
+
+    def test_parallel(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        handlers = [JSONContentHandler(PARALLEL_MIN_ITEMS=0),
+                    MessagePackContentHandler(PARALLEL_MIN_ITEMS=0),
+                    XMLContentHandler(PARALLEL_MIN_ITEMS=0)]
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for handler in handlers:
+                for testlist in self.testlists:
+                    for shard_size in (1, 7, None):
+                        marshalled = handler.marshal_list_parallel(
+                            testlist, executor=executor, shard_size=shard_size)
+                        self.assertEqual(marshalled, handler.marshal_list(testlist))
+
+                bytelist = [e.encode('utf-8') for e in self.testlists[-1]]
+                self.assertEqual(handler.marshal_list_parallel(bytelist, executor=executor),
+                                 handler.marshal_list(bytelist))
+
+                self.assertRaises(MarshalError, handler.marshal_list_parallel,
+                                  [Unserializeable()], executor=executor)
+
+    def test_fallback(self):
+        # executor is never used for small lists or handlers without support for partial lists
+        handler = JSONContentHandler()
+        self.assertEqual(handler.marshal_list_parallel(['foo'], executor=False), b'["foo"]')
+        handler = PickleContentHandler(PARALLEL_MIN_ITEMS=0)
+        self.assertEqual(handler.marshal_list_parallel(['foo'], executor=False),
+                         handler.marshal_list(['foo']))
+
+    def test_default_executor(self):
+        handler = JSONContentHandler(PARALLEL_MIN_ITEMS=0)
+        self.assertEqual(handler.marshal_list_parallel(self.testlists[-1]),
+                         handler.marshal_list(self.testlists[-1]))
+
+
+class TestLimits(unittest.TestCase):
+    handlers = [BSONContentHandler, FormContentHandler, JSONContentHandler,
+                MessagePackContentHandler, XMLContentHandler, YAMLContentHandler]
+    testdict = {'a': 'abc', 'b': {'c': 'def', 'd': ['ghi', 'jkl']}}
+
+    def test_body_bytes(self):
+        for cls in self.handlers + [PickleContentHandler]:
+            body = cls().marshal_str('foobar')
+            self.assertEqual(cls(MAX_BODY_BYTES=len(body)).unmarshal_str(body), 'foobar')
+            self.assertRaises(RequestEntityTooLarge,
+                              cls(MAX_BODY_BYTES=len(body) - 1).unmarshal_str, body)
+
+    def test_items(self):
+        for cls in self.handlers:
+            body = cls().marshal_list(['abc', 'def', 'ghi'])
+            self.assertEqual(cls(MAX_ITEMS=3).unmarshal_list(body), ['abc', 'def', 'ghi'])
+            self.assertRaises(RequestEntityTooLarge, cls(MAX_ITEMS=2).unmarshal_list, body)
+
+    def test_string_length(self):
+        for cls in self.handlers:
+            body = cls().marshal_str('foobar')
+            self.assertEqual(cls(MAX_STRING_LENGTH=6).unmarshal_str(body), 'foobar')
+            self.assertRaises(RequestEntityTooLarge, cls(MAX_STRING_LENGTH=5).unmarshal_str, body)
+
+    def test_depth(self):
+        for cls in self.handlers:
+            if not cls.SUPPORT_NESTED_DICTS:
+                continue
+            body = cls().marshal_dict(self.testdict)
+            self.assertEqual(cls(MAX_DEPTH=3).unmarshal_dict(body), self.testdict)
+            self.assertRaises(RequestEntityTooLarge, cls(MAX_DEPTH=2).unmarshal_dict, body)
+
+    def test_time(self):
+        testlist = ['user%s' % i for i in range(1000)]
+        for cls in self.handlers:
+            body = cls().marshal_list(testlist)
+            self.assertEqual(cls(MAX_SCAN_TIME=60).unmarshal_list(body), testlist)
+            self.assertRaises(RequestEntityTooLarge, cls(MAX_SCAN_TIME=0).unmarshal_list, body)
+
+    def test_references(self):
+        # aliases count with the items and depth of the node they refer to
+        body = b'a: &a [lol, lol]\nb: &b [*a, *a]\nc: [*b, *b]\n'
+        self.assertEqual(YAMLContentHandler(MAX_ITEMS=25).unmarshal_dict(body)['c'],
+                         [[['lol', 'lol']] * 2] * 2)
+        self.assertRaises(RequestEntityTooLarge,
+                          YAMLContentHandler(MAX_ITEMS=24).unmarshal_dict, body)
+        self.assertEqual(YAMLContentHandler(MAX_DEPTH=4).unmarshal_dict(body)['b'],
+                         [['lol', 'lol']] * 2)
+        self.assertRaises(RequestEntityTooLarge,
+                          YAMLContentHandler(MAX_DEPTH=3).unmarshal_dict, body)
+
+        # small bodies are scanned if they may contain references
+        body = 'l0: &l0 {a: lol}\n'
+        for i in range(1, 7):
+            body += 'l%s: &l%s {%s}\n' % (
+                i, i, ', '.join('k%s: *l%s' % (j, i - 1) for j in range(10)))
+        body = body.encode('utf-8')
+        self.assertRaises(RequestEntityTooLarge,
+                          YAMLContentHandler(MAX_ITEMS=len(body)).unmarshal_dict, body)
+        self.assertRaises(RequestEntityTooLarge,
+                          YAMLContentHandler(MAX_DEPTH=3).unmarshal_dict, body)
+
+    def test_skip_scan(self):
+        # bodies that can't exceed any limit are not scanned
+        class NoScan(JSONContentHandler):
+            def scan(self, body, limits):
+                raise AssertionError('Body was scanned.')
+
+        body = NoScan().marshal_list(['abc', 'def'])
+        self.assertEqual(NoScan(MAX_ITEMS=len(body), MAX_DEPTH=100).unmarshal_list(body),
+                         ['abc', 'def'])
+        self.assertRaises(AssertionError, NoScan(MAX_ITEMS=len(body) - 1).unmarshal_list, body)
+        self.assertRaises(AssertionError, NoScan(MAX_SCAN_TIME=60).unmarshal_list, body)
+
+
+class TestCalibrate(unittest.TestCase):
+    mimes = ['application/json', 'application/xml', 'application/yaml']
+
+    def tearDown(self):
+        handlers._preference_order = None
+
+    def test_calibrate(self):
+        order = handlers.calibrate(mimes=self.mimes, size=10, repeat=1)
+        self.assertEqual(sorted(order), self.mimes)
+        self.assertEqual(handlers.preferred_mime(list(reversed(order))), order[0])
+
+    def test_cache(self):
+        import json
+        import tempfile
+
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            # write fake results with yaml as fastest handler
+            timings = {'application/json': [handlers._library_version('application/json'), 3],
+                       'application/yaml': [handlers._library_version('application/yaml'), 1],
+                       'application/xml': ['0.0', 2]}  # wrong version, measured again
+            with open(path, 'w') as stream:
+                json.dump({'python': sys.version.split()[0], 'timings': timings}, stream)
+
+            order = handlers.calibrate(mimes=self.mimes, path=path, repeat=1)
+            self.assertEqual(order, ['application/xml', 'application/yaml', 'application/json'])
+            with open(path) as stream:
+                cached = json.load(stream)['timings']
+            self.assertEqual(cached['application/yaml'], timings['application/yaml'])
+            self.assertNotEqual(cached['application/xml'], timings['application/xml'])
+
+            # the file is replaced atomically, no temporary files are left behind
+            directory, filename = os.path.split(path)
+            self.assertEqual([f for f in os.listdir(directory) if filename in f], [filename])
+
+            # invalid files are ignored
+            with open(path, 'w') as stream:
+                stream.write('foobar')
+            order = handlers.calibrate(mimes=self.mimes, path=path, repeat=1)
+            self.assertEqual(sorted(order), self.mimes)
+        finally:
+            os.remove(path)
+
+    def test_preferred_mime(self):
+        self.assertIsNone(handlers.preferred_mime([]))
+        self.assertEqual(handlers.preferred_mime(['application/yaml', 'application/json']),
+                         'application/yaml')
+
+        handlers._preference_order = ['application/json', 'application/yaml']
+        self.assertEqual(handlers.preferred_mime(['application/yaml', 'application/json']),
+                         'application/json')
+        self.assertEqual(handlers.preferred_mime(['foo/bar', 'application/yaml']),
+                         'application/yaml')
+        self.assertEqual(handlers.preferred_mime(['foo/bar', 'foo/baz']), 'foo/bar')
+
+
+class TestExpansion(unittest.TestCase):
+    def test_yaml_aliases(self):
+        handler = YAMLContentHandler(MAX_ALIASES=3)
+        body = b'a: &a [lol, lol]\nb: &b [*a, *a]\nc: [*b, *b]\n'
+        self.assertRaises(RequestEntityTooLarge, handler.unmarshal_dict, body)
+
+        handler = YAMLContentHandler(MAX_ALIASES=4)
+        self.assertEqual(handler.unmarshal_dict(body)['c'], [[['lol', 'lol']] * 2] * 2)
+
+    def test_yaml_billion_laughs(self):
+        body = 'a0: &a0 [lol, lol, lol, lol, lol, lol, lol, lol, lol, lol]\n'
+        for i in range(1, 12):
+            body += 'a%s: &a%s [%s]\n' % (i, i, ', '.join(['*a%s' % (i - 1)] * 10))
+        self.assertRaises(RequestEntityTooLarge, YAMLContentHandler().unmarshal_dict,
+                          body.encode('utf-8'))
+
+    def test_yaml_alias_nodes(self):
+        body = b'a: &a [lol, lol]\nb: [*a, *a]\n'
+        self.assertEqual(YAMLContentHandler(MAX_ALIAS_NODES=6).unmarshal_dict(body)['b'],
+                         [['lol', 'lol']] * 2)
+        self.assertRaises(RequestEntityTooLarge,
+                          YAMLContentHandler(MAX_ALIAS_NODES=5).unmarshal_dict, body)
+
+        # recursive aliases can't be unmarshalled
+        for body in [b'a: &a [*a]\n', b'a: &a {b: *a}\n', b'a: &a [&b [*a], *b]\n']:
+            self.assertRaises(UnmarshalError, YAMLContentHandler().unmarshal_dict, body)
+
+    def test_yaml_mapping_laughs(self):
+        # few aliases, each referring to a large mapping
+        body = 'l0: &l0 {a: lol}\n'
+        for i in range(1, 7):
+            body += 'l%s: &l%s {%s}\n' % (
+                i, i, ', '.join('k%s: *l%s' % (j, i - 1) for j in range(10)))
+        handler = YAMLContentHandler(INTERN=True)
+        self.assertEqual(handler.MAX_ALIASES, 100)
+        self.assertRaises(RequestEntityTooLarge, handler.unmarshal_dict, body.encode('utf-8'))
+
+    def test_yaml_python_objects(self):
+        body = b'!!python/object/apply:os.system ["true"]'
+        self.assertRaises(UnmarshalError, YAMLContentHandler().unmarshal_str, body)
+
+    def test_xml_entities(self):
+        handler = XMLContentHandler()
+        for body in [b'<!DOCTYPE str [<!ENTITY a "foo">]><str>&a;</str>',
+                     b'<!DOCTYPE str [<!ENTITY a SYSTEM "file:///etc/passwd">]><str>&a;</str>',
+                     b'<!DOCTYPE str SYSTEM "http://example.com/str.dtd"><str>foo</str>']:
+            self.assertRaises(UnmarshalError, handler.unmarshal_str, body)
+
+        # predefined entities and character references still work
+        self.assertEqual(handler.unmarshal_list(b'<list><str>&amp;&#x41;</str></list>'), ['&A'])
+
+    def test_xml_parser(self):
+        handler = XMLContentHandler()
+        self.assertIs(handler.parser, XMLContentHandler().parser)
+
+        # parsers are not shared by handlers with different options
+        options = dict(XMLContentHandler.PARSER_OPTIONS, huge_tree=True)
+        huge = XMLContentHandler(PARSER_OPTIONS=options)
+        self.assertIsNot(huge.parser, handler.parser)
+        self.assertIs(huge.parser, XMLContentHandler(PARSER_OPTIONS=options).parser)
+        self.assertIs(handler.parser, XMLContentHandler().parser)
+
+
+class TestIntern(unittest.TestCase):
+    handlers = TestLimits.handlers + [PickleContentHandler]
+
+    def test_list(self):
+        for cls in self.handlers:
+            body = cls().marshal_list(['user%s' % i for i in range(3)])
+            first = cls(INTERN=True).unmarshal_list(body)
+            second = cls(INTERN=True).unmarshal_list(body)
+            self.assertEqual(first, ['user0', 'user1', 'user2'])
+            for a, b in zip(first, second):
+                self.assertIs(a, b, cls)
+
+            # without INTERN, new strings are created
+            self.assertIsNot(cls().unmarshal_list(body)[0], first[0])
+
+    def test_dict(self):
+        testdict = {'email': 'user@example.com', 'b': {'c': 'def', 'd': ['ghi', 'jkl']}}
+        for cls in self.handlers:
+            if not cls.SUPPORT_NESTED_DICTS:
+                continue
+            body = cls().marshal_dict(testdict)
+            first = cls(INTERN=True).unmarshal_dict(body)
+            second = cls(INTERN=True).unmarshal_dict(body)
+            self.assertEqual(first, testdict)
+            self.assertIs(first['email'], second['email'])
+            self.assertIs(first['b']['d'][1], second['b']['d'][1])
+            self.assertIs([k for k in first if k == 'email'][0],
+                          [k for k in second if k == 'email'][0])
+
+    def test_max_values(self):
+        handler = JSONContentHandler(INTERN=True, INTERN_VALUES=0)
+        body = handler.marshal_list(['not-interned-%s' % id(self)])
+        self.assertIsNot(handler.unmarshal_list(body)[0], handler.unmarshal_list(body)[0])
+
 
 class TestContentHandler(object):
     SUPPORT_UNICODE = True
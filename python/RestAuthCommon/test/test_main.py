@@ -15,13 +15,19 @@
 
 from __future__ import unicode_literals
 
+import os
+import subprocess
 import sys
 import unittest
 
 from RestAuthCommon import resource_validator
+from RestAuthCommon import warmup
+from RestAuthCommon import strprep
+from RestAuthCommon.handlers import get_handler
 
 PY2 = sys.version_info[0] == 2
 PY3 = sys.version_info[0] == 3
+PYTHONPATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 username1 = "mati1 愑"  # \u6111
 username2 = "mati2 愒"  # \u6112
@@ -46,3 +52,89 @@ class validator_tests(unittest.TestCase):
         self.assertFalse(resource_validator('foo\u0340bar'))  # C.8 Change display properties or are deprecated
         self.assertFalse(resource_validator('foo\uE0001bar'))  # C.9 Tagging characters
         self.assertFalse(resource_validator('foo\U000E0001bar'))  # C.9 Tagging characters
+
+
+class warmup_tests(unittest.TestCase):
+    def test_warmup(self):
+        timings = warmup()
+        self.assertIn('application/json', timings)
+        self.assertIn('strprep', timings)
+        self.assertNotIn('gc.freeze', timings)
+        self.assertIsNotNone(strprep._patterns)  # used by the default engine
+        self.assertIsNotNone(get_handler('application/json')._library)
+
+    def test_mimes(self):
+        timings = warmup(mimes=['application/json'])
+        self.assertEqual(set(timings), set(['application/json', 'strprep']))
+
+        self.assertRaises(KeyError, warmup, mimes=['application/foobar'])
+
+    @unittest.skipIf(sys.version_info < (3, 7), "gc.freeze() requires Python 3.7 or later.")
+    def test_freeze(self):
+        import gc
+
+        try:
+            timings = warmup(mimes=[], freeze=True)
+            self.assertIn('gc.freeze', timings)
+            self.assertGreater(gc.get_freeze_count(), 0)
+        finally:
+            gc.unfreeze()
+
+    def test_freeze_unavailable(self):
+        import gc
+
+        freeze = getattr(gc, 'freeze', None)
+        if freeze is not None:
+            del gc.freeze  # simulate Python < 3.7
+        try:
+            timings = warmup(mimes=[], freeze=True)
+            self.assertIsNone(timings['gc.freeze'])
+        finally:
+            if freeze is not None:
+                gc.freeze = freeze
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "-X importtime requires Python 3.7 or later.")
+class import_tests(unittest.TestCase):
+    # Total time (in microseconds) importing RestAuthCommon may take, including the standard
+    # library modules it imports. Imports take about 11ms on a typical machine.
+    IMPORT_BUDGET = 20000
+
+    def run_python(self, *args):
+        env = dict(os.environ, PYTHONPATH=PYTHONPATH)
+        p = subprocess.Popen((sys.executable, ) + args, env=env, stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE)
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0, stderr)
+        return stdout.decode('utf-8'), stderr.decode('utf-8')
+
+    def test_importtime(self):
+        code = 'import RestAuthCommon.handlers, RestAuthCommon.strprep'
+        self.run_python('-m', 'compileall', '-q', os.path.join(PYTHONPATH, 'RestAuthCommon'))
+        stdout, stderr = self.run_python('-X', 'importtime', '-c', code)
+
+        modules = {}
+        total = 0
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            selftime, cumulative, module = line[12:].split('|')
+            modules[module.strip()] = int(selftime)
+
+            # cumulative times of modules imported by the code include all modules they import
+            if module.startswith(' RestAuthCommon'):
+                total += int(cumulative)
+
+        self.assertIn('RestAuthCommon.strprep', modules)
+        self.assertLess(total, self.IMPORT_BUDGET)
+
+        # modules only required by deprecated functions or upon first use are not imported
+        self.assertNotIn('stringprep', modules)
+        self.assertNotIn('re', modules)
+        self.assertNotIn('timeit', modules)
+
+    def test_lazy_tables(self):
+        code = ('import RestAuthCommon.strprep as s; s.set_engine("tables"); '
+                'print(s._tables is None); s.stringcheck("foo\\u00e9"); print(s._tables is None)')
+        stdout, stderr = self.run_python('-c', code)
+        self.assertEqual(stdout.split(), ['True', 'False'])
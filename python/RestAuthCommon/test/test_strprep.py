@@ -18,6 +18,7 @@ from __future__ import unicode_literals
 import sys
 import unittest
 
+from RestAuthCommon import strprep
 from RestAuthCommon.error import PreconditionFailed
 from RestAuthCommon.strprep import stringprep
 from RestAuthCommon.strprep import stringcheck
@@ -174,3 +175,295 @@ class strprep_tests(unittest.TestCase):
 
                 with self.assertRaises(PreconditionFailed):
                     stringcheck(char)
+
+
+def slow_stringprep(name):
+    """The implementation of stringprep() before the ASCII and is_normalized fast paths."""
+    from unicodedata import ucd_3_2_0
+    return strprep.prep_pattern.sub('', ucd_3_2_0.normalize('NFC', name)).lower()
+
+
+def slow_stringcheck(name):
+    """The implementation of stringcheck() before the ASCII and is_normalized fast paths."""
+    from unicodedata import ucd_3_2_0
+    name = strprep.prep_pattern.sub('', name)
+    if strprep.check_pattern.search(name) is None:
+        return ucd_3_2_0.normalize('NFC', name).lower()
+    raise PreconditionFailed("Invalid characters")
+
+
+class fastpath_tests(unittest.TestCase):
+    names = [
+        '', 'foo', 'Foo', 'FOO', 'foo bar', '123', 'foo\tbar', 'foo\x7f', 'foo\x00', '\x1f',
+        'e\u0301', 'E\u0301', '\u00c9', 'A\u030a\u0301', '\u1100\u1161\u11a8', 'foo\u00adbar',
+        'e\u00ad\u0301', '\u2126', '\u212b', 'mati1 \u6111', '\u0130', '\u03a3\u03a3',
+        '\ufb01', '\u0340', 'a\u0340', '\U0001d15e', '\u0f73', '\u0958',
+    ]
+
+    def assertEquivalent(self, func, slow, name):
+        try:
+            expected = slow(name)
+        except PreconditionFailed:
+            self.assertRaises(PreconditionFailed, func, name)
+            return
+        self.assertEqual(func(name), expected, repr(name))
+
+    def test_names(self):
+        for name in self.names:
+            self.assertEquivalent(stringprep, slow_stringprep, name)
+            self.assertEquivalent(stringcheck, slow_stringcheck, name)
+
+    @unittest.skipIf(PY2, 'Python 2 has no fast path')
+    def test_all_characters(self):
+        # all of the BMP and a sample of astral planes, including borders of prohibited ranges
+        astral = [0x1d173, 0x1d17a, 0x1d17b, 0x1fffe, 0xe0001, 0xe0020, 0xe007f, 0xe0080, 0xf0000,
+                  0xffffd, 0x100000, 0x10fffd, 0x10ffff]
+        for i in list(range(0x10000)) + list(range(0x10000, 0x110000, 97)) + astral:
+            if 0xd800 <= i <= 0xdfff:
+                continue
+            c = chr(i)
+            for name in (c, 'a' + c, c + 'A'):
+                self.assertEquivalent(stringprep, slow_stringprep, name)
+                self.assertEquivalent(stringcheck, slow_stringcheck, name)
+
+    @unittest.skipIf(PY2, 'Python 2 has no fast path')
+    def test_identity(self):
+        for name in ['foo', 'foo bar', '123', 'mati1 \u6111', '\u00e9']:
+            name = name + ''.join(['x'])  # make sure the string is not interned
+            self.assertIs(stringprep(name), name)
+            self.assertIs(stringcheck(name), name)
+
+
+class cache_tests(unittest.TestCase):
+    def setUp(self):
+        strprep.set_cache_size(2)
+
+    def tearDown(self):
+        strprep.set_cache_size(0)
+
+    def test_disabled(self):
+        strprep.set_cache_size(0)
+        self.assertEqual(strprep.cache_info(), {'stringprep': None, 'stringcheck': None})
+        self.assertEqual(stringcheck(username1), username1)
+        strprep.cache_clear()  # does nothing
+
+    def test_stats(self):
+        self.assertEqual(stringcheck('Foo'), 'foo')
+        self.assertEqual(stringcheck('Foo'), 'foo')
+        self.assertEqual(stringprep('Foo'), 'foo')
+        info = strprep.cache_info()
+        self.assertEqual(info['stringcheck'].hits, 1)
+        self.assertEqual(info['stringcheck'].misses, 1)
+        self.assertEqual(info['stringprep'].misses, 1)
+
+        # cache is bounded
+        for name in ['a', 'b', 'c']:
+            stringcheck(name)
+        self.assertEqual(strprep.cache_info()['stringcheck'].currsize, 2)
+
+        strprep.cache_clear()
+        info = strprep.cache_info()
+        self.assertEqual(info['stringcheck'].currsize, 0)
+        self.assertEqual(info['stringcheck'].hits, 0)
+
+    def test_rejected(self):
+        for i in range(3):
+            self.assertRaises(PreconditionFailed, stringcheck, 'foo\u0000')
+        self.assertEqual(strprep.cache_info()['stringcheck'].currsize, 0)
+
+
+class many_tests(unittest.TestCase):
+    names = ['Foo', username1, 'b\u0000r', 'x\u00a0', 'foo\u00adbar', '\U000e0001', 'a\ue000']
+
+    def test_stringprep_many(self):
+        self.assertEqual(strprep.stringprep_many(self.names),
+                         [stringprep(name) for name in self.names])
+        self.assertEqual(strprep.stringprep_many([]), [])
+
+    def test_stringcheck_many(self):
+        prepared, rejections = strprep.stringcheck_many(self.names)
+        self.assertEqual(prepared, ['foo', username1, None, None, 'foobar', None, None])
+        self.assertEqual(rejections, [
+            (2, 'b\u0000r', '\u0000', 'C.2.1'),
+            (3, 'x\u00a0', '\u00a0', 'C.1.2'),
+            (5, '\U000e0001', '\U000e0001', 'C.9'),
+            (6, 'a\ue000', '\ue000', 'C.3'),
+        ])
+        self.assertEqual(rejections[0].table, 'C.2.1')
+        self.assertEqual(strprep.stringcheck_many([]), ([], []))
+
+    def test_tables(self):
+        for char in prohibition_table:
+            if isinstance(char, tuple) or char in b1_table:
+                continue
+            rejection = strprep.stringcheck_many([char])[1][0]
+            self.assertIn(rejection.table, strprep._TABLES)
+
+    @unittest.skipIf(PY2, 'Python 2 has no concurrent.futures')
+    def test_parallel(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        names = self.names * 10
+        expected = strprep.stringcheck_many(names)
+        min_names = strprep.PARALLEL_MIN_NAMES
+        strprep.PARALLEL_MIN_NAMES = 0
+        try:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                for chunk_size in (1, 3, None):
+                    self.assertEqual(strprep.stringcheck_many(names, executor, chunk_size),
+                                     expected)
+                    self.assertEqual(strprep.stringprep_many(names, executor, chunk_size),
+                                     [stringprep(name) for name in names])
+        finally:
+            strprep.PARALLEL_MIN_NAMES = min_names
+
+
+class tables_tests(unittest.TestCase):
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, strprep.set_engine, 'foo')
+
+    @unittest.skipIf(PY2, 'Python 2 has no chr() for all code points')
+    def test_all_code_points(self):
+        import stringprep
+
+        all_chars = ''.join(chr(code) for code in range(0x110000))
+        self.assertEqual(strprep._regex_remove(all_chars), strprep._tables_remove(all_chars))
+
+        prohibited = [m.start() for m in strprep.check_pattern.finditer(all_chars)]
+        self.assertEqual(prohibited, [code for code in range(0x110000) if strprep._lookup(code)])
+        for code in prohibited:
+            self.assertEqual(strprep._tables_search(chr(code)), chr(code))
+
+            # the reported table is the first table listed by the stringprep module
+            tables = [t for t in strprep._TABLES if getattr(
+                stringprep, 'in_table_%s' % t.lower().replace('.', ''))(chr(code))]
+            self.assertEqual(strprep._lookup(code), tables[0], hex(code))
+
+    def test_generated(self):
+        import stringprep
+        from RestAuthCommon._tables import B1
+
+        b1 = [chr(code) for code in range(0x10000) if stringprep.in_table_b1(chr(code))]
+        self.assertEqual(sorted(B1), [ord(c) for c in b1])
+        self.assertEqual(''.join(b1), strprep.PREP_PATTERN[1:-1])
+
+    @unittest.skipIf(PY2, 'Python 2 has no chr() for all code points')
+    def test_casefold(self):
+        import stringprep
+        from unicodedata import ucd_3_2_0
+
+        self.assertEqual(strprep.casefold('Foo Bar'), 'foo bar')
+        self.assertEqual(strprep.casefold(username1), username1)
+        # outside the BMP, only Deseret and Mathematical Alphanumeric Symbols are mapped
+        codes = list(range(0x10000)) + list(range(0x10400, 0x10450))
+        codes += list(range(0x1D400, 0x1D800))
+        self.assertTrue(set(strprep._b2) <= set(codes))
+        for code in codes:
+            char = chr(code)
+            if ucd_3_2_0.category(char) == 'Cn':
+                # stringprep.map_table_b2() uses str.lower() for unassigned characters
+                self.assertEqual(strprep.casefold(char), char)
+            else:
+                self.assertEqual(strprep.casefold(char), stringprep.map_table_b2(char))
+
+    def test_equivalent(self):
+        for name in fastpath_tests.names + many_tests.names:
+            for func, slow in [(stringprep, slow_stringprep), (stringcheck, slow_stringcheck)]:
+                try:
+                    expected = slow(name)
+                except PreconditionFailed:
+                    self.assertRaises(PreconditionFailed, func, name)
+                    continue
+                self.assertEqual(func(name), expected)
+
+    def test_identity(self):
+        name = username1 + ''.join(['x'])
+        self.assertIs(stringcheck(name), name)
+
+    def test_tables(self):
+        strprep.set_engine('tables')
+        try:
+            for name in fastpath_tests.names + many_tests.names:
+                try:
+                    expected = slow_stringcheck(name)
+                except PreconditionFailed:
+                    self.assertRaises(PreconditionFailed, stringcheck, name)
+                    continue
+                self.assertEqual(stringcheck(name), expected)
+                self.assertEqual(stringprep(name), slow_stringprep(name))
+        finally:
+            strprep.set_engine('regex')
+
+    def test_cache(self):
+        strprep.set_cache_size(10)
+        try:
+            stringcheck('foo\u00e9')
+            strprep.set_engine('tables')
+            self.assertEqual(strprep.cache_info()['stringcheck'].currsize, 0)
+            self.assertEqual(strprep.cache_info()['stringcheck'].maxsize, 10)
+        finally:
+            strprep.set_engine('regex')
+            strprep.set_cache_size(0)
+
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+class validate_tests(unittest.TestCase):
+    names = fastpath_tests.names + many_tests.names + [
+        'foo\u200bbar\u00a0',  # B.1 characters are removed before checking
+        '\U0001d173x', '\U0001d17bx', 'ab\U000e0020', 'x' * 1000 + '\u0000',
+    ]
+
+    def expected(self):
+        valid = []
+        for name in self.names:
+            try:
+                stringcheck(name)
+                valid.append(True)
+            except PreconditionFailed:
+                valid.append(False)
+        return valid
+
+    def test_python(self):
+        valid, offsets = strprep.validate_many(self.names, use_numpy=False)
+        self.assertEqual(valid, self.expected())
+        for name, offset in zip(self.names, offsets):
+            if offset != -1:
+                self.assertEqual(strprep._tables_search(name[offset]), name[offset])
+                self.assertEqual(strprep._tables_search(strprep._tables_remove(name[:offset])),
+                                 None)
+        self.assertEqual(strprep.validate_many([], use_numpy=False), ([], []))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy(self):
+        valid, offsets = strprep.validate_many(self.names, use_numpy=True)
+        self.assertEqual((valid.tolist(), offsets.tolist()),
+                         strprep.validate_many(self.names, use_numpy=False))
+        self.assertEqual(valid.tolist(), self.expected())
+
+        valid, offsets = strprep.validate_many([])
+        self.assertEqual((valid.tolist(), offsets.tolist()), ([], []))
+
+    @unittest.skipIf(numpy is None or PY2, 'NumPy is not installed')
+    def test_numpy_all_code_points(self):
+        deletions = strprep._get_tables()[0]
+        valid, offsets = strprep.validate_many([chr(code) for code in range(0x110000)])
+        self.assertEqual(valid.tolist(), [code in deletions or strprep._lookup(code) is None
+                                          for code in range(0x110000)])
+
+    def test_missing_numpy(self):
+        module = sys.modules.get('numpy')
+        sys.modules['numpy'] = None  # makes "import numpy" raise ImportError
+        try:
+            self.assertEqual(strprep.validate_many(['foo', '\u0000']), ([True, False], [-1, 0]))
+            self.assertRaises(ImportError, strprep.validate_many, ['foo'], use_numpy=True)
+        finally:
+            if module is None:
+                del sys.modules['numpy']
+            else:
+                sys.modules['numpy'] = module
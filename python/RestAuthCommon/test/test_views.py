@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon.  If
+# not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+
+import unittest
+
+from RestAuthCommon.error import UnmarshalError
+from RestAuthCommon.handlers import BSONContentHandler
+from RestAuthCommon.handlers import JSONContentHandler
+from RestAuthCommon.handlers import MessagePackContentHandler
+from RestAuthCommon.handlers import XMLContentHandler
+from RestAuthCommon.handlers import YAMLContentHandler
+from RestAuthCommon.views import LazyDict
+from RestAuthCommon.views import LazyList
+from RestAuthCommon.views import MembershipIndex
+
+lists = [
+    [],
+    [''],
+    ['abc', '', 'def'],
+    ['unicode1 愜', 'with "quotes", \\backslashes\\, <tags> & entities', 'line\r\nend'],
+    ['user%s' % i for i in range(70000)],  # array 32 in MessagePack
+]
+
+dicts = [
+    {},
+    {'email': 'user@example.com', 'empty': ''},
+    {'a': 'x & y', 'b': {'c': 'd', 'e': ['f', '', '[{"']}, 'g': {}, 'h': [], 'unicode 愜': '愜'},
+    {'key%s' % i: 'value%s' % i for i in range(70000)},  # map 32 in MessagePack
+]
+
+
+class LazyListTestCase(unittest.TestCase):
+    handlers = [JSONContentHandler(), JSONContentHandler(LAZY_CHUNK_SIZE=10),
+                MessagePackContentHandler(), XMLContentHandler()]
+
+    def test_lists(self):
+        for handler in self.handlers:
+            for testlist in lists:
+                lazy = handler.unmarshal_list_lazy(handler.marshal_list(testlist))
+                self.assertIsInstance(lazy, LazyList)
+                self.assertEqual(len(lazy), len(testlist))
+                self.assertEqual(list(lazy), testlist, handler.mime)
+                self.assertEqual(lazy, testlist)
+
+    def test_access(self):
+        testlist = ['user%s' % i for i in range(10)]
+        for handler in self.handlers:
+            lazy = handler.unmarshal_list_lazy(handler.marshal_list(testlist))
+            self.assertEqual(lazy[0], 'user0')
+            self.assertEqual(lazy[-1], 'user9')
+            self.assertRaises(IndexError, lazy.__getitem__, 10)
+            self.assertRaises(IndexError, lazy.__getitem__, -11)
+
+            self.assertEqual(lazy[2:5], testlist[2:5])
+            self.assertIsInstance(lazy[2:5], LazyList)
+            self.assertEqual(lazy[5:2], [])
+            self.assertEqual(lazy[::3], testlist[::3])
+            self.assertEqual(lazy[::-1], testlist[::-1])
+            self.assertIn('user5', lazy)
+            self.assertEqual(lazy.index('user5'), 5)
+
+    def test_whitespace(self):
+        lazy = JSONContentHandler().unmarshal_list_lazy(b' [ "a" ,\n"b" ] \n')
+        self.assertEqual(lazy, ['a', 'b'])
+        lazy = XMLContentHandler().unmarshal_list_lazy(
+            b'<?xml version="1.0" encoding="UTF-8"?>\n<list>\n  <str>a</str>\n  <str/>\n</list>\n')
+        self.assertEqual(lazy, ['a', ''])
+        self.assertEqual(XMLContentHandler().unmarshal_list_lazy(b'<list/>'), [])
+
+    def test_fallback(self):
+        # Valid bodies that can't be indexed are unmarshalled normally
+        self.assertEqual(
+            XMLContentHandler().unmarshal_list_lazy(b'<list><!-- x --><str>a</str></list>'), ['a'])
+        self.assertEqual(
+            XMLContentHandler().unmarshal_list_lazy(b'<list><str><![CDATA[<a>]]></str></list>'),
+            ['<a>'])
+        self.assertEqual(JSONContentHandler().unmarshal_list_lazy(b'["a", 1]'), ['a', 1])
+        self.assertEqual(MessagePackContentHandler().unmarshal_list_lazy(b'\x92\xa1a\x01'),
+                         ['a', 1])
+
+        handler = YAMLContentHandler()
+        self.assertEqual(handler.unmarshal_list_lazy(handler.marshal_list(['a'])), ['a'])
+
+    def test_invalid(self):
+        for body in [b'', b'["a"', b'["a",]', b'["a"] x', b'["a" "b"]', b'["a\\"]']:
+            self.assertRaises(UnmarshalError, JSONContentHandler().unmarshal_list_lazy, body)
+        for body in [b'', b'\x92\xa1a', b'\x91\xa1a\xa1b', b'\x81\xa1a\xa1b', b'\x91\xa3a']:
+            self.assertRaises(UnmarshalError, MessagePackContentHandler().unmarshal_list_lazy,
+                              body)
+        for body in [b'', b'<list><str>a</str>', b'<list><str>a</list>']:
+            self.assertRaises(UnmarshalError, XMLContentHandler().unmarshal_list_lazy, body)
+
+        # Elements are only decoded when they are accessed
+        lazy = MessagePackContentHandler().unmarshal_list_lazy(b'\x92\xa1a\xa1\xff')
+        self.assertEqual(lazy[0], 'a')
+        self.assertRaises(UnmarshalError, lazy.__getitem__, 1)
+        self.assertRaises(UnmarshalError, list, lazy)
+        lazy = JSONContentHandler().unmarshal_list_lazy(b'["a", "\\x"]')
+        self.assertRaises(UnmarshalError, lazy.__getitem__, 1)
+
+
+class LazyDictTestCase(unittest.TestCase):
+    handlers = [BSONContentHandler(), JSONContentHandler(), MessagePackContentHandler(),
+                XMLContentHandler()]
+
+    def test_dicts(self):
+        for handler in self.handlers:
+            for testdict in dicts:
+                body = handler.marshal_dict(testdict)
+                lazy = handler.unmarshal_dict_lazy(body)
+                self.assertIsInstance(lazy, LazyDict)
+                self.assertEqual(len(lazy), len(testdict))
+                self.assertEqual(lazy, testdict, handler.mime)
+
+    def test_keys(self):
+        for handler in self.handlers:
+            body = handler.marshal_dict(dicts[2])
+            lazy = handler.unmarshal_dict_lazy(body, keys=['b', 'h', 'missing'])
+            self.assertEqual(sorted(lazy), ['b', 'h'])
+            self.assertEqual(lazy['b'], dicts[2]['b'])
+            self.assertNotIn('a', lazy)
+            self.assertNotIn('missing', lazy)
+            self.assertRaises(KeyError, lazy.__getitem__, 'a')
+
+            self.assertEqual(handler.unmarshal_dict_lazy(body, keys=[]), {})
+
+    def test_whitespace(self):
+        body = b' { "a" : "b" ,\n"c" : [ "d" ] , "e": {"f": 1} }\n'
+        self.assertEqual(JSONContentHandler().unmarshal_dict_lazy(body),
+                         {'a': 'b', 'c': ['d'], 'e': {'f': 1}})
+        body = b'{"a\\"b": "c", "a": "b", "a": "c"}'
+        self.assertEqual(JSONContentHandler().unmarshal_dict_lazy(body), {'a"b': 'c', 'a': 'c'})
+
+        body = (b'<?xml version="1.0"?>\n<dict>\n  <str key="a">b</str>\n  <str key=\'c\'/>\n'
+                b'  <list key="d"><str>e</str></list>\n</dict>\n')
+        lazy = XMLContentHandler().unmarshal_dict_lazy(body)
+        self.assertIsInstance(lazy, LazyDict)
+        self.assertEqual(lazy, {'a': 'b', 'c': '', 'd': ['e']})
+
+    def test_fallback(self):
+        handler = XMLContentHandler()
+        for body in [b'<dict><!-- x --><str key="a">b</str></dict>',
+                     b'<dict><str key="a"><![CDATA[b]]></str></dict>']:
+            self.assertEqual(handler.unmarshal_dict_lazy(body), {'a': 'b'})
+        self.assertEqual(handler.unmarshal_dict_lazy(b'<dict><str key="&lt;">b</str></dict>'),
+                         {'<': 'b'})
+        self.assertEqual(handler.unmarshal_dict_lazy(b'<dict><str key="&lt;">b</str></dict>',
+                                                     keys=['a']), {})
+
+        handler = YAMLContentHandler()
+        body = handler.marshal_dict({'a': 'b', 'c': 'd'})
+        self.assertEqual(handler.unmarshal_dict_lazy(body), {'a': 'b', 'c': 'd'})
+        self.assertEqual(handler.unmarshal_dict_lazy(body, keys=['a', 'e']), {'a': 'b'})
+
+    def test_invalid(self):
+        for body in [b'', b'{', b'{"a": "b"', b'{"a": "b",}', b'{"a" "b"}', b'{"a": ["b"}',
+                     b'{"a": "b"} x', b'{,}', b'{"a": ["]"}']:
+            self.assertRaises(UnmarshalError, JSONContentHandler().unmarshal_dict_lazy, body)
+        for body in [b'\x81\xa1a', b'\x81\xa1a\x92\xa1b', b'\x81\xa1a\xa1bc', b'\x81\xa1a\xc1']:
+            self.assertRaises(UnmarshalError, MessagePackContentHandler().unmarshal_dict_lazy,
+                              body)
+        body = BSONContentHandler().marshal_dict({'a': 'b'})
+        for invalid in [body[:-1], body + b'\x00', body[:-2] + b'\x01\x00']:
+            self.assertRaises(UnmarshalError, BSONContentHandler().unmarshal_dict_lazy, invalid)
+        for body in [b'<dict><str key="a">b</str>', b'<dict><str key="a">b</dict>']:
+            self.assertRaises(UnmarshalError, XMLContentHandler().unmarshal_dict_lazy, body)
+
+        # Values are only decoded when they are accessed
+        lazy = JSONContentHandler().unmarshal_dict_lazy(b'{"a": "b", "c": tru}')
+        self.assertEqual(lazy['a'], 'b')
+        self.assertRaises(UnmarshalError, lazy.__getitem__, 'c')
+
+
+class MembershipIndexTestCase(unittest.TestCase):
+    handlers = [JSONContentHandler(), MessagePackContentHandler(), XMLContentHandler(),
+                YAMLContentHandler()]
+
+    def test_lists(self):
+        for handler in self.handlers:
+            for testlist in lists:
+                index = handler.unmarshal_list_index(handler.marshal_list(testlist))
+                self.assertIsInstance(index, MembershipIndex)
+                self.assertEqual(len(index), len(set(testlist)))
+                for name in testlist[:100]:
+                    self.assertIn(name, index)
+                self.assertNotIn('missing', index)
+
+    def test_stringprep(self):
+        index = MembershipIndex(['User1', 'user2', 'e\u0301', 'USER1', 'a\u00adb'])
+        self.assertEqual(len(index), 4)
+        self.assertEqual(list(index), ['ab', 'user1', 'user2', '\u00e9'])
+        self.assertIn('user1', index)
+        self.assertIn('uSeR2', index)
+        self.assertIn('\u00e9', index)
+        self.assertIn('E\u0301', index)
+        self.assertIn('ab', index)
+        self.assertIn(b'USER1', index)
+        self.assertNotIn('user', index)
+        self.assertNotIn('user10', index)
+        self.assertNotIn('', index)
+
+    def test_runs(self):
+        names = ['user%s' % i for i in range(1000)]
+        index = MembershipIndex(reversed(names + names))
+        self.assertEqual(list(index), sorted(names))
+
+        run_size = MembershipIndex.RUN_SIZE
+        MembershipIndex.RUN_SIZE = 7
+        try:
+            self.assertEqual(list(MembershipIndex(reversed(names + names))), sorted(names))
+        finally:
+            MembershipIndex.RUN_SIZE = run_size
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon. If
+# not, see <http://www.gnu.org/licenses/>.
+
+"""Read-only views of unmarshalled data that decode elements on access.
+
+The classes in this module are returned by the unmarshal_*_lazy methods of content handlers, i.e.
+:py:meth:`.ContentHandler.unmarshal_list_lazy` and :py:meth:`.ContentHandler.unmarshal_dict_lazy`.
+Instead of creating a Python object for every element up front, they keep a reference to the body
+and a compact index of where elements start and end. :py:class:`MembershipIndex` (returned by
+:py:meth:`.ContentHandler.unmarshal_list_index`) stores names in the same compact way.
+
+.. moduleauthor:: Mathias Ertl <mati@restauth.net>
+"""
+
+from __future__ import unicode_literals
+
+import heapq
+
+from array import array
+
+try:
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+    from collections.abc import Set
+except ImportError:  # pragma: py2
+    from collections import Mapping
+    from collections import Sequence
+    from collections import Set
+
+from RestAuthCommon import error
+from RestAuthCommon import strprep
+
+
+def offsets(size):
+    """Get an empty array suitable for offsets into a body of ``size`` bytes.
+
+    The array uses 32 bit integers unless the body is larger than 4 GiB.
+
+    :rtype: :py:class:`array.array`
+    """
+    if size < 2 ** 32 and array(str('I')).itemsize >= 4:
+        return array(str('I'))
+    return array(str('Q'))  # pragma: no cover
+
+
+class LazyList(Sequence):
+    """Read-only list of strings that are decoded when they are accessed.
+
+    Besides ``len()``, iteration and indexing, slicing is supported and returns another
+    :py:class:`LazyList` sharing the same body. Elements are not cached, so accessing the same
+    index twice decodes it twice. Convert the view with ``list()`` if you access all elements many
+    times.
+
+    Since only the structure of the body is validated when the index is built, invalid elements
+    (e.g. invalid UTF-8) raise :py:exc:`~.error.UnmarshalError` when they are accessed.
+
+    :param bytes data: The body.
+    :param offsets: Start and end offsets of every element in ``data``, in alternating order.
+    :type  offsets: :py:class:`array.array`
+    :param decode: A function that decodes the bytes of one element to a string.
+    """
+
+    __slots__ = ('_data', '_offsets', '_decode')
+
+    def __init__(self, data, offsets, decode):
+        self._data = data
+        self._offsets = offsets
+        self._decode = decode
+
+    def __len__(self):
+        return len(self._offsets) // 2
+
+    def _get(self, index):
+        offsets = self._offsets
+        try:
+            return self._decode(self._data[offsets[index * 2]:offsets[index * 2 + 1]])
+        except ValueError as e:  # UnicodeDecodeError is a subclass of ValueError
+            raise error.UnmarshalError(e)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                sliced = self._offsets[start * 2:max(start, stop) * 2]
+            else:
+                sliced = array(self._offsets.typecode)
+                for i in range(start, stop, step):
+                    sliced.append(self._offsets[i * 2])
+                    sliced.append(self._offsets[i * 2 + 1])
+            return LazyList(self._data, sliced, self._decode)
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('list index out of range')
+        return self._get(index)
+
+    def __iter__(self):
+        data = self._data
+        decode = self._decode
+        offsets = iter(self._offsets)
+        try:
+            for start in offsets:
+                yield decode(data[start:next(offsets)])
+        except ValueError as e:
+            raise error.UnmarshalError(e)
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other):  # pragma: py2
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '<LazyList: %s elements>' % len(self)
+
+
+class LazyDict(Mapping):
+    """Read-only dictionary whose values are decoded when they are accessed.
+
+    Keys are decoded when the view is created, values (including nested dictionaries and lists,
+    which are returned as normal ``dict`` and ``list`` objects) only when they are accessed. Like
+    with :py:class:`LazyList`, values are not cached and invalid values raise
+    :py:exc:`~.error.UnmarshalError` when they are accessed.
+
+    :param data: The body.
+    :param dict keys: A dictionary mapping every key to the position of its offsets in ``offsets``.
+    :param offsets: Start and end offsets of every value in ``data``, in alternating order.
+    :type  offsets: :py:class:`array.array`
+    :param decode: A function that decodes the data of one value.
+    """
+
+    __slots__ = ('_data', '_keys', '_offsets', '_decode')
+
+    def __init__(self, data, keys, offsets, decode):
+        self._data = data
+        self._keys = keys
+        self._offsets = offsets
+        self._decode = decode
+
+    def __getitem__(self, key):
+        index = self._keys[key] * 2
+        try:
+            return self._decode(self._data[self._offsets[index]:self._offsets[index + 1]])
+        except ValueError as e:
+            raise error.UnmarshalError(e)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return '<LazyDict: %s>' % ', '.join(sorted(self._keys))
+
+
+class MembershipIndex(Set):
+    """Immutable set of names for fast membership tests.
+
+    All names are prepared with :py:func:`~.strprep.stringprep` and stored UTF-8 encoded and
+    sorted in a single :py:class:`bytes` object, with an :py:class:`array.array` of offsets. This
+    needs only a few bytes more per name than the encoded name itself, a fraction of what a ``set``
+    of ``str`` objects uses. Queries are prepared as well and looked up with a binary search::
+
+        >>> members = MembershipIndex(['User1', 'user2'])
+        >>> 'user1' in members, 'USER2' in members, 'user3' in members
+        (True, True, False)
+
+    Iterating over the index yields the prepared names in sorted order (by code point).
+
+    :param names: The names to index, any iterable of strings (e.g. a :py:class:`LazyList`).
+    """
+
+    __slots__ = ('_data', '_offsets')
+
+    RUN_SIZE = 65536
+    """Names are sorted in runs of this many names, which are merged afterwards. This bounds the
+    number of temporary objects while building the index."""
+
+    def __init__(self, names):
+        prepare = strprep._stringprep  # not cached, since building sees every name only once
+
+        runs = []
+        run = []
+        for name in names:
+            run.append(prepare(name).encode('utf-8'))
+            if len(run) >= self.RUN_SIZE:
+                runs.append(self._pack(sorted(run)))
+                run = []
+        runs.append(self._pack(sorted(run)))
+
+        data = bytearray()
+        index = offsets(sum(len(run[0]) for run in runs))
+        index.append(0)
+        previous = None
+        for name in heapq.merge(*[self._iter_run(*run) for run in runs]):
+            if name != previous:  # skip duplicates
+                data += name
+                index.append(len(data))
+                previous = name
+
+        self._data = bytes(data)
+        self._offsets = index
+
+    @staticmethod
+    def _pack(names):
+        data = b''.join(names)
+        index = offsets(len(data))
+        position = 0
+        for name in names:
+            position += len(name)
+            index.append(position)
+        return data, index
+
+    @staticmethod
+    def _iter_run(data, index):
+        start = 0
+        for end in index:
+            yield data[start:end]
+            start = end
+
+    def _get(self, index):
+        return self._data[self._offsets[index]:self._offsets[index + 1]]
+
+    def __contains__(self, name):
+        if isinstance(name, bytes):
+            name = name.decode('utf-8')
+        needle = strprep.stringprep(name).encode('utf-8')
+
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._get(middle) < needle:
+                low = middle + 1
+            else:
+                high = middle
+        return low < len(self) and self._get(low) == needle
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._get(index).decode('utf-8')
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __repr__(self):
+        return '<MembershipIndex: %s names>' % len(self)
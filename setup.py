@@ -101,6 +101,117 @@ class version(Command):
         print(get_version())
 
 
+class generate_tables(Command):
+    description = "Generate python/RestAuthCommon/_tables.py from the stdlib stringprep module."
+    user_options = []
+
+    tables = ['C.1.2', 'C.2.1', 'C.2.2', 'C.3', 'C.4', 'C.5', 'C.6', 'C.7', 'C.8', 'C.9']
+    path = os.path.join('python', 'RestAuthCommon', '_tables.py')
+
+    def initialize_options(self):
+        pass
+
+    def finalize_options(self):
+        pass
+
+    def get_ranges(self, func):
+        """Get a list of ``(first, last)`` tuples of all code points where func returns True."""
+        ranges = []
+        first = None
+        for code in range(0x110001):
+            if code < 0x110000 and func(chr(code)):
+                if first is None:
+                    first = code
+            elif first is not None:
+                ranges.append((first, code - 1))
+                first = None
+        return ranges
+
+    def format(self, items):
+        """Format items as indented lines of at most 99 characters."""
+        lines = ['   ']
+        for item in items:
+            if len(lines[-1]) + len(item) >= 99:
+                lines.append('   ')
+            lines[-1] += ' ' + item
+        return '\n'.join(lines)
+
+    def run(self):
+        if PY2:
+            print('ERROR: Tables can only be generated with Python 3.')
+            sys.exit(1)
+
+        # NOTE: The stringprep module uses unicodedata.ucd_3_2_0 (Unicode 3.2, as required by
+        #       RFC 3454) for all tables.
+        import stringprep
+        from unicodedata import ucd_3_2_0
+
+        b1 = ['0x%04X: None,' % code for code in range(0x110000)
+              if stringprep.in_table_b1(chr(code))]
+
+        # NOTE: map_table_b2() uses str.lower() of the running Python version for characters not
+        #       explicitly listed in RFC 3454, so characters unassigned in Unicode 3.2 are skipped.
+        b2 = []
+        for code in range(0x110000):
+            mapped = stringprep.map_table_b2(chr(code))
+            if mapped != chr(code) and ucd_3_2_0.category(chr(code)) != 'Cn':
+                b2.append(ascii('%s%s\n' % (chr(code), mapped)))
+
+        prohibited = []
+        for table in self.tables:
+            func = getattr(stringprep, 'in_table_%s' % table.lower().replace('.', ''))
+            prohibited += ["(0x%04X, 0x%04X, '%s')," % (first, last, table)
+                           for first, last in self.get_ranges(func)]
+
+        with open(self.path, 'w') as stream:
+            stream.write(TABLES_TEMPLATE % {
+                'b1': self.format(b1),
+                'b2': self.format(b2),
+                'prohibited': self.format(prohibited),
+            })
+        print('Wrote %s.' % self.path)
+
+
+TABLES_TEMPLATE = """# -*- coding: utf-8 -*-
+#
+# This file is part of RestAuthCommon (https://common.restauth.net).
+#
+# RestAuthCommon is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# RestAuthCommon is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+# the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with RestAuthCommon. If
+# not, see <http://www.gnu.org/licenses/>.
+
+\"\"\"stringprep tables (RFC 3454) used by :py:mod:`RestAuthCommon.strprep`.
+
+This module is generated by ``python setup.py generate_tables`` from Unicode 3.2, do not edit it
+manually.
+\"\"\"
+
+# Table B.1: Commonly mapped to nothing, as a map for str.translate().
+B1 = {
+%(b1)s
+}
+
+# Table B.2: Mapping for case-folding used with NFKC. Every line is a character followed by its
+# mapping. The mapping is stored as a single string (and not as a dictionary) as this module
+# loads about 50 times faster this way.
+B2 = (
+%(b2)s
+)
+
+# Tables C.1.2 to C.9 as (first, last, table) tuples.
+PROHIBITED_RANGES = (
+%(prohibited)s
+)
+"""
+
+
 class clean(_clean):
     def run(self):
         cmd = ['make', '-C', 'doc', 'clean', ]
@@ -222,6 +333,7 @@ setup(
         'build_doc': build_doc,
         'clean': clean,
         'coverage': coverage,
+        'generate_tables': generate_tables,
         'version': version,
         'test': test,
     },